@@ -0,0 +1,209 @@
+from array import array
+
+from ast_structure import AST, NODE_TYPES, walk
+
+# AST Arena
+#
+# Agacin duz (flat) gosterimi: her node bir tamsayi indeks ile temsil edilir, node basina Python nesnesi
+# olusturulmaz. Node'un sinifi, pozisyonu ve alanlari tip'li dizilerde (array) tutulur:
+#   kinds:             node'un sinifi (ast_structure.NODE_TYPES indeksi)
+#   lineno/start/end:  kaynak pozisyonu (-1: yok)
+#   field_offset:      node'un ilk alaninin tags/slots indeksi (alanlar sinifin fields sirasiyla)
+#   tags/slots:        her alan icin bir etiket ve bir tamsayi:
+#       NONE   deger None
+#       NODE   slots = alt node'un indeksi
+#       LIST   slots = lists dizisindeki baslangic, lists[baslangic] eleman sayisi, ardindan node indeksleri
+#       VALUE  slots = values listesindeki indeks (isimler, tipler, sabitler, parametre listeleri)
+# values'taki esit degerler (ornek: 'int', ayni degisken ismi) bir kere saklanir.
+#
+# Node'lar on-sirayla (preorder) numaralanir, kok 0'dir ve her node'un alt node'lari kendinden sonra gelir.
+# Donusumler (from_tree/to_tree) ozyinelemesizdir, derin agaclarda da calisir.
+#
+#     arena = AstArena.from_tree(program)
+#     arena.node_type(0), arena.get(0, 'statements'), arena.children(0)
+#     program = arena.to_tree()
+
+NONE = 0
+NODE = 1
+LIST = 2
+VALUE = 3
+
+TYPE_INDEX = {cls: index for index, cls in enumerate(NODE_TYPES)}
+
+class AstArena:
+    def __init__(self):
+        self.kinds = array('B')
+        self.lineno = array('i')
+        self.start = array('i')
+        self.end = array('i')
+        self.field_offset = array('I')
+        self.tags = array('B')
+        self.slots = array('I')
+        self.lists = array('I')
+        self.values = []
+        # Deger -> values indeksi (sadece hash'lenebilen degerler icin)
+        self.value_index = {}
+
+    @classmethod
+    def from_tree(cls, root):
+        arena = cls()
+        # (node, doldurulacak yer): yer slots veya lists'te, alt node'un indeksi yazilir
+        stack = [(root, None, None)]
+        while stack:
+            node, target, position = stack.pop()
+            index = arena.add_node(node)
+            if target is not None:
+                target[position] = index
+            children = []
+            offset = arena.field_offset[index]
+            for i, name in enumerate(node.fields):
+                value = getattr(node, name)
+                slot = offset + i
+                if value is None:
+                    arena.tags.append(NONE)
+                    arena.slots.append(0)
+                elif isinstance(value, AST):
+                    arena.tags.append(NODE)
+                    arena.slots.append(0)
+                    children.append((value, arena.slots, slot))
+                elif type(value) is list and all(isinstance(item, AST) for item in value):
+                    start = len(arena.lists)
+                    arena.tags.append(LIST)
+                    arena.slots.append(start)
+                    arena.lists.append(len(value))
+                    arena.lists.extend([0] * len(value))
+                    children.extend((item, arena.lists, start + 1 + j) for j, item in enumerate(value))
+                else:
+                    arena.tags.append(VALUE)
+                    arena.slots.append(arena.add_value(value))
+            # Ters sirada eklenir, boylece alt node'lar alan sirasiyla numaralanir
+            stack.extend(reversed(children))
+        arena.value_index = {}
+        return arena
+
+    def add_node(self, node):
+        index = len(self.kinds)
+        self.kinds.append(TYPE_INDEX[type(node)])
+        for name, values in (('lineno', self.lineno), ('start', self.start), ('end', self.end)):
+            value = getattr(node, name)
+            values.append(-1 if value is None else value)
+        self.field_offset.append(len(self.tags))
+        return index
+
+    def add_value(self, value):
+        try:
+            key = (type(value), value)
+            index = self.value_index.get(key)
+        except TypeError:
+            # Hash'lenemeyen degerler (parametre listeleri) paylasilmaz
+            key = None
+            index = None
+        if index is None:
+            index = len(self.values)
+            self.values.append(value)
+            if key is not None:
+                self.value_index[key] = index
+        return index
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def node_type(self, index):
+        return NODE_TYPES[self.kinds[index]]
+
+    def position(self, index):
+        # (lineno, start, end), bilinmeyenler None
+        return tuple(None if values[index] < 0 else values[index] for values in (self.lineno, self.start, self.end))
+
+    def decode(self, slot):
+        tag = self.tags[slot]
+        value = self.slots[slot]
+        if tag == NODE:
+            return value
+        if tag == LIST:
+            return self.lists[value + 1:value + 1 + self.lists[value]].tolist()
+        if tag == VALUE:
+            return self.values[value]
+        return None
+
+    def get(self, index, name):
+        # Alanin degeri: alt node'lar indeks (veya indeks listesi) olarak doner
+        return self.decode(self.field_offset[index] + self.node_type(index).fields.index(name))
+
+    def children(self, index):
+        # Dogrudan alt node'larin indeksleri, alan sirasiyla
+        result = []
+        offset = self.field_offset[index]
+        for slot in range(offset, offset + len(self.node_type(index).fields)):
+            tag = self.tags[slot]
+            if tag == NODE:
+                result.append(self.slots[slot])
+            elif tag == LIST:
+                start = self.slots[slot]
+                result.extend(self.lists[start + 1:start + 1 + self.lists[start]])
+        return result
+
+    def walk(self, index=0):
+        # index ve altindaki node'lar, on-sirayla
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            yield index
+            stack.extend(reversed(self.children(index)))
+
+    def to_tree(self, index=0):
+        # index'teki alt agaci AST node'larina cevirir
+        # Alt node'lar ebeveynden sonra numaralandigi icin buyukten kucuge insa edilir
+        indexes = sorted(self.walk(index), reverse=True)
+        nodes = {}
+        for i in indexes:
+            cls = self.node_type(i)
+            node = cls.__new__(cls)
+            offset = self.field_offset[i]
+            for j, name in enumerate(cls.fields):
+                slot = offset + j
+                tag = self.tags[slot]
+                if tag == NODE:
+                    value = nodes.pop(self.slots[slot])
+                elif tag == LIST:
+                    value = [nodes.pop(child) for child in self.decode(slot)]
+                elif tag == VALUE:
+                    value = self.values[self.slots[slot]]
+                    if type(value) is list:
+                        value = list(value)
+                else:
+                    value = None
+                setattr(node, name, value)
+            lineno, start, end = self.position(i)
+            if lineno is not None:
+                node.lineno = lineno
+            if start is not None:
+                node.start = start
+                node.end = end
+            nodes[i] = node
+        return nodes[index]
+
+    def nbytes(self):
+        # Dizilerin ve values listesinin kapladigi yaklasik byte (degerlerin kendisi haric)
+        arrays = (self.kinds, self.lineno, self.start, self.end, self.field_offset, self.tags, self.slots, self.lists)
+        return sum(len(values) * values.itemsize for values in arrays) + 8 * len(self.values)
+
+def tree_size(root):
+    # Agactaki node sayisi
+    return sum(1 for _ in walk(root))
+
+if __name__ == "__main__":
+    from compiler import Compiler
+
+    code = """
+    int kare(int n) { return n * n; }
+    int x = 10;
+    if (x > 5) { x = kare(x) + 1; } else { x = -x; }
+    """
+    program = Compiler().parse(code)
+    arena = AstArena.from_tree(program)
+    print(f"{len(arena)} node, {len(arena.values)} farkli deger, ~{arena.nbytes()} byte")
+    for index in arena.walk():
+        print(f"  {index:>3} {arena.node_type(index).__name__:<16} {arena.position(index)} -> {arena.children(index)}")
+    rebuilt = arena.to_tree()
+    print("Ayni agac:", repr(rebuilt) == repr(program))
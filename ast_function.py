@@ -1,29 +1,42 @@
+from ast_structure import AST, iter_fields
+
 def print_ast(node, indent=""):
     # AST ağacını okunabilir yazdırma
-    if isinstance(node, list):
-        for item in node:
-            print_ast(item, indent)
-    elif hasattr(node, "__dict__"):
-        print(f"{indent}{node.__class__.__name__}")
+    # Özyinelemesiz: stack'te yazdırılacak (değer, girinti) çiftleri ve hazır satırlar (str) durur,
+    # çok derin ağaçlarda da Python stack'i büyümez
+    stack = [(node, indent)]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            print(item)
+            continue
+        node, indent = item
+        if isinstance(node, list):
+            stack.extend((child, indent) for child in reversed(node))
+        elif isinstance(node, AST):
+            print(f"{indent}{node.__class__.__name__}")
+
+            # Alanlar sırasıyla yazdırılsın diye ters sırada eklenir
+            pending = []
+            for key, value in iter_fields(node):
+                if isinstance(value, list):
+                    if value:
+                        pending.append(f"{indent}  {key}: [")
 
-        for key, value in vars(node).items():
-            if isinstance(value, list):
-                if value:
-                    print(f"{indent}  {key}: [")
-                    
-                    for item in value:
-                        print_ast(item, indent + "    ")
+                        pending.extend((child, indent + "    ") for child in value)
 
-                    print(f"{indent}  ]")
+                        pending.append(f"{indent}  ]")
+                    else:
+                        pending.append(f"{indent}  {key}: []")
+                elif isinstance(value, AST):
+                    pending.append(f"{indent}  {key}:")
+                    pending.append((value, indent + "    "))
+                elif value is None:
+                    pending.append(f"{indent}  {key}: None")
                 else:
-                    print(f"{indent}  {key}: []")
-            elif hasattr(value, "__dict__"):
-                print(f"{indent}  {key}:")
-                print_ast(value, indent + "    ")
-            elif value is None:
-                print(f"{indent}  {key}: None")
-            else:
-                print(f"{indent}  {key}: {value}")
-    else:
-        # Primitives
-        print(f"{indent}{node}")
\ No newline at end of file
+                    pending.append(f"{indent}  {key}: {value}")
+            pending.reverse()
+            stack.extend(pending)
+        else:
+            # Primitives
+            print(f"{indent}{node}")
\ No newline at end of file
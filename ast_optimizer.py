@@ -0,0 +1,251 @@
+import operator
+
+from symbol_table import SymbolTable
+from semantic_analyzer import binary_op_type, unary_op_type
+from virtual_machine import COMPARE_OPS
+from ast_structure import (
+    AST, Program, Blok, DegiskenBildir, FonksiyonBildir, Atama,
+    IfStatement, WhileStatement, ForStatement,
+    BinaryOp, UnaryOp, Literal, Tanimlayici, copy_position, iter_fields
+)
+from visitor import NodeVisitor
+
+# AST Seviyesinde Optimizasyon
+# SemanticAnalyzer'dan sonra, BytecodeGenerator'dan once calisir.
+#   - Constant folding: Sadece Literal iceren BinaryOp/UnaryOp alt agaclari derleme zamaninda hesaplanir
+#   - Constant propagation: Hic yeniden atanmayan ve Literal ile baslatilan DegiskenBildir degiskenlerinin
+#     kullanimlari Literal ile degistirilir
+#   - Sabit kosullu If/While/For dallari silinir
+# Sonuc tipleri SemanticAnalyzer'in tip kurallarindan (binary_op_type, unary_op_type) alinir,
+# VM'in hesapladigi degerin Python tipi bu tiple uyusmuyorsa (ornek: int / int) katlama yapilmaz.
+
+# VM'deki ile ayni operator fonksiyonlari
+BINARY_EVAL = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    **COMPARE_OPS,
+}
+
+UNARY_EVAL = {
+    '-': operator.neg,
+    '!': operator.not_,
+}
+
+# Dil tipi -> VM'deki Python tipi
+PYTHON_TYPES = {
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'string': str,
+}
+
+def make_literal(value, tip, origin):
+    # Hesaplanan deger tipe uymuyorsa (ornek: int / int -> float) None doner, katlama yapilmaz
+    # origin: yerine konan node, pozisyonu Literal'e kopyalanir
+    if type(value) is not PYTHON_TYPES.get(tip):
+        return None
+    return copy_position(Literal(deger=value, tip=tip), origin)
+
+# 1. pass: Her Atama'nin hangi DegiskenBildir'e ait oldugunu scope'lara gore bulup isaretler
+# Ozyinelemesiz gezinti (traverse): scope'a giris enter_, cikis ve bildirimler leave_ metodlarinda
+class AssignmentCollector(NodeVisitor):
+    def __init__(self):
+        self.symtab = SymbolTable()
+        self.reassigned = set()  # Yeniden atanan DegiskenBildir node'larinin id'leri
+
+    def enter_Blok(self, node):
+        self.symtab.enter_scope()
+
+    def leave_Blok(self, node):
+        self.symtab.exit_scope()
+
+    def leave_DegiskenBildir(self, node):
+        # SemanticAnalyzer'daki sira: once deger, sonra bildirim
+        self.symtab.add_symbol(node.isim, node)
+
+    def enter_FonksiyonBildir(self, node):
+        self.symtab.add_symbol(node.isim, node)
+        self.symtab.enter_scope()
+        for _, param_name in node.parametreler:
+            self.symtab.add_symbol(param_name, None)
+
+    def leave_FonksiyonBildir(self, node):
+        self.symtab.exit_scope()
+
+    def leave_Atama(self, node):
+        decl = self.symtab.lookup(node.isim)
+        if decl is not None:
+            self.reassigned.add(id(decl))
+
+# 2. pass: Katlama, yayilim ve dal eleme
+class ConstantFolder(NodeVisitor):
+    def __init__(self):
+        self.symtab = SymbolTable()
+        self.reassigned = set()
+
+    def optimize(self, program):
+        collector = AssignmentCollector()
+        collector.traverse(program)
+        self.reassigned = collector.reassigned
+        return self.visit(program)
+
+    def generic_visit(self, node):
+        # ReturnStatement, FonksiyonCall gibi node'larin alt ifadelerini katla
+        for key, value in iter_fields(node):
+            if isinstance(value, list):
+                setattr(node, key, [self.visit(item) if isinstance(item, AST) else item for item in value])
+            elif isinstance(value, AST):
+                setattr(node, key, self.visit(value))
+        return node
+
+    def visit_statements(self, statements):
+        # Silinen statement'lar (None) listeden cikarilir
+        result = []
+        for stmt in statements:
+            new_stmt = self.visit(stmt)
+            if new_stmt is not None:
+                result.append(new_stmt)
+        return result
+
+    # Statementlar
+
+    def visit_Program(self, node):
+        node.statements = self.visit_statements(node.statements)
+        return node
+
+    def visit_Blok(self, node):
+        self.symtab.enter_scope()
+        node.statements = self.visit_statements(node.statements)
+        self.symtab.exit_scope()
+        return node
+
+    def visit_DegiskenBildir(self, node):
+        if node.deger:
+            node.deger = self.visit(node.deger)
+        self.symtab.add_symbol(node.isim, node)
+        return node
+
+    def visit_FonksiyonBildir(self, node):
+        self.symtab.add_symbol(node.isim, node)
+        self.symtab.enter_scope()
+        for _, param_name in node.parametreler:
+            self.symtab.add_symbol(param_name, None)
+        node.govde = self.visit(node.govde)
+        self.symtab.exit_scope()
+        return node
+
+    def visit_Atama(self, node):
+        node.deger = self.visit(node.deger)
+        return node
+
+    def visit_IfStatement(self, node):
+        node.condition = self.visit(node.condition)
+        if isinstance(node.condition, Literal):
+            # Sadece calisacak dal kalir, Blok oldugu icin scope'u korunur
+            if node.condition.deger:
+                return self.visit(node.true_blok)
+            if node.else_blok:
+                return self.visit(node.else_blok)
+            return None
+
+        node.true_blok = self.visit(node.true_blok)
+        if node.else_blok:
+            node.else_blok = self.visit(node.else_blok)
+        return node
+
+    def visit_WhileStatement(self, node):
+        node.condition = self.visit(node.condition)
+        if isinstance(node.condition, Literal) and not node.condition.deger:
+            return None
+        node.govde = self.visit(node.govde)
+        return node
+
+    def visit_ForStatement(self, node):
+        node.init = self.visit(node.init)
+        node.condition = self.visit(node.condition)
+        if isinstance(node.condition, Literal) and not node.condition.deger:
+            # Govde hic calismaz ama init calisir (degisken bildirimi olabilir)
+            return node.init
+        node.update = self.visit(node.update)
+        node.govde = self.visit(node.govde)
+        return node
+
+    # Expressionlar
+    # BinaryOp, UnaryOp ve FonksiyonCall ozyinelemesiz katlanir (NodeVisitor.evaluate), values alt
+    # ifadelerin katlanmis halleri
+
+    def visit_Tanimlayici(self, node):
+        decl = self.symtab.lookup(node.isim)
+        if (isinstance(decl, DegiskenBildir) and id(decl) not in self.reassigned
+                and isinstance(decl.deger, Literal)):
+            return copy_position(Literal(deger=decl.deger.deger, tip=decl.deger.tip), node)
+        return node
+
+    def visit_Literal(self, node):
+        return node
+
+    def visit_FonksiyonCall(self, node):
+        return self.evaluate(node)
+
+    def post_FonksiyonCall(self, node, values):
+        node.args = values
+        return node
+
+    def visit_BinaryOp(self, node):
+        return self.evaluate(node)
+
+    def post_BinaryOp(self, node, values):
+        node.sol, node.sag = values
+        if not (isinstance(node.sol, Literal) and isinstance(node.sag, Literal)):
+            return node
+
+        result_type = binary_op_type(node.op, node.sol.tip, node.sag.tip)
+        if result_type is None or node.op not in BINARY_EVAL:
+            return node
+        try:
+            value = BINARY_EVAL[node.op](node.sol.deger, node.sag.deger)
+        except ZeroDivisionError:
+            # Hata runtime'da olussun
+            return node
+
+        return make_literal(value, result_type, node) or node
+
+    def visit_UnaryOp(self, node):
+        return self.evaluate(node)
+
+    def post_UnaryOp(self, node, values):
+        node.expr, = values
+        if not isinstance(node.expr, Literal):
+            return node
+
+        result_type = unary_op_type(node.op, node.expr.tip)
+        if result_type is None or node.op not in UNARY_EVAL:
+            return node
+
+        value = UNARY_EVAL[node.op](node.expr.deger)
+        return make_literal(value, result_type, node) or node
+
+if __name__ == "__main__":
+    from parser import parser, test_code
+    from ast_function import print_ast
+
+    code = test_code + """
+    float pi = 3.14;
+    float alan = pi * 2.0 * 2.0;
+    int sayac = 0;
+    if (x > 10) {
+        sayac = sayac + 1;
+    } else {
+        sayac = sayac - 1;
+    }
+    while (false) {
+        sayac = 100;
+    }
+    """
+
+    ast = parser.parse(code)
+    ast = ConstantFolder().optimize(ast)
+    print_ast(ast)
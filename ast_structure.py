@@ -1,10 +1,57 @@
 # AST temel sinif
+# Node'lar __slots__ kullanir (instance basina __dict__ yok), her sinif alanlarini fields ile bildirir.
+# Alt node'lari gezmek icin vars(node) yerine fields (iter_fields/iter_child_nodes/walk) kullanilir.
+# Kaynak pozisyonu: lineno (baslangic satiri), start/end (kaynaktaki [start, end) karakter araligi).
+# Parser her node'a set eder, elle olusturulan node'larda set edilmemis pozisyonlar None okunur.
+POSITION_FIELDS = ('lineno', 'start', 'end')
+
 class AST:
+    __slots__ = POSITION_FIELDS
+    fields = ()
+
+    def __getattr__(self, name):
+        # Sadece set edilmemis slot'lar icin cagrilir
+        if name in POSITION_FIELDS:
+            return None
+        raise AttributeError(f"'{self.__class__.__name__}' node'unda '{name}' alani yok")
+
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
 
+def copy_position(node, origin):
+    # origin'in pozisyonunu node'a kopyalar (ornek: AST optimizasyonunda yerine konan node)
+    node.lineno = origin.lineno
+    node.start = origin.start
+    node.end = origin.end
+    return node
+
+def iter_fields(node):
+    # (alan adi, deger) ciftleri, fields sirasiyla
+    for name in node.fields:
+        yield name, getattr(node, name)
+
+def iter_child_nodes(node):
+    # Dogrudan alt node'lar (liste alanlarindaki node'lar dahil), fields sirasiyla
+    for name in node.fields:
+        value = getattr(node, name)
+        if isinstance(value, AST):
+            yield value
+        elif type(value) is list:
+            for item in value:
+                if isinstance(item, AST):
+                    yield item
+
+def walk(node):
+    # node ve altindaki butun node'lar (sira onemli degil), derin agaclarda da ozyinelemesiz
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(iter_child_nodes(node))
+
 # AST'de en tepedeki node
 class Program(AST):
+    __slots__ = fields = ('statements',)
     def __init__(self, statements):
         self.statements = statements
 
@@ -13,6 +60,7 @@ class Program(AST):
 
 # {} gibi bloklari temsil eden sinif
 class Blok(AST):
+    __slots__ = fields = ('statements',)
     def __init__(self, statements):
         self.statements = statements
 
@@ -25,6 +73,7 @@ class Blok(AST):
 # AST [DegiskenBildir(isim='x', deger=Literal(10, type_='int'))]
 # let artik kullanilmiyor, artik tip belirterek de bildirebiliyoruz.
 class DegiskenBildir(AST):
+    __slots__ = fields = ('isim', 'tip', 'deger')
     def __init__(self, isim, tip, deger):
         self.isim = isim  # Tanımlayici(identifier) string
         self.tip = tip    # Tip string, e.g., 'int', 'float'
@@ -34,6 +83,7 @@ class DegiskenBildir(AST):
 # def fonksiyonum(a, b) { ... }
 # AST [FonksiyonBildir(isim='fonksiyonum', parametreler=['a', 'b'], govde=Blok(...))]
 class FonksiyonBildir(AST):
+    __slots__ = fields = ('isim', 'return_type', 'parametreler', 'govde')
     def __init__(self, isim, return_type, parametreler, govde):
         self.isim = isim
         self.return_type = return_type  # Simdilik void, AST'de return type eklenirse degistirilebilir
@@ -45,6 +95,7 @@ class FonksiyonBildir(AST):
 # x = 20
 # AST [Atama(isim='x', deger=Literal(20, type_='int'))]
 class Atama(AST):
+    __slots__ = fields = ('isim', 'deger')
     def __init__(self, isim, deger):
         self.isim = isim
         self.deger = deger
@@ -55,6 +106,7 @@ class Atama(AST):
 # If, While, For, Return statementlari
 
 class IfStatement(AST):
+    __slots__ = fields = ('condition', 'true_blok', 'else_blok')
     def __init__(self, condition, true_blok, else_blok=None):
         self.condition = condition
         self.true_blok = true_blok
@@ -64,6 +116,7 @@ class IfStatement(AST):
         return f"If({self.condition}, {self.true_blok}, else={self.else_blok})"
 
 class WhileStatement(AST):
+    __slots__ = fields = ('condition', 'govde')
     def __init__(self, condition, govde):
         self.condition = condition
         self.govde = govde
@@ -72,6 +125,7 @@ class WhileStatement(AST):
         return f"While({self.condition}, govde={self.govde})"
 
 class ForStatement(AST):
+    __slots__ = fields = ('init', 'condition', 'update', 'govde')
     def __init__(self, init, condition, update, govde):
         self.init = init         # e.g., let i = 0
         self.condition = condition # e.g., i < 10
@@ -82,6 +136,7 @@ class ForStatement(AST):
         return f"For(init={self.init}, cond={self.condition}, update={self.update}, govde={self.govde})"
 
 class ReturnStatement(AST):
+    __slots__ = fields = ('deger',)
     def __init__(self, deger):
         self.deger = deger
 
@@ -92,6 +147,7 @@ class ReturnStatement(AST):
 
 # +, -, *, /, %, >, <, ==, &&, || operasyonlari için sinif
 class BinaryOp(AST):
+    __slots__ = fields = ('sol', 'op', 'sag')
     def __init__(self, sol, op, sag):
         self.sol = sol
         self.op = op  # Token string, e.g., '+', '==', '&&'
@@ -102,6 +158,7 @@ class BinaryOp(AST):
 
 # -x, !y gibi unary operasyonlar için sinif
 class UnaryOp(AST):
+    __slots__ = fields = ('op', 'expr')
     def __init__(self, op, expr):
         self.op = op
         self.expr = expr
@@ -111,6 +168,7 @@ class UnaryOp(AST):
 
 # Fonksiyon cagrilari için sinif
 class FonksiyonCall(AST):
+    __slots__ = fields = ('isim', 'args')
     def __init__(self, isim, args):
         self.isim = isim
         self.args = args  # Expression node listesi
@@ -119,6 +177,7 @@ class FonksiyonCall(AST):
         return f"Call(name='{self.isim}', args={self.args})"
 
 class Literal(AST):
+    __slots__ = fields = ('deger', 'tip')
     def __init__(self, deger, tip):
         self.deger = deger
         self.tip = tip # 'int', 'float', 'bool'
@@ -127,8 +186,13 @@ class Literal(AST):
         return f"Literal({self.deger}, type={self.tip})"
 
 class Tanimlayici(AST):
+    __slots__ = fields = ('isim',)
     def __init__(self, isim):
         self.isim = isim
 
     def __repr__(self):
-        return f"Id({self.isim})"
\ No newline at end of file
+        return f"Id({self.isim})"
+
+# Butun node siniflari (ast_arena'da sinif indeksi olarak kullanilir, sira degistirilmemeli)
+NODE_TYPES = (Program, Blok, DegiskenBildir, FonksiyonBildir, Atama, IfStatement, WhileStatement, ForStatement,
+              ReturnStatement, BinaryOp, UnaryOp, FonksiyonCall, Literal, Tanimlayici)
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from compiler import Compiler, cache_key
+from peephole import DEFAULT_LEVEL
+
+# Toplu (batch) Derleme
+#
+# Kullanim: python batch_compile.py [-o build] [-j N] [-O seviye] <dosya veya klasor> ...
+#
+# Klasorlerdeki SOURCE_EXTENSIONS uzantili dosyalar (alt klasorler dahil) ve dogrudan verilen dosyalar
+# derlenir, her kaynak icin cikti klasorunde ayni goreli yolda bir .pbc dosyasi yazilir.
+# Derleme ProcessPoolExecutor ile islemcilere dagitilir, her worker kendi Compiler'ini kullanir.
+# Cikti klasorundeki MANIFEST_NAME dosyasi her kaynak icin son derlemenin anahtarini (cache_key) tutar,
+# kaynak, derleyici versiyonu veya optimizasyon seviyesi degismediyse dosya tekrar derlenmez.
+
+SOURCE_EXTENSIONS = ('.src',)
+MANIFEST_NAME = "manifest.json"
+
+STATUS_OK = "TAMAM"
+STATUS_SKIP = "ATLANDI"
+STATUS_ERROR = "HATA"
+
+def collect_sources(paths):
+    # (kaynak yolu, cikti klasorune gore goreli yol) listesi dondurur
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(SOURCE_EXTENSIONS):
+                        full = os.path.join(root, name)
+                        sources.append((full, os.path.relpath(full, path)))
+        elif os.path.isfile(path):
+            sources.append((path, os.path.basename(path)))
+        else:
+            raise Exception(f"HATA: '{path}' bulunamadi.")
+
+    # Ayni dosya iki kez verildiyse bir kere derlenir
+    seen = {}
+    unique = []
+    for path, rel in sources:
+        if rel in seen:
+            if os.path.samefile(seen[rel], path):
+                continue
+            raise Exception(f"HATA: '{path}' ve '{seen[rel]}' ayni cikti dosyasina yaziliyor.")
+        seen[rel] = path
+        unique.append((path, rel))
+    return unique
+
+def artifact_path(out_dir, rel):
+    return os.path.join(out_dir, os.path.splitext(rel)[0] + ".pbc")
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def compile_job(job):
+    # Worker process'te calisir: (kaynak yolu, cikti yolu, seviye) -> (durum, sure, hata mesaji, manifest anahtari)
+    # Anahtar derlenen kaynaktan hesaplanir, dosya ana process okuduktan sonra degistiyse manifest'e
+    # eski kaynagin anahtari yazilmaz
+    path, out_path, opt_level = job
+    start = time.perf_counter()
+    key = None
+    try:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        key = cache_key(source, opt_level)
+        data = Compiler(opt_level).compile_uncached(source).to_bytes()
+
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, out_path)
+    except Exception as e:
+        return STATUS_ERROR, time.perf_counter() - start, str(e), key
+    return STATUS_OK, time.perf_counter() - start, None, key
+
+def compile_batch(paths, out_dir="build", workers=None, opt_level=DEFAULT_LEVEL, force=False):
+    # Her kaynak icin {'path', 'output', 'status', 'time', 'error'} listesi dondurur (girdi sirasinda)
+    sources = collect_sources(paths)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {} if force else load_manifest(out_dir)
+
+    results = []
+    jobs = []
+    for path, rel in sources:
+        out_path = artifact_path(out_dir, rel)
+        result = {'path': path, 'output': out_path, 'status': STATUS_SKIP, 'time': 0.0, 'error': None}
+        results.append(result)
+        try:
+            with open(path, encoding='utf-8') as f:
+                key = cache_key(f.read(), opt_level)
+        except (OSError, UnicodeDecodeError) as e:
+            result['status'], result['error'] = STATUS_ERROR, str(e)
+            continue
+
+        if manifest.get(rel) == key and os.path.exists(out_path):
+            continue
+        jobs.append((result, rel, (path, out_path, opt_level)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    job_args = [args for _, _, args in jobs]
+    if workers == 1:
+        outcomes = map(compile_job, job_args)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Kucuk dosyalar icin process'ler arasi gidis gelisi azaltmak icin isler gruplanir
+        chunksize = max(1, len(job_args) // (workers * 4))
+        outcomes = executor.map(compile_job, job_args, chunksize=chunksize)
+
+    try:
+        for (result, rel, _), (status, elapsed, error, key) in zip(jobs, outcomes):
+            result['status'], result['time'], result['error'] = status, elapsed, error
+            if status == STATUS_OK:
+                manifest[rel] = key
+            else:
+                manifest.pop(rel, None)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        save_manifest(out_dir, manifest)
+    return results
+
+def print_report(results, wall_time):
+    for result in results:
+        line = f"[{result['status']:<7}] {result['time'] * 1e3:>9.2f} ms  {result['path']}"
+        if result['error']:
+            line += f"\n           {result['error']}"
+        print(line)
+
+    counts = {status: sum(r['status'] == status for r in results) for status in (STATUS_OK, STATUS_SKIP, STATUS_ERROR)}
+    cpu_time = sum(r['time'] for r in results)
+    print("-" * 50)
+    print(f"{len(results)} dosya: {counts[STATUS_OK]} derlendi, {counts[STATUS_SKIP]} atlandi, "
+          f"{counts[STATUS_ERROR]} hatali")
+    print(f"Toplam sure: {wall_time:.3f} s (derleme suresi toplami {cpu_time:.3f} s)")
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Kaynak dosyalari toplu olarak .pbc bytecode'a derler.")
+    arg_parser.add_argument("paths", nargs="+", help="kaynak dosyalar veya klasorler")
+    arg_parser.add_argument("-o", "--out-dir", default="build", help="cikti klasoru (varsayilan: build)")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None, help="worker process sayisi (varsayilan: cekirdek sayisi)")
+    arg_parser.add_argument("-O", "--opt-level", type=int, default=DEFAULT_LEVEL, help="optimizasyon seviyesi (0-2)")
+    arg_parser.add_argument("-f", "--force", action="store_true", help="degismeyen dosyalari da derle")
+    args = arg_parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        results = compile_batch(args.paths, args.out_dir, args.jobs, args.opt_level, args.force)
+    except Exception as e:
+        print(e)
+        return 2
+    print_report(results, time.perf_counter() - start)
+    return 1 if any(r['status'] == STATUS_ERROR for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
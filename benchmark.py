@@ -0,0 +1,684 @@
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from opcodes import Opcode
+from execution import ResourceLimits, HostFunction
+from virtual_machine import VirtualMachine
+from register_vm import RegisterVM
+from closure_vm import ClosureVM
+from peephole import O0, O1, O2
+import compiler
+from compiler import CompileCache, Compiler
+from scheduler import VMScheduler
+from worker_pool import VMWorkerPool
+import batch_compile
+from lexer import lexer as ply_lexer
+from fast_lexer import tokenize, tokenize_stream
+from incremental_parser import IncrementalParser
+from incremental_analyzer import IncrementalAnalyzer
+from semantic_analyzer import SemanticAnalyzer
+from ast_structure import AST, walk
+from ast_arena import AstArena
+from bytecode_generator import BytecodeGenerator
+from visitor import NodeVisitor
+
+# Performans olcumleri
+# Kullanim: python benchmark.py [vm] [peephole] [cache] [batch] [startup] [lexer] [stream] [incremental] [reanalyze] [analysis] [lines] [ast_memory] [visitor] [deep] [register] [closure] [output] [limits] [scheduler] [pool] [calls]
+
+# Dongu agirlikli ornek programlar (main.py'deki code4'un buyutulmus hali vb.)
+LOOP_PROGRAMS = {
+    "countdown": """
+    int x = 200000;
+    int num = 0;
+    while (x > 0) {
+        x = x - 1;
+        num = num + 1;
+    }
+    """,
+    "nested_loops": """
+    int total = 0;
+    int i;
+    int j;
+    for (i = 0; i < 300; i = i + 1) {
+        for (j = 0; j < 300; j = j + 1) {
+            total = total + i * j;
+        }
+    }
+    """,
+    "fib": """
+    int fib(int n) {
+        if (n <= 1) { return n; }
+        return fib(n - 1) + fib(n - 2);
+    }
+    int res = fib(18);
+    """,
+}
+
+def compile_source(code, opt_level=O0):
+    # Compiler analiz ciktilarini yazdirmaz, benchmark ciktisina karismaz
+    code_obj = Compiler(opt_level).compile_uncached(code)
+    return code_obj.instructions, code_obj.global_names
+
+def time_vm(bytecode, global_names, repeat=3, vm_class=VirtualMachine):
+    # En iyi sureyi ve calisan instruction sayisini dondurur (sessiz VM, konsola yazmaz)
+    best = None
+    for _ in range(repeat):
+        vm = vm_class(quiet=True)
+        start = time.perf_counter()
+        vm.run(bytecode, global_names)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, vm.instruction_count
+
+def bench_vm():
+    print(f"{'PROGRAM':<15} {'INSTR':>10} {'SURE (s)':>10} {'INSTR/S':>12}")
+    print("-" * 50)
+    for name, code in LOOP_PROGRAMS.items():
+        best, count = time_vm(*compile_source(code))
+        print(f"{name:<15} {count:>10} {best:>10.4f} {count / best:>12,.0f}")
+
+def bench_peephole():
+    # Optimizasyon seviyelerine gore calisan instruction sayisi ve sure
+    print(f"{'PROGRAM':<15} {'SEVIYE':>6} {'KOD':>6} {'INSTR':>10} {'AZALMA':>8} {'SURE (s)':>10}")
+    print("-" * 60)
+    for name, code in LOOP_PROGRAMS.items():
+        base_count = None
+        for level in (O0, O1, O2):
+            bytecode, global_names = compile_source(code, level)
+            best, count = time_vm(bytecode, global_names)
+            if base_count is None:
+                base_count = count
+            reduction = 1 - count / base_count
+            print(f"{name:<15} {level:>6} {len(bytecode):>6} {count:>10} {reduction:>8.1%} {best:>10.4f}")
+
+def bench_cache(repeat=1000):
+    # Cache'siz derleme ile cache hit suresi
+    print(f"{'PROGRAM':<15} {'DERLEME (ms)':>14} {'HIT (us)':>10}")
+    print("-" * 42)
+    for name, code in LOOP_PROGRAMS.items():
+        cache = CompileCache()
+        start = time.perf_counter()
+        compiler.compile(code, cache=cache)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            compiler.compile(code, cache=cache)
+        hit = (time.perf_counter() - start) / repeat
+        print(f"{name:<15} {cold * 1e3:>14.3f} {hit * 1e6:>10.2f}")
+
+def bench_batch(file_count=400):
+    # Toplu derlemenin worker sayisina gore olceklenmesi (her seferinde butun dosyalar derlenir)
+    print(f"{'WORKER':>6} {'SURE (s)':>10} {'DOSYA/S':>10} {'HIZLANMA':>9}")
+    print("-" * 40)
+    with tempfile.TemporaryDirectory() as tmp:
+        src_dir = os.path.join(tmp, "src")
+        os.makedirs(src_dir)
+        programs = list(LOOP_PROGRAMS.values())
+        for i in range(file_count):
+            with open(os.path.join(src_dir, f"prog{i}.src"), "w") as f:
+                f.write(f"int sabit{i} = {i};\n" + programs[i % len(programs)])
+
+        worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        base = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            batch_compile.compile_batch([src_dir], os.path.join(tmp, "out"), workers, force=True)
+            elapsed = time.perf_counter() - start
+            if base is None:
+                base = elapsed
+            print(f"{workers:>6} {elapsed:>10.3f} {file_count / elapsed:>10.0f} {base / elapsed:>8.2f}x")
+
+# Import suresi olculen pipeline modulleri (bagimliliklari ile birlikte)
+STARTUP_MODULES = ["lexer", "parser", "semantic_analyzer", "bytecode_generator", "virtual_machine", "compiler"]
+
+def bench_startup(repeat=5):
+    # Her modul temiz bir Python process'inde import edilir, en iyi sure alinir
+    print(f"{'MODUL':<20} {'IMPORT (ms)':>12}")
+    print("-" * 34)
+    script = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+    for module in STARTUP_MODULES:
+        best = None
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", script.format(module)], capture_output=True,
+                                 text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+            elapsed = float(out.stdout.strip().splitlines()[-1])
+            if best is None or elapsed < best:
+                best = elapsed
+        print(f"{module:<20} {best * 1e3:>12.2f}")
+
+    # Hazir tablolari okumak ile import sirasinda yeniden uretmenin karsilastirmasi
+    import parser as parser_module
+    import ply.yacc as yacc
+    start = time.perf_counter()
+    parser_module.load_parser()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    yacc.yacc(module=parser_module, tabmodule="parsetab_benchmark_yok", write_tables=False, debug=False,
+              errorlog=yacc.NullLogger())
+    build_time = time.perf_counter() - start
+    print(f"\nTablo okuma: {load_time * 1e3:.2f} ms, tablo uretme: {build_time * 1e3:.2f} ms")
+
+def make_large_script(target_bytes):
+    # LOOP_PROGRAMS'in tekrarindan olusan, string/float/yorum da iceren buyuk bir kaynak
+    parts = list(LOOP_PROGRAMS.values()) + [
+        'string mesaj = "merhaba dunya";\nfloat oran = 3.14 * 2.0; # yorum satiri\n',
+        'bool b = (oran >= 1.5 && oran != 2.0) || !(mesaj == "x");\n',
+    ]
+    chunk = "".join(parts)
+    return chunk * (target_bytes // len(chunk) + 1)
+
+def bench_lexer(size_mb=2, repeat=3):
+    # PLY lexer'i ile hizli lexer'in token/saniye karsilastirmasi
+    data = make_large_script(size_mb * 1024 * 1024)
+    print(f"Kaynak: {len(data) / 1024 / 1024:.1f} MB")
+    print(f"{'LEXER':<8} {'TOKEN':>10} {'SURE (s)':>10} {'TOKEN/S':>12}")
+    print("-" * 44)
+
+    def ply_tokenize(source):
+        lexer = ply_lexer.clone()
+        lexer.input(source)
+        return list(iter(lexer.token, None))
+
+    results = {}
+    for name, func in (("ply", ply_tokenize), ("fast", tokenize)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(func(data))
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        results[name] = best
+        print(f"{name:<8} {count:>10} {best:>10.3f} {count / best:>12,.0f}")
+    print(f"\nHizlanma: {results['ply'] / results['fast']:.2f}x")
+
+def bench_stream(size_mb=4):
+    # Buyuk bir dosyayi tek string olarak okuyup lexlemek ile akis modunda lexlemenin
+    # sure ve en yuksek bellek kullanimi (token'lar saklanmadan sadece sayilir)
+    print(f"{'MOD':<8} {'TOKEN':>10} {'SURE (s)':>10} {'BELLEK (MB)':>12}")
+    print("-" * 44)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "buyuk.src")
+        with open(path, "w") as f:
+            f.write(make_large_script(size_mb * 1024 * 1024))
+
+        def whole_file():
+            with open(path) as f:
+                return len(tokenize(f.read()))
+
+        def streamed():
+            with open(path, "rb") as f:
+                return sum(1 for _ in tokenize_stream(f))
+
+        for name, func in (("tamami", whole_file), ("akis", streamed)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            count = func()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:<8} {count:>10} {elapsed:>10.3f} {peak / 1024 / 1024:>12.1f}")
+
+def make_function_script(function_count):
+    # Her biri birkac statement iceren fonksiyonlardan olusan kaynak
+    parts = []
+    for i in range(function_count):
+        parts.append(f"""int hesapla{i}(int n) {{
+    int toplam = 0;
+    int i;
+    for (i = 0; i < n; i = i + 1) {{
+        if (i % 2 == 0) {{ toplam = toplam + i * {i}; }} else {{ toplam = toplam - 1; }}
+    }}
+    return toplam;
+}}
+int sonuc{i} = hesapla{i}(10);
+""")
+    return "".join(parts)
+
+def bench_incremental(edits=50):
+    # Dosyanin ortasindaki bir fonksiyonda tek karakterlik degisiklik: tam parse ve artimli parse suresi
+    print(f"{'FONKSIYON':>9} {'BOYUT (KB)':>11} {'TAM PARSE (ms)':>15} {'ARTIMLI (ms)':>13}")
+    print("-" * 52)
+    inc = IncrementalParser()
+    for function_count in (10, 100, 1000, 3000):
+        text = make_function_script(function_count)
+
+        start = time.perf_counter()
+        result = inc.parse(text)
+        full = time.perf_counter() - start
+
+        # Ortadaki fonksiyonun 'toplam = 0' satirindaki sayi degistiriliyor
+        offset = text.index("toplam = 0", len(text) // 2) + len("toplam = ")
+        best = None
+        for k in range(edits):
+            start = time.perf_counter()
+            result = inc.reparse(result, offset, 1, str(k % 10))
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        print(f"{function_count:>9} {len(text) / 1024:>11.1f} {full * 1e3:>15.2f} {best * 1e3:>13.3f}")
+
+def bench_reanalyze(edits=20):
+    # Ortadaki bir fonksiyonun govdesi degistiginde butun programin analizi ile artimli analiz suresi
+    print(f"{'FONKSIYON':>9} {'TAM ANALIZ (ms)':>16} {'ARTIMLI (ms)':>13} {'ANALIZ EDILEN':>14}")
+    print("-" * 56)
+    inc = IncrementalParser()
+    for function_count in (10, 100, 1000, 3000):
+        text = make_function_script(function_count)
+        result = inc.parse(text)
+        analyzer = IncrementalAnalyzer()
+
+        start = time.perf_counter()
+        analyzer.analyze(result.ast, result.changed, result.lines())
+        full = time.perf_counter() - start
+
+        offset = text.index("toplam = 0", len(text) // 2) + len("toplam = ")
+        best = None
+        for k in range(edits):
+            result = inc.reparse(result, offset, 1, str(k % 10))
+            start = time.perf_counter()
+            analysis = analyzer.analyze(result.ast, result.changed, result.lines())
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        print(f"{function_count:>9} {full * 1e3:>16.2f} {best * 1e3:>13.3f} {analysis.analyzed:>14}")
+
+def bench_analysis(repeat=3):
+    # Buyuk programlarda semantic analiz hizi: scope tablolari yazdirilan (cikti atilsa da formatlanir)
+    # analiz ile sessiz (quiet) analiz
+    print(f"{'FONKSIYON':>9} {'SATIR':>8} {'LOG (ms)':>10} {'SESSIZ (ms)':>12} {'SATIR/S':>12} {'HIZLANMA':>9}")
+    print("-" * 66)
+    discard = lambda message: None
+    for function_count in (100, 1000, 5000):
+        text = make_function_script(function_count)
+        lines = text.count("\n")
+        ast = compiler.default_compiler.parse(text)
+
+        results = {}
+        for name, make in (("log", lambda: SemanticAnalyzer(log=discard)),
+                           ("quiet", lambda: SemanticAnalyzer(quiet=True))):
+            best = None
+            for _ in range(repeat):
+                analyzer = make()
+                start = time.perf_counter()
+                analyzer.visit(ast)
+                elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            results[name] = best
+        print(f"{function_count:>9} {lines:>8} {results['log'] * 1e3:>10.2f} {results['quiet'] * 1e3:>12.2f} "
+              f"{lines / results['quiet']:>12,.0f} {results['log'] / results['quiet']:>8.2f}x")
+
+def bench_lines(repeat=3):
+    # Satir tablosunun boyutu (instruction basina byte) ve VM'e etkisi (tablo verilerek / verilmeden)
+    print(f"{'PROGRAM':<15} {'KOD':>6} {'TABLO (B)':>10} {'B/INSTR':>8} {'TABLOSUZ (s)':>13} {'TABLOLU (s)':>12}")
+    print("-" * 70)
+    programs = dict(LOOP_PROGRAMS)
+    programs["functions_1000"] = make_function_script(1000)
+    for name, code in programs.items():
+        code_obj = Compiler(O2).compile_uncached(code)
+        size = len(code_obj.line_table)
+        results = []
+        for table in (None, code_obj.line_table):
+            best = None
+            for _ in range(repeat):
+                vm = VirtualMachine()
+                with redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    vm.run(code_obj.instructions, code_obj.global_names, table)
+                    elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            results.append(best)
+        count = len(code_obj.instructions)
+        print(f"{name:<15} {count:>6} {size:>10} {size / count:>8.2f} {results[0]:>13.4f} {results[1]:>12.4f}")
+
+class DictNode:
+    # Karsilastirma icin __dict__'li (slot'suz) node
+    pass
+
+def copy_tree(root, slotted):
+    # Agacin kopyasi, alanlardaki degerler (isimler, sabitler, pozisyonlar) paylasilir, sadece node'lar kopyalanir
+    # slotted=False: ayni alanlara sahip __dict__'li node'lar (eski node yapisi)
+    copies = {}
+    for node in reversed(list(walk(root))):
+        copy = type(node).__new__(type(node)) if slotted else DictNode()
+        for name in node.fields:
+            value = getattr(node, name)
+            if isinstance(value, AST):
+                value = copies.pop(id(value))
+            elif type(value) is list and value and isinstance(value[0], AST):
+                value = [copies.pop(id(item)) for item in value]
+            setattr(copy, name, value)
+        copy.lineno, copy.start, copy.end = node.lineno, node.start, node.end
+        copies[id(node)] = copy
+    return copies[id(root)]
+
+def bench_ast_memory(statement_count=100_000):
+    # 100k statement'lik programin AST'sinin bellek kullanimi: __dict__'li node, __slots__'lu node, arena
+    parts = ["int v0 = 1;\n"]
+    for i in range(1, statement_count):
+        if i % 4 == 0:
+            parts.append(f"if (v{i - 1} > {i}) {{ v{i - 1} = v{i - 1} - 1; }}\n")
+        else:
+            parts.append(f"int v{i} = (v{i - 1} + {i}) * 2;\n")
+    ast = Compiler(lexer="fast").parse("".join(parts))
+    node_count = sum(1 for _ in walk(ast))
+    print(f"Statement: {len(ast.statements)}, node: {node_count}")
+    print(f"{'GOSTERIM':<10} {'BELLEK (MB)':>12} {'B/NODE':>8}")
+    print("-" * 32)
+
+    for name, build in (("dict", lambda: copy_tree(ast, slotted=False)),
+                        ("slots", lambda: copy_tree(ast, slotted=True)),
+                        ("arena", lambda: AstArena.from_tree(ast))):
+        tracemalloc.start()
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        print(f"{name:<10} {size / 1024 / 1024:>12.1f} {size / node_count:>8.1f}")
+
+class GetattrAnalyzer(SemanticAnalyzer):
+    # Karsilastirma icin eski dispatch: her node'da metod ismi olusturup getattr
+    def visit(self, node):
+        if isinstance(node, list):
+            for item in node:
+                self.visit(item)
+            return
+        return getattr(self, f'visit_{node.__class__.__name__}', self.generic_visit)(node)
+
+class GetattrGenerator(BytecodeGenerator):
+    def visit(self, node):
+        visitor = getattr(self, f'visit_{node.__class__.__name__}', self.generic_visit)
+        line = node.lineno
+        if line is None or line == self.line:
+            return visitor(node)
+        outer = self.line
+        self.set_line(line)
+        result = visitor(node)
+        if outer is not None:
+            self.set_line(outer)
+        return result
+
+def bench_visitor(repeat=3):
+    # Buyuk AST'lerde getattr ile dispatch ile sinif basina cache'lenmis dispatch tablosu,
+    # ozyinelemeli generic_visit ile ozyinelemesiz traverse
+    print(f"{'FONKSIYON':>9} {'NODE':>8} {'ISLEM':<10} {'GETATTR (ms)':>13} {'TABLO (ms)':>11} {'HIZLANMA':>9}")
+    print("-" * 66)
+
+    def best_of(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return best
+
+    for function_count in (500, 5000):
+        ast = compiler.default_compiler.parse(make_function_script(function_count))
+        node_count = sum(1 for _ in walk(ast))
+        rows = (
+            ("analiz", lambda: GetattrAnalyzer(quiet=True).visit(ast), lambda: SemanticAnalyzer(quiet=True).visit(ast)),
+            ("kod", lambda: GetattrGenerator().visit(ast), lambda: BytecodeGenerator().visit(ast)),
+            ("gezinti", lambda: NodeVisitor().visit(ast), lambda: NodeVisitor().traverse(ast)),
+        )
+        for name, old, new in rows:
+            old_time = best_of(old)
+            new_time = best_of(new)
+            print(f"{function_count:>9} {node_count:>8} {name:<10} {old_time * 1e3:>13.2f} {new_time * 1e3:>11.2f} "
+                  f"{old_time / new_time:>8.2f}x")
+    print("(gezinti: ozyinelemeli generic_visit / ozyinelemesiz traverse)")
+
+def bench_deep(depths=(25_000, 50_000, 100_000, 200_000)):
+    # Sola derin BinaryOp zincirlerinde (x + x + ...) analiz ve kod uretimi suresi, derinlikle dogrusal olmali
+    print(f"{'DERINLIK':>9} {'ANALIZ (ms)':>12} {'KOD (ms)':>10} {'US/NODE':>8}")
+    print("-" * 44)
+    parser = Compiler(lexer="fast")
+    for depth in depths:
+        ast = parser.parse("int x = 1;\nint y = " + " + ".join(["x"] * depth) + ";\n")
+        start = time.perf_counter()
+        SemanticAnalyzer(quiet=True).visit(ast)
+        analysis = time.perf_counter() - start
+        start = time.perf_counter()
+        BytecodeGenerator().visit(ast)
+        codegen = time.perf_counter() - start
+        print(f"{depth:>9} {analysis * 1e3:>12.1f} {codegen * 1e3:>10.1f} {(analysis + codegen) / (2 * depth) * 1e6:>8.2f}")
+
+# Register VM karsilastirmasi icin aritmetik agirlikli program (uzun ifadeler, cok sayida gecici deger)
+ARITHMETIC_PROGRAM = """
+int a = 3;
+int b = 7;
+int acc = 0;
+for (int i = 0; i < 50000; i = i + 1) {
+    acc = (acc + a * b - i % 7) % 1000003 + (a + b) * (b - a) / 2;
+    a = b % 13 + 1;
+    b = a * 3 - b % 5;
+}
+"""
+
+def bench_register():
+    # Ayni programlarin stack VM (O2, peephole dahil) ve register VM kodu: calisan instruction sayisi ve sure
+    print(f"{'PROGRAM':<15} {'VM':<9} {'KOD':>6} {'INSTR':>10} {'SURE (s)':>10} {'AZALMA':>8} {'HIZLANMA':>9}")
+    print("-" * 74)
+    programs = dict(LOOP_PROGRAMS, arithmetic=ARITHMETIC_PROGRAM)
+    for name, code in programs.items():
+        stack_code = Compiler(O2).compile_uncached(code)
+        register_code = Compiler(O2, backend=compiler.REGISTER).compile_uncached(code)
+        stack_time, stack_count = time_vm(stack_code.instructions, stack_code.global_names)
+        register_time, register_count = time_vm(register_code.instructions, register_code.global_names,
+                                                vm_class=RegisterVM)
+        print(f"{name:<15} {'stack':<9} {len(stack_code.instructions):>6} {stack_count:>10} {stack_time:>10.4f}")
+        print(f"{'':<15} {'register':<9} {len(register_code.instructions):>6} {register_count:>10} "
+              f"{register_time:>10.4f} {1 - register_count / stack_count:>8.1%} {stack_time / register_time:>8.2f}x")
+
+def bench_closure():
+    # Ayni bytecode (O2) VirtualMachine ve temel bloklari closure'lara derleyen ClosureVM ile, derleme dahil
+    print(f"{'PROGRAM':<15} {'INSTR':>10} {'VM (s)':>10} {'CLOSURE (s)':>12} {'HIZLANMA':>9}")
+    print("-" * 60)
+    programs = dict(LOOP_PROGRAMS, arithmetic=ARITHMETIC_PROGRAM)
+    for name, code in programs.items():
+        bytecode, global_names = compile_source(code, O2)
+        vm_time, vm_count = time_vm(bytecode, global_names)
+        closure_time, closure_count = time_vm(bytecode, global_names, vm_class=ClosureVM)
+        if closure_count != vm_count:
+            print(f"{name:<15} instruction sayilari farkli: {vm_count} / {closure_count}")
+        print(f"{name:<15} {vm_count:>10} {vm_time:>10.4f} {closure_time:>12.4f} {vm_time / closure_time:>8.2f}x")
+
+def print_loop(count):
+    # for (i = 0; i < count; i = i + 1) { print(i); } bytecode'u (dilde print ifadesi yok, elle yaziliyor)
+    return [
+        (Opcode.LOAD_CONST, 0), (Opcode.STORE_GLOBAL, 0),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.LOAD_CONST, count), (Opcode.COMPARE, '<'), (Opcode.JUMP_IF_FALSE, 13),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.PRINT, None),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.LOAD_CONST, 1), (Opcode.ADD, None), (Opcode.STORE_GLOBAL, 0),
+        (Opcode.JUMP_ABSOLUTE, 2),
+        (Opcode.HALT, None),
+    ]
+
+def bench_output(count=200_000, repeat=3):
+    # PRINT agirlikli dongu: konsola yazan VM (stdout /dev/null'a yonlendirilmis) ve sessiz VM (BufferedOutput)
+    print(f"{'VM':<15} {'MOD':<8} {'SURE (s)':>10} {'PRINT/S':>12}")
+    print("-" * 48)
+    bytecode = print_loop(count)
+    for vm_class in (VirtualMachine, ClosureVM):
+        for quiet in (False, True):
+            best = None
+            for _ in range(repeat):
+                vm = vm_class(quiet=quiet)
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    result = vm.run(bytecode, ["i"])
+                    elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            if quiet and len(result.output) != count:
+                print(f"{vm_class.__name__}: {len(result.output)} cikti toplandi, {count} bekleniyordu")
+            mode = "sessiz" if quiet else "konsol"
+            print(f"{vm_class.__name__:<15} {mode:<8} {best:>10.4f} {count / best:>12,.0f}")
+
+def bench_limits(repeat=3, slice_steps=1000):
+    # Limitsiz, butun limitler acik ve zaman dilimli (resume) calistirmanin sureleri
+    print(f"{'PROGRAM':<15} {'LIMITSIZ (s)':>13} {'LIMITLI (s)':>12} {'DILIMLI (s)':>12} {'DILIM':>7}")
+    print("-" * 64)
+    limits = ResourceLimits(max_instructions=10**9, max_call_depth=10_000, max_stack=100_000, timeout=60)
+    for name, code in LOOP_PROGRAMS.items():
+        bytecode, global_names = compile_source(code, O2)
+        times = []
+        for options, sliced in (({}, False), ({'limits': limits}, False), ({'limits': limits}, True)):
+            best = None
+            for _ in range(repeat):
+                vm = VirtualMachine(quiet=True, **options)
+                start = time.perf_counter()
+                vm.start(bytecode, global_names)
+                slices = 1
+                if sliced:
+                    while vm.resume(slice_steps) is None:
+                        slices += 1
+                else:
+                    vm.resume()
+                elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            times.append(best)
+        print(f"{name:<15} {times[0]:>13.4f} {times[1]:>12.4f} {times[2]:>12.4f} {slices:>7}")
+
+def bench_scheduler(cpu_programs=20, io_programs=200, io_delay=0.005):
+    # Hesap yapan (fib) ve host cagrisi bekleyen programlar: sirayla (host cagrisi bloklayan time.sleep)
+    # ve asyncio zamanlayicisinda farkli dilim boylariyla. Gecikme gonderimden bitise kadar.
+    def sorgula_sync(n):
+        time.sleep(io_delay)
+        return n
+
+    async def sorgula(n):
+        await asyncio.sleep(io_delay)
+        return n
+
+    cpu_source = "int fib(int n) {\n if (n < 2) { return n; }\n return fib(n - 1) + fib(n - 2);\n}\nint f = fib(16);\n"
+    io_source = "int t = 0;\nfor (int i = 0; i < 3; i = i + 1) { t = t + sorgula(i); }\n"
+
+    print(f"{'MOD':<22} {'SURE (s)':>9} {'PROGRAM/S':>10} {'INSTR/S':>11} {'P50 (ms)':>9} {'P95 (ms)':>9}")
+    print("-" * 75)
+
+    sync_hosts = [HostFunction('sorgula', sorgula_sync, ['int'])]
+    sync_compiler = Compiler(host_functions=sync_hosts)
+    programs = [sync_compiler.compile(cpu_source)] * cpu_programs + [sync_compiler.compile(io_source)] * io_programs
+    latencies = []
+    instructions = 0
+    start = time.perf_counter()
+    for code in programs:
+        vm = VirtualMachine(quiet=True, host_functions=sync_hosts)
+        instructions += vm.run(code.instructions, code.global_names).instruction_count
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{'sirayla':<22} {elapsed:>9.3f} {len(programs) / elapsed:>10.0f} {instructions / elapsed:>11.0f} "
+          f"{latencies[len(latencies) // 2] * 1000:>9.1f} {latencies[int(len(latencies) * 0.95)] * 1000:>9.1f}")
+
+    async_hosts = [HostFunction('sorgula', sorgula, ['int'])]
+    async_compiler = Compiler(host_functions=async_hosts)
+    programs = [async_compiler.compile(cpu_source)] * cpu_programs + [async_compiler.compile(io_source)] * io_programs
+
+    async def scheduled(slice_steps):
+        async with VMScheduler(slice_steps=slice_steps, host_functions=async_hosts) as scheduler:
+            await asyncio.gather(*[scheduler.submit(code) for code in programs])
+            return scheduler.metrics()
+
+    for slice_steps in (100, 1000, 10_000):
+        m = asyncio.run(scheduled(slice_steps))
+        print(f"{'zamanlayici ' + str(slice_steps):<22} {m['elapsed']:>9.3f} {m['programs_per_second']:>10.0f} "
+              f"{m['instructions_per_second']:>11.0f} {m['latency_p50'] * 1000:>9.1f} {m['latency_p95'] * 1000:>9.1f}")
+
+def bench_pool(runs=32, n_values=(18, 19, 20)):
+    # Ozyinelemeli fib calistirmalari: ayni process'te sirayla ve farkli sayida worker'li process havuzunda.
+    # Havuzun acilisi (process'lerin baslamasi) sureye dahil, hizlanma cekirdek sayisiyla sinirli.
+    code = Compiler(inputs={'n': 'int'}).compile(
+        "int fib(int k) {\n if (k < 2) { return k; }\n return fib(k - 1) + fib(k - 2);\n}\nint f = fib(n);\n")
+    inputs_list = [{'n': n_values[i % len(n_values)]} for i in range(runs)]
+    cpus = os.cpu_count() or 1
+    print(f"{runs} calistirma, fib({', '.join(map(str, n_values))}), {cpus} cekirdek")
+    print(f"{'MOD':<18} {'SURE (s)':>9} {'CALISTIRMA/S':>13} {'HIZLANMA':>9}")
+    print("-" * 52)
+
+    start = time.perf_counter()
+    for inputs in inputs_list:
+        VirtualMachine(quiet=True).run(code.instructions, code.global_names, inputs=inputs)
+    baseline = time.perf_counter() - start
+    print(f"{'tek process':<18} {baseline:>9.3f} {runs / baseline:>13.1f} {1.0:>8.2f}x")
+
+    for workers in sorted({1, 2, 4, cpus}):
+        start = time.perf_counter()
+        with VMWorkerPool(workers) as pool:
+            pool.map(code, inputs_list)
+        elapsed = time.perf_counter() - start
+        print(f"{f'havuz {workers} worker':<18} {elapsed:>9.3f} {runs / elapsed:>13.1f} {baseline / elapsed:>8.2f}x")
+
+def bench_calls(n_values=(16, 20, 22), repeat=3):
+    # Ozyinelemeli fib: CALL argc frame'i havuzdan alip argumanlari slotlara yazar. Cagri basina calisan
+    # instruction sayisi ve olusturulan frame sayisi (program sonunda havuzdaki frame'ler) cagri sayisiyla.
+    print(f"{'N':>3} {'CAGRI':>8} {'INSTR/CAGRI':>12} {'FRAME':>6} {'STACK VM (s)':>13} {'CLOSURE VM (s)':>15}")
+    print("-" * 62)
+    for n in n_values:
+        code = Compiler().compile(f"int fib(int k) {{\n if (k < 2) {{ return k; }}\n return fib(k - 1) + fib(k - 2);\n}}\nint f = fib({n});\n")
+        calls = 0
+        times = []
+        for vm_class in (VirtualMachine, ClosureVM):
+            best = None
+            for _ in range(repeat):
+                vm = vm_class(quiet=True)
+                start = time.perf_counter()
+                result = vm.run(code.instructions, code.global_names)
+                elapsed = time.perf_counter() - start
+                if best is None or elapsed < best:
+                    best = elapsed
+            if vm_class is VirtualMachine:
+                # fib(n) 2 * fib(n + 1) - 1 kere cagriliyor
+                a, b = 0, 1
+                for _ in range(n + 1):
+                    a, b = b, a + b
+                calls = 2 * a - 1
+                frames = sum(len(pool) for pool in vm.frame_pool)
+                per_call = result.instruction_count / calls
+            times.append(best)
+        print(f"{n:>3} {calls:>8} {per_call:>12.1f} {frames:>6} {times[0]:>13.4f} {times[1]:>15.4f}")
+
+BENCHMARKS = {
+    "vm": bench_vm,
+    "peephole": bench_peephole,
+    "cache": bench_cache,
+    "batch": bench_batch,
+    "startup": bench_startup,
+    "lexer": bench_lexer,
+    "stream": bench_stream,
+    "incremental": bench_incremental,
+    "reanalyze": bench_reanalyze,
+    "analysis": bench_analysis,
+    "lines": bench_lines,
+    "ast_memory": bench_ast_memory,
+    "visitor": bench_visitor,
+    "deep": bench_deep,
+    "register": bench_register,
+    "closure": bench_closure,
+    "output": bench_output,
+    "limits": bench_limits,
+    "scheduler": bench_scheduler,
+    "pool": bench_pool,
+    "calls": bench_calls,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for bench_name in selected:
+        print(f"\n=== {bench_name} ===")
+        BENCHMARKS[bench_name]()
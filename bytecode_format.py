@@ -0,0 +1,302 @@
+import hashlib
+import mmap
+import struct
+
+from opcodes import Opcode, Function
+
+# Binary Bytecode Dosya Formati (.pbc)
+#
+# Kaynak kodu her seferinde lex/parse/analiz etmeden calistirmak icin derlenmis programi saklar.
+# Butun sayilar little-endian.
+#
+#   Header (HEADER_FORMAT)
+#     magic            4 byte  b'PCBC'
+#     version          u16     FORMAT_VERSION
+#     flags            u16     (simdilik 0)
+#     source_hash      32 byte kaynak kodun sha256 ozeti (bilinmiyorsa sifir)
+#     const_count      u32     sabit havuzundaki eleman sayisi
+#     name_count       u32     global isim tablosundaki eleman sayisi
+#     instr_count      u32     instruction sayisi
+#     const_offset     u32     sabit havuzunun dosyadaki baslangici
+#     name_offset      u32     isim tablosunun baslangici
+#     instr_offset     u32     instruction dizisinin baslangici (INSTR_SIZE'a hizali)
+#     line_offset      u32     satir tablosunun baslangici
+#     line_size        u32     satir tablosunun byte uzunlugu (0: tablo yok)
+#
+#   Sabit havuzu / isim tablosu: her eleman 1 byte tip etiketi + veri (encode_value)
+#   Fonksiyon nesneleri (LOAD_FUNC) de sabit havuzunda: giris adresi, arity, yerel slot sayisi ve isim
+#
+#   Instruction dizisi: her instruction sabit genislikte (INSTR_FORMAT)
+#     opcode u16, reserved u16, a i32, b i32
+#   a/b'nin anlami opcode'un arg turune gore degisir (ARG_KINDS).
+#
+#   Satir tablosu: line_table.encode() ciktisi (delta kodlanmis (indeks, satir) kayitlari)
+#
+# Loader dosyayi mmap ile acar, instruction dizisi kopyalanmadan InstructionBuffer uzerinden okunur.
+
+MAGIC = b'PCBC'
+FORMAT_VERSION = 3
+
+HEADER_FORMAT = '<4sHH32s8I'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+INSTR_FORMAT = '<HHii'
+INSTR_SIZE = struct.calcsize(INSTR_FORMAT)
+
+# Sabit tip etiketleri
+TAG_NONE = 0
+TAG_FALSE = 1
+TAG_TRUE = 2
+TAG_INT = 3
+TAG_FLOAT = 4
+TAG_STRING = 5
+TAG_BIGINT = 6  # int64'e sigmayan tamsayilar, ondalik string olarak
+TAG_FUNCTION = 7
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Instruction arg turleri
+ARG_NONE = 0        # arg yok
+ARG_INT = 1         # a: slot, adres veya sayi
+ARG_CONST = 2       # a: sabit havuzu indeksi
+ARG_SLOT_CONST = 3  # (slot, sabit) -> a: slot, b: sabit havuzu indeksi
+ARG_CONST_INT = 4   # (sabit, adres) -> a: sabit havuzu indeksi, b: adres
+
+ARG_KINDS = {
+    Opcode.LOAD_CONST: ARG_CONST,
+    Opcode.LOAD_FAST: ARG_INT,
+    Opcode.STORE_FAST: ARG_INT,
+    Opcode.LOAD_GLOBAL: ARG_INT,
+    Opcode.STORE_GLOBAL: ARG_INT,
+    Opcode.ADD: ARG_NONE,
+    Opcode.SUB: ARG_NONE,
+    Opcode.MUL: ARG_NONE,
+    Opcode.DIV: ARG_NONE,
+    Opcode.MOD: ARG_NONE,
+    Opcode.COMPARE: ARG_CONST,
+    Opcode.NEGATE: ARG_NONE,
+    Opcode.NOT: ARG_NONE,
+    Opcode.JUMP_IF_FALSE: ARG_INT,
+    Opcode.JUMP_ABSOLUTE: ARG_INT,
+    Opcode.CALL: ARG_INT,
+    Opcode.RETURN: ARG_NONE,
+    Opcode.PRINT: ARG_NONE,
+    Opcode.HALT: ARG_NONE,
+    Opcode.LOAD_FUNC: ARG_CONST,
+    Opcode.INC_FAST: ARG_SLOT_CONST,
+    Opcode.INC_GLOBAL: ARG_SLOT_CONST,
+    Opcode.COMPARE_JUMP_IF_FALSE: ARG_CONST_INT,
+}
+# Opcode degeri indeks olarak kullaniliyor
+ARG_KIND_TABLE = [ARG_KINDS[op] for op in Opcode]
+
+def source_hash(source):
+    return hashlib.sha256(source.encode('utf-8')).digest()
+
+# Sabit kodlama
+
+def encode_value(value):
+    if value is None:
+        return bytes([TAG_NONE])
+    if value is True:
+        return bytes([TAG_TRUE])
+    if value is False:
+        return bytes([TAG_FALSE])
+    if type(value) is int:
+        if INT64_MIN <= value <= INT64_MAX:
+            return struct.pack('<Bq', TAG_INT, value)
+        data = str(value).encode('ascii')
+        return struct.pack('<BI', TAG_BIGINT, len(data)) + data
+    if type(value) is float:
+        return struct.pack('<Bd', TAG_FLOAT, value)
+    if type(value) is str:
+        data = value.encode('utf-8')
+        return struct.pack('<BI', TAG_STRING, len(data)) + data
+    if type(value) is Function:
+        data = value.name.encode('utf-8')
+        return struct.pack('<BIIII', TAG_FUNCTION, value.entry, value.arity, value.n_locals, len(data)) + data
+    raise Exception(f"Bytecode Hatasi: '{type(value).__name__}' tipindeki sabit kaydedilemez.")
+
+def decode_value(buffer, offset):
+    # (deger, sonraki offset) dondurur
+    tag = buffer[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_TRUE:
+        return True, offset
+    if tag == TAG_FALSE:
+        return False, offset
+    if tag == TAG_INT:
+        return struct.unpack_from('<q', buffer, offset)[0], offset + 8
+    if tag == TAG_FLOAT:
+        return struct.unpack_from('<d', buffer, offset)[0], offset + 8
+    if tag in (TAG_STRING, TAG_BIGINT):
+        (length,) = struct.unpack_from('<I', buffer, offset)
+        offset += 4
+        data = bytes(buffer[offset:offset + length])
+        if tag == TAG_BIGINT:
+            return int(data.decode('ascii')), offset + length
+        return data.decode('utf-8'), offset + length
+    if tag == TAG_FUNCTION:
+        entry, arity, n_locals, length = struct.unpack_from('<IIII', buffer, offset)
+        offset += 16
+        name = bytes(buffer[offset:offset + length]).decode('utf-8')
+        return Function(name, entry, arity, n_locals), offset + length
+    raise Exception(f"Bytecode Hatasi: Bilinmeyen sabit etiketi {tag}.")
+
+class ConstantPool:
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def add(self, value):
+        # True == 1 == 1.0 ve 0.0 == -0.0 oldugu icin anahtar tip ve repr ile
+        key = (type(value), repr(value))
+        if key not in self.index:
+            self.index[key] = len(self.values)
+            self.values.append(value)
+        return self.index[key]
+
+# Yazma
+
+def encode_instruction(op, arg, pool):
+    kind = ARG_KINDS[op]
+    a = b = 0
+    if kind == ARG_INT:
+        a = arg
+    elif kind == ARG_CONST:
+        a = pool.add(arg)
+    elif kind == ARG_SLOT_CONST:
+        a, b = arg[0], pool.add(arg[1])
+    elif kind == ARG_CONST_INT:
+        a, b = pool.add(arg[0]), arg[1]
+    return struct.pack(INSTR_FORMAT, op, 0, a, b)
+
+def dumps(instructions, global_names, source=None, digest=None, line_table=b''):
+    # digest: kaynak ozeti onceden hesaplandiysa source yerine dogrudan verilebilir
+    # line_table: line_table.encode() ile kodlanmis satir tablosu
+    pool = ConstantPool()
+    instr_data = b''.join(encode_instruction(op, arg, pool) for op, arg in instructions)
+    const_data = b''.join(encode_value(value) for value in pool.values)
+    name_data = b''.join(encode_value(name) for name in global_names)
+
+    const_offset = HEADER_SIZE
+    name_offset = const_offset + len(const_data)
+    # Instruction dizisi hizali olsun diye araya bosluk eklenir
+    instr_offset = name_offset + len(name_data)
+    padding = (-instr_offset) % INSTR_SIZE
+    instr_offset += padding
+    line_offset = instr_offset + len(instr_data)
+
+    if digest is None:
+        digest = source_hash(source) if source is not None else bytes(32)
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, 0, digest,
+                         len(pool.values), len(global_names), len(instructions),
+                         const_offset, name_offset, instr_offset, line_offset, len(line_table))
+    return header + const_data + name_data + bytes(padding) + instr_data + line_table
+
+def dump(path, instructions, global_names, source=None, line_table=b''):
+    with open(path, 'wb') as f:
+        f.write(dumps(instructions, global_names, source, line_table=line_table))
+
+# Okuma
+
+class InstructionBuffer:
+    # Dosyadaki sabit genislikli instruction dizisini kopyalamadan (opcode, arg) olarak okur.
+    # VM'in predecode() adimi listeyle ayni sekilde iterate edebilir.
+    def __init__(self, buffer, offset, count, constants):
+        self.view = memoryview(buffer)[offset:offset + count * INSTR_SIZE]
+        self.count = count
+        self.constants = constants
+
+    def __len__(self):
+        return self.count
+
+    def decode(self, op, a, b):
+        kind = ARG_KIND_TABLE[op]
+        if kind == ARG_NONE:
+            return (op, None)
+        if kind == ARG_INT:
+            return (op, a)
+        if kind == ARG_CONST:
+            return (op, self.constants[a])
+        if kind == ARG_SLOT_CONST:
+            return (op, (a, self.constants[b]))
+        return (op, (self.constants[a], b))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("instruction indeksi disarida")
+        op, _, a, b = struct.unpack_from(INSTR_FORMAT, self.view, index * INSTR_SIZE)
+        return self.decode(op, a, b)
+
+    def __iter__(self):
+        decode = self.decode
+        for op, _, a, b in struct.iter_unpack(INSTR_FORMAT, self.view):
+            yield decode(op, a, b)
+
+    def release(self):
+        self.view.release()
+
+class BytecodeModule:
+    def __init__(self, buffer, expected_hash=None):
+        self.buffer = buffer
+        if len(buffer) < HEADER_SIZE:
+            raise Exception("Bytecode Hatasi: Dosya header icin cok kisa.")
+
+        (magic, version, flags, digest, const_count, name_count, instr_count,
+         const_offset, name_offset, instr_offset, line_offset, line_size) = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+
+        if magic != MAGIC:
+            raise Exception("Bytecode Hatasi: Gecersiz dosya (magic uyusmuyor).")
+        if version != FORMAT_VERSION:
+            raise Exception(f"Bytecode Hatasi: Desteklenmeyen format versiyonu {version} (beklenen {FORMAT_VERSION}).")
+        if expected_hash is not None and digest != expected_hash:
+            raise Exception("Bytecode Hatasi: Kaynak kod ozeti (hash) uyusmuyor, dosya eski.")
+        if instr_offset + instr_count * INSTR_SIZE > len(buffer):
+            raise Exception("Bytecode Hatasi: Instruction dizisi dosya disina tasiyor.")
+        if line_offset + line_size > len(buffer):
+            raise Exception("Bytecode Hatasi: Satir tablosu dosya disina tasiyor.")
+
+        self.source_hash = digest
+        self.constants = self.decode_table(buffer, const_offset, const_count)
+        self.global_names = self.decode_table(buffer, name_offset, name_count)
+        self.instructions = InstructionBuffer(buffer, instr_offset, instr_count, self.constants)
+        # Satir tablosu kucuk oldugu icin kopyalanir, dosya kapandiktan sonra da kullanilabilir
+        self.line_table = bytes(buffer[line_offset:line_offset + line_size])
+
+    @staticmethod
+    def decode_table(buffer, offset, count):
+        values = []
+        for _ in range(count):
+            value, offset = decode_value(buffer, offset)
+            values.append(value)
+        return values
+
+    def close(self):
+        self.instructions.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def loads(data, source=None):
+    return BytecodeModule(data, source_hash(source) if source is not None else None)
+
+def load(path, source=None):
+    # Dosya mmap ile okunur, instruction dizisi kopyalanmaz
+    # source verilirse dosyadaki hash ile karsilastirilir
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return BytecodeModule(buffer, source_hash(source) if source is not None else None)
+    except Exception:
+        buffer.close()
+        raise
@@ -1,29 +1,131 @@
-class BytecodeGenerator:
-    def __init__(self):
+from symbol_table import SymbolTable
+from opcodes import Opcode, Function
+from line_table import add_entry, encode
+from visitor import NodeVisitor
+
+class BytecodeGenerator(NodeVisitor):
+    def __init__(self, host_functions=(), inputs=()):
         self.instructions = []
+        # Derleme zamani scope'lari, isimleri slot indekslerine cozmek icin
+        # SemanticAnalyzer ile ayni scope yapisi (Global -> Fonksiyon -> Blok)
+        self.symtab = SymbolTable()
+        # Global slot isimleri, VM global dizisini bu boyutta olusturur
+        # Blok icindeki global seviye degiskenler None ile tutulur (disaridan gorunmez)
+        self.global_names = []
+        # Derlenmekte olan fonksiyonlarin stack'i, her biri yerel slot sayisini tutar
+        self.functions = []
+        # Satir tablosu kayitlari [(instruction indeksi, satir)] ve su an uretilen kodun satiri
+        self.lines = []
+        self.line = None
+        # Ozyinelemesiz ifade uretiminde (evaluate) her ic node icin donulecek satir (degismediyse None)
+        self.outer_lines = []
+        # Host fonksiyonlari (execution.HostFunction) ilk global slotlari alir, VM start()'ta doldurur
+        for host in host_functions:
+            self.declare(host.name)
+        # Girdi degiskenleri de oyle (VirtualMachine.start(inputs=...))
+        for name in inputs:
+            self.declare(name)
 
     def get_bytecode(self):
         return self.instructions
 
+    def get_global_names(self):
+        return self.global_names
+
+    def get_lines(self):
+        return self.lines
+
+    def get_line_table(self):
+        # Delta kodlanmis satir tablosu (line_table.encode)
+        return encode(self.lines)
+
+    def set_line(self, line):
+        self.line = line
+        add_entry(self.lines, len(self.instructions), line)
+
+    # Isim cozumleme (name resolution)
+
+    def declare(self, name):
+        # Yeni degiskene slot ayir, fonksiyon icindeysek yerel, degilse global
+        if self.functions:
+            func = self.functions[-1]
+            info = {'kind': 'local', 'slot': func['n_locals'], 'func': func}
+            func['n_locals'] += 1
+        else:
+            info = {'kind': 'global', 'slot': len(self.global_names)}
+            is_top_level = len(self.symtab.scopes) == 1
+            self.global_names.append(name if is_top_level else None)
+
+        self.symtab.add_symbol(name, info)
+        return info
+
+    def resolve(self, name):
+        info = self.symtab.lookup(name)
+        if info is None:
+            raise Exception(f"HATA: '{name}' tanimli degil!")
+        # Dis fonksiyonun yerel degiskenine erisim icin closure gerekir, desteklenmiyor
+        if info['kind'] == 'local' and info['func'] is not self.functions[-1]:
+            raise Exception(f"HATA: '{name}' dis fonksiyonun yerel degiskeni, ic fonksiyondan erisilemez.")
+        return info
+
+    def emit_load(self, info):
+        if info['kind'] == 'local':
+            self.instructions.append((Opcode.LOAD_FAST, info['slot']))
+        else:
+            self.instructions.append((Opcode.LOAD_GLOBAL, info['slot']))
+
+    def emit_store(self, info):
+        if info['kind'] == 'local':
+            self.instructions.append((Opcode.STORE_FAST, info['slot']))
+        else:
+            self.instructions.append((Opcode.STORE_GLOBAL, info['slot']))
+
     def visit(self, node):
-        method_name = f'visit_{node.__class__.__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        visitor = self.visit_table[type(node)]
+
+        # Node farkli bir satirdaysa uretecegi instruction'lar icin satir kaydi yapilir,
+        # sonra ust node'un kalan instruction'lari icin onceki satira donulur
+        line = node.lineno
+        if line is None or line == self.line:
+            return visitor(self, node)
+        outer = self.line
+        self.set_line(line)
+        result = visitor(self, node)
+        if outer is not None:
+            self.set_line(outer)
+        return result
 
     def generic_visit(self, node):
         raise Exception(f"No visit_{node.__class__.__name__} method")
 
+    def enter_line(self, node):
+        # visit()'teki satir kaydinin evaluate icin karsiligi, leave_line ile eslesir
+        line = node.lineno
+        if line is None or line == self.line:
+            self.outer_lines.append(None)
+        else:
+            self.outer_lines.append(self.line)
+            self.set_line(line)
+
+    def leave_line(self):
+        outer = self.outer_lines.pop()
+        if outer is not None:
+            self.set_line(outer)
+
     # Visitor'lar
 
     def visit_Program(self, node):
         for stmt in node.statements:
             self.visit(stmt)
     
-        self.instructions.append(('HALT', None))  # Program sonu
+        self.instructions.append((Opcode.HALT, None))  # Program sonu
 
     def visit_Blok(self, node):
+        # Blok scope'u sadece derleme zamaninda var, runtime'da ek instruction yok
+        self.symtab.enter_scope()
         for stmt in node.statements:
             self.visit(stmt)
+        self.symtab.exit_scope()
 
     def visit_DegiskenBildir(self, node):
         # Format: int x = 5;
@@ -32,30 +134,39 @@ class BytecodeGenerator:
             self.visit(node.deger)
         else:
             # Deger yoksa, varsayilan olarak None/0 stack'e push et 
-            self.instructions.append(('LOAD_CONST', 0))
+            self.instructions.append((Opcode.LOAD_CONST, 0))
         
-        # 2. Degiskeni 'x' olarak kaydet
-        self.instructions.append(('DEF_VAR', node.isim))
+        # 2. Degiskene slot ayir ve 'x' slotuna kaydet
+        self.emit_store(self.declare(node.isim))
 
     def visit_Atama(self, node):
         # Format: x = 10;
         self.visit(node.deger) # Push 10
-        self.instructions.append(('STORE_VAR', node.isim)) # Pop 10 -> save to x
+        self.emit_store(self.resolve(node.isim)) # Pop 10 -> save to x
+
+    # Ifadeler (BinaryOp, UnaryOp, FonksiyonCall) ozyinelemesiz uretilir (NodeVisitor.evaluate): alt ifadelerin
+    # kodu once uretilir, operasyon instruction'i post_ metodunda eklenir. Cok derin ifadelerde de
+    # Python stack'i buyumez.
 
     def visit_BinaryOp(self, node):
+        self.evaluate(node)
+
+    def pre_BinaryOp(self, node):
+        self.enter_line(node)
+
+    def post_BinaryOp(self, node, values):
         # Format: 5 + 3
-        # Sola push'la (5)
-        self.visit(node.sol)
-        # Saga push'la (3)
-        self.visit(node.sag)
+        # Sol (5) ve sag (3) stack'e push'landi
         
         # Operation Instruction'lari ekle
-        if node.op == '+': self.instructions.append(('ADD', None))
-        elif node.op == '-': self.instructions.append(('SUB', None))
-        elif node.op == '*': self.instructions.append(('MUL', None))
-        elif node.op == '/': self.instructions.append(('DIV', None))
+        if node.op == '+': self.instructions.append((Opcode.ADD, None))
+        elif node.op == '-': self.instructions.append((Opcode.SUB, None))
+        elif node.op == '*': self.instructions.append((Opcode.MUL, None))
+        elif node.op == '/': self.instructions.append((Opcode.DIV, None))
+        elif node.op == '%': self.instructions.append((Opcode.MOD, None))
         else:
-            self.instructions.append(('COMPARE', node.op))
+            self.instructions.append((Opcode.COMPARE, node.op))
+        self.leave_line()
     
     def visit_IfStatement(self, node):
         # Condition degerlendir
@@ -63,7 +174,7 @@ class BytecodeGenerator:
         
         # False ise Else bloguna Jump
         jump_to_else_idx = len(self.instructions)
-        self.instructions.append(('JUMP_IF_FALSE', None)) 
+        self.instructions.append((Opcode.JUMP_IF_FALSE, None)) 
         
         # True blogu
         self.visit(node.true_blok)
@@ -72,11 +183,11 @@ class BytecodeGenerator:
         if node.else_blok:
             # True blogu bittiyse, Else blogunu atlamamiz gerekiyor
             jump_over_else_idx = len(self.instructions)
-            self.instructions.append(('JUMP_ABSOLUTE', None))
+            self.instructions.append((Opcode.JUMP_ABSOLUTE, None))
         
         # 'JUMP_IF_FALSE' icin hedefi ayarla
         # False ise buraya atlayacak (Else baslangici)
-        self.instructions[jump_to_else_idx] = ('JUMP_IF_FALSE', len(self.instructions))
+        self.instructions[jump_to_else_idx] = (Opcode.JUMP_IF_FALSE, len(self.instructions))
         
         # Else blogu
         if node.else_blok:
@@ -84,7 +195,7 @@ class BytecodeGenerator:
             
             # 'JUMP_ABSOLUTE' icin hedefi ayarla
             # True blogu bittiyse, buraya atlayacak (Else sonu)
-            self.instructions[jump_over_else_idx] = ('JUMP_ABSOLUTE', len(self.instructions))
+            self.instructions[jump_over_else_idx] = (Opcode.JUMP_ABSOLUTE, len(self.instructions))
 
     def visit_WhileStatement(self, node):
         start_idx = len(self.instructions) 
@@ -92,15 +203,15 @@ class BytecodeGenerator:
         self.visit(node.condition)
         
         jump_out_idx = len(self.instructions)
-        self.instructions.append(('JUMP_IF_FALSE', None))
+        self.instructions.append((Opcode.JUMP_IF_FALSE, None))
         
         self.visit(node.govde)
         
         # JUMP_ABSOLUTE olmasi lazim, cunku condition'a geri donuyoruz
-        self.instructions.append(('JUMP_ABSOLUTE', start_idx)) 
+        self.instructions.append((Opcode.JUMP_ABSOLUTE, start_idx)) 
         
         # jump_out icin duzeltme
-        self.instructions[jump_out_idx] = ('JUMP_IF_FALSE', len(self.instructions))
+        self.instructions[jump_out_idx] = (Opcode.JUMP_IF_FALSE, len(self.instructions))
 
     def visit_ForStatement(self, node):
         # Initialization
@@ -118,7 +229,7 @@ class BytecodeGenerator:
         # False ise cikis yap
         # Condition yanlis ise buraya atlayacak
         jump_out_idx = len(self.instructions)
-        self.instructions.append(('JUMP_IF_FALSE', None))
+        self.instructions.append((Opcode.JUMP_IF_FALSE, None))
 
         # Loop Govdesi
         # Ornek, { print(i); }
@@ -130,86 +241,101 @@ class BytecodeGenerator:
         self.visit(node.update)
 
         # Basa don
-        self.instructions.append(('JUMP_ABSOLUTE', start_idx))
+        self.instructions.append((Opcode.JUMP_ABSOLUTE, start_idx))
 
         # jump_out icin duzeltme
         # Hedef burda, dongu bittikten sonrasi
         after_loop_idx = len(self.instructions)
-        self.instructions[jump_out_idx] = ('JUMP_IF_FALSE', after_loop_idx)
+        self.instructions[jump_out_idx] = (Opcode.JUMP_IF_FALSE, after_loop_idx)
 
 
     def visit_FonksiyonBildir(self, node):
-        # Function adini kaydet
-        addr_const_idx = len(self.instructions)
-        self.instructions.append(('LOAD_CONST', 0)) 
-        self.instructions.append(('DEF_VAR', node.isim)) 
+        # Fonksiyon nesnesini (opcodes.Function) adinin slotuna kaydet, yerel slot sayisi govde
+        # derlendikten sonra belli oldugu icin LOAD_FUNC sonradan yaziliyor
+        func_const_idx = len(self.instructions)
+        self.instructions.append((Opcode.LOAD_FUNC, None))
+        self.emit_store(self.declare(node.isim))
 
         # Govdeyi atla
         jump_over_idx = len(self.instructions)
-        self.instructions.append(('JUMP_ABSOLUTE', None))
+        self.instructions.append((Opcode.JUMP_ABSOLUTE, None))
 
         # Function baslangici
         func_start_address = len(self.instructions)
-        self.instructions[addr_const_idx] = ('LOAD_CONST', func_start_address)
 
-        # Parametreler (DEF_VAR, CALL ile ekleniyor)
-        for _, param_name in reversed(node.parametreler):
-            self.instructions.append(('DEF_VAR', param_name))
+        func = {'isim': node.isim, 'n_locals': 0}
+        self.functions.append(func)
+        self.symtab.enter_scope()
+
+        # Parametreler ilk slotlar, CALL argumanlari dogrudan bu slotlara yazar
+        for _, param_name in node.parametreler:
+            self.declare(param_name)
 
-        # Govde Kodu
-        # self.visit(node.govde) kullanmadim cunku ENTER_SCOPE tetikliyor.
-        # Bunun yerine, CALL frame'de kalmak icin ifadeleri manuel olarak dolasiyorum.
+        # Govde Kodu (Blok scope'u SemanticAnalyzer'daki gibi parametre scope'unun icinde)
         if node.govde:
-             for stmt in node.govde.statements:
-                 self.visit(stmt)
+            self.visit(node.govde)
 
         # Safety Return
-        self.instructions.append(('LOAD_CONST', None))
-        self.instructions.append(('RETURN', None))
+        self.instructions.append((Opcode.LOAD_CONST, None))
+        self.instructions.append((Opcode.RETURN, None))
+
+        self.symtab.exit_scope()
+        self.functions.pop()
+        self.instructions[func_const_idx] = (Opcode.LOAD_FUNC, Function(node.isim, func_start_address,
+                                                                        len(node.parametreler), func['n_locals']))
 
         # Patch Jump
         after_func_idx = len(self.instructions)
-        self.instructions[jump_over_idx] = ('JUMP_ABSOLUTE', after_func_idx)
+        self.instructions[jump_over_idx] = (Opcode.JUMP_ABSOLUTE, after_func_idx)
 
     def visit_ReturnStatement(self, node):
         # Calculate the return value
         self.visit(node.deger)
         # Emit Return instruction
-        self.instructions.append(('RETURN', None))
+        self.instructions.append((Opcode.RETURN, None))
 
     def visit_FonksiyonCall(self, node):
-        # Argumanlari stack'e at
-        for arg in node.args:
-            self.visit(arg)
-        
+        self.evaluate(node)
+
+    def pre_FonksiyonCall(self, node):
+        self.enter_line(node)
+
+    def post_FonksiyonCall(self, node, values):
+        # Argumanlar stack'e atildi
         # Function adresini yukle
-        self.instructions.append(('LOAD_VAR', node.isim))
+        self.emit_load(self.resolve(node.isim))
         
         # Instruction'lari cagir
-        self.instructions.append(('CALL', None))
+        self.instructions.append((Opcode.CALL, len(node.args)))
+        self.leave_line()
 
     def visit_UnaryOp(self, node):
-        # Expression'i stack'e at
-        self.visit(node.expr)
-        
+        self.evaluate(node)
+
+    def pre_UnaryOp(self, node):
+        self.enter_line(node)
+
+    def post_UnaryOp(self, node, values):
+        # Expression stack'e atildi
         # Operasyonu ekle
         if node.op == '-':
-            self.instructions.append(('NEGATE', None))
+            self.instructions.append((Opcode.NEGATE, None))
         elif node.op == '!':
-            self.instructions.append(('NOT', None))
+            self.instructions.append((Opcode.NOT, None))
+        self.leave_line()
 
     def visit_Literal(self, node):
-        self.instructions.append(('LOAD_CONST', node.deger))
+        self.instructions.append((Opcode.LOAD_CONST, node.deger))
 
     def visit_Tanimlayici(self, node):
-        self.instructions.append(('LOAD_VAR', node.isim))
+        self.emit_load(self.resolve(node.isim))
         
     def visit_ExprStmt(self, node):
         # '5+5;' gibi bir ifade varsa, hesapliyoruz
         # Ama genellikle pop yaparız ki stack temiz kalsın.
         # Simdilik, sonucu gorebilmeniz icin yazdiriyorum
         self.visit(node) # AST wrapper varsa node.expression olmali
-        self.instructions.append(('PRINT', None))
+        self.instructions.append((Opcode.PRINT, None))
 
 # Add this to the bottom of bytecode_generator.py
 if __name__ == "__main__":
@@ -243,7 +369,7 @@ if __name__ == "__main__":
         # Instruction'lari Yazdir
         for i, (opcode, operand) in enumerate(bytecode):
             operand_str = str(operand) if operand is not None else ""
-            print(f"{i:<6} {opcode:<20} {operand_str:<10}")
+            print(f"{i:<6} {opcode.name:<20} {operand_str:<10}")
             
     except Exception as e:
         print(f"Error: {e}")
\ No newline at end of file
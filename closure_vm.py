@@ -0,0 +1,479 @@
+import operator
+
+from opcodes import Opcode, Function
+from line_table import line_for
+from execution import ExecutionResult, default_output
+from virtual_machine import COMPARE_OPS
+
+# Closure Derleyici VM
+#
+# Stack bytecode'unu calistirmadan once bir kere temel bloklara (basic block) boler ve her blogu tek bir
+# Python closure'una derler. VirtualMachine ile ayni arayuz: run(instructions, global_names, line_table),
+# get_globals(), instruction_count.
+#
+# Blok icinde operand stack'i derleme zamaninda sembolik olarak takip edilir: LOAD instruction'lari
+# deger okuyan closure'lar (getter), ADD/COMPARE gibi instruction'lar bunlari birlestiren closure'lar
+# uretir, STORE ise ifade agacini hesaplayip yazan bir komut (statement) olur:
+#   LOAD_GLOBAL x; LOAD_CONST 1; SUB; STORE_GLOBAL x   ->   globals[x] = globals[x] - 1
+# Blok sonundaki jump/call/return hedefleri diger bloklarin closure'larina cozulur, calisma dongusu
+# sadece block = block() yapar. Dongu govdeleri instruction cozme ve stack push/pop'u olmadan calisir.
+#
+# Gercek stack sadece bloklar arasinda deger tasinirken kullanilir (CALL oncesi argumanlar, donus degeri):
+# blok sonunda sembolik stack'te kalan degerler push'lanir, stack'i bos bulan instruction'lar pop eder.
+# Getter'lar yan etkisiz oldugundan gec hesaplanmalari sonucu degistirmez. Bir ifade birden fazla degeri
+# gercek stack'ten aliyorsa sag operand once hesaplanir, pop sirasi stack VM ile ayni kalir.
+
+# Akisi degistiren (blogu bitiren) instruction'lar
+TERMINATORS = frozenset((
+    Opcode.JUMP_ABSOLUTE, Opcode.JUMP_IF_FALSE, Opcode.COMPARE_JUMP_IF_FALSE,
+    Opcode.CALL, Opcode.RETURN, Opcode.HALT,
+))
+
+BINARY_OPS = {
+    Opcode.ADD: operator.add,
+    Opcode.SUB: operator.sub,
+    Opcode.MUL: operator.mul,
+    Opcode.DIV: operator.truediv,
+    Opcode.MOD: operator.mod,
+}
+
+# Sembolik stack'teki operand turleri: (tur, deger)
+CONST = 'const'     # sabit deger
+GLOBAL = 'global'   # global slot
+FAST = 'fast'       # mevcut frame'in yerel slotu
+POP = 'pop'         # gercek stack'ten alinacak deger
+EXPR = 'expr'       # degeri hesaplayan closure
+
+POP_OPERAND = (POP, None)
+
+def find_leaders(instructions):
+    # Blok baslangiclari: program basi, jump hedefleri, fonksiyon girisleri ve akisi degistiren
+    # instruction'lardan sonraki instruction'lar (CALL'dan donus adresi dahil)
+    end_pc = len(instructions)
+    leaders = {0}
+    for idx, (opcode, arg) in enumerate(instructions):
+        if opcode in TERMINATORS:
+            leaders.add(idx + 1)
+        if opcode == Opcode.JUMP_ABSOLUTE or opcode == Opcode.JUMP_IF_FALSE:
+            leaders.add(arg)
+        elif opcode == Opcode.COMPARE_JUMP_IF_FALSE:
+            leaders.add(arg[1])
+        elif opcode == Opcode.LOAD_FUNC:
+            leaders.add(arg.entry)
+    return sorted(leader for leader in leaders if leader < end_pc)
+
+class ClosureVM:
+    def __init__(self, quiet=False, output=None):
+        # quiet: konsola hicbir sey yazilmaz (baslik, son global hafiza), run() sonucu ExecutionResult ile alinir
+        # output: PRINT ciktisinin hedefi (execution.py), verilmezse sessiz modda BufferedOutput, degilse ConsoleOutput
+        self.quiet = quiet
+        self.output = output if output is not None else default_output(quiet)
+        self.stack = []
+        self.globals = []
+        self.global_names = []
+        self.frames = []
+        self.return_stack = []
+        # Ana programin return degeri (ana programda return yoksa None)
+        self.return_value = None
+        self.instruction_count = 0
+
+    def get_globals(self):
+        # Global slotlari isimleriyle dondurur (blok icindeki gizli slotlar haric)
+        return {name: val for name, val in zip(self.global_names, self.globals) if name is not None}
+
+    def compile(self, instructions):
+        # Instruction'lari bloklara derler: (giris blogu, calisan instruction sayisi fonksiyonu,
+        # son hatanin pc'si fonksiyonu) dondurur
+        instructions = list(instructions)
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        globals_ = self.globals
+        frames = self.frames
+        return_stack = self.return_stack
+        write = self.output.write
+        end_pc = len(instructions)
+
+        # Calisan fonksiyonun yerel slot dizisi (frames[-1]), CALL ve RETURN degistirir
+        frame = None
+        # Boyutlarina gore bos frame havuzlari, VirtualMachine'deki gibi
+        max_locals = max((arg.n_locals for opcode, arg in instructions if opcode == Opcode.LOAD_FUNC), default=0)
+        frame_pool = [[] for _ in range(max_locals + 1)]
+        # Her blok girisinde kendi uzunlugunu ekler
+        count = 0
+        # Hata olusan instruction'in pc'si (satir tablosu icin)
+        error_pc = 0
+
+        # Blok closure'lari once olusturulup sonra hucrelere yazilir, boylece ileri jump'lar da
+        # dogrudan blok closure'ina cozulur. cells: blok baslangici -> [blok]
+        leaders = find_leaders(instructions)
+        cells = {leader: [None] for leader in leaders}
+        end_cell = [None]
+
+        def cell_at(pc):
+            return cells.get(pc, end_cell)
+
+        # Operand'lardan closure'lar
+
+        def getter(operand):
+            kind, value = operand
+            if kind == CONST:
+                return lambda: value
+            if kind == GLOBAL:
+                return lambda: globals_[value]
+            if kind == FAST:
+                return lambda: frame[value]
+            if kind == POP:
+                return pop
+            return value
+
+        def binary(func, a, b):
+            a_kind, a_value = a
+            b_kind, b_value = b
+            if b_kind == CONST:
+                if a_kind == GLOBAL:
+                    return lambda: func(globals_[a_value], b_value)
+                if a_kind == FAST:
+                    return lambda: func(frame[a_value], b_value)
+                get_a = getter(a)
+                return lambda: func(get_a(), b_value)
+            if a_kind == GLOBAL and b_kind == GLOBAL:
+                return lambda: func(globals_[a_value], globals_[b_value])
+            if a_kind == FAST and b_kind == FAST:
+                return lambda: func(frame[a_value], frame[b_value])
+            get_a = getter(a)
+            get_b = getter(b)
+            if a_kind == POP:
+                # Sag operand da gercek stack'ten geliyorsa ustte o var, once o alinir
+                def get():
+                    right = get_b()
+                    return func(get_a(), right)
+                return get
+            return lambda: func(get_a(), get_b())
+
+        def unary(func, a):
+            get_a = getter(a)
+            return lambda: func(get_a())
+
+        # Komutlar (statement)
+
+        def store_global(slot, operand):
+            kind, value = operand
+            if kind == CONST:
+                def statement():
+                    globals_[slot] = value
+            else:
+                get = getter(operand)
+                def statement():
+                    globals_[slot] = get()
+            return statement
+
+        def store_fast(slot, operand):
+            kind, value = operand
+            if kind == CONST:
+                def statement():
+                    frame[slot] = value
+            else:
+                get = getter(operand)
+                def statement():
+                    frame[slot] = get()
+            return statement
+
+        def push_value(operand):
+            get = getter(operand)
+            return lambda: push(get())
+
+        def print_value(operand):
+            get = getter(operand)
+            return lambda: write(get())
+
+        def inc_fast(slot, delta):
+            def statement():
+                frame[slot] += delta
+            return statement
+
+        def inc_global(slot, delta):
+            def statement():
+                globals_[slot] += delta
+            return statement
+
+        # Blok sonlari (terminator): sonraki blogu dondurur, program bittiyse None
+
+        def jump(target):
+            cell = cell_at(target)
+            return lambda: cell[0]
+
+        def branch(cond, target, nxt):
+            # Kosul yanlissa target'a, dogruysa nxt'ye
+            target_cell = cell_at(target)
+            next_cell = cell_at(nxt)
+            def terminator():
+                if cond():
+                    return next_cell[0]
+                return target_cell[0]
+            return terminator
+
+        def call(operand, argc, nxt):
+            # Argumanlar gercek stack'te (blok sonunda push'landi), yeni frame'in ilk argc slotuna
+            get_target = getter(operand)
+            next_cell = cell_at(nxt)
+            def enter(func):
+                # Fonksiyonun frame'i (havuzdan) ve giris blogunun hucresi
+                if type(func) is not Function:
+                    # Host fonksiyonlari sadece VirtualMachine'de (execution.HostFunction)
+                    raise Exception("HATA: Cagrilan deger bir fonksiyon degil.")
+                if func.arity != argc:
+                    raise Exception(f"HATA: '{func.name}' fonksiyonu {func.arity} parametre bekliyor, {argc} verildi.")
+                free = frame_pool[func.n_locals]
+                return (free.pop() if free else [None] * func.n_locals), cells[func.entry]
+            if argc == 1:
+                def terminator():
+                    nonlocal frame
+                    frame, cell = enter(get_target())
+                    frame[0] = pop()
+                    frames.append(frame)
+                    return_stack.append(next_cell)
+                    return cell[0]
+                return terminator
+            def terminator():
+                nonlocal frame
+                frame, cell = enter(get_target())
+                if argc:
+                    frame[:argc] = stack[-argc:]
+                    del stack[-argc:]
+                frames.append(frame)
+                return_stack.append(next_cell)
+                return cell[0]
+            return terminator
+
+        def return_():
+            def terminator():
+                nonlocal frame
+                if not return_stack:
+                    self.return_value = stack[-1]
+                    return None # Ana program bitti
+                # Donus degeri stack'te kaliyor, fonksiyonun frame'i havuza geri doner
+                done = frames.pop()
+                frame_pool[len(done)].append(done)
+                frame = frames[-1] if frames else None
+                return return_stack.pop()[0]
+            return terminator
+
+        def halt():
+            return lambda: None
+
+        def make_block(statements, terminator, start, size):
+            # statements: [(komut, pc)], hata olursa hatali komutun pc'si kaydedilir.
+            # Kisa bloklar (dongu kosullari, tek satirlik govdeler) for dongusu olmadan calisir.
+            terminator_pc = start + size - 1
+            if not statements:
+                def block():
+                    nonlocal count, error_pc
+                    count += size
+                    try:
+                        return terminator()
+                    except Exception:
+                        error_pc = terminator_pc
+                        raise
+                return block
+
+            if len(statements) == 1:
+                (first, first_pc), = statements
+                def block():
+                    nonlocal count, error_pc
+                    count += size
+                    try:
+                        first()
+                    except Exception:
+                        error_pc = first_pc
+                        raise
+                    try:
+                        return terminator()
+                    except Exception:
+                        error_pc = terminator_pc
+                        raise
+                return block
+
+            if len(statements) == 2:
+                (first, first_pc), (second, second_pc) = statements
+                def block():
+                    nonlocal count, error_pc
+                    count += size
+                    try:
+                        first()
+                    except Exception:
+                        error_pc = first_pc
+                        raise
+                    try:
+                        second()
+                    except Exception:
+                        error_pc = second_pc
+                        raise
+                    try:
+                        return terminator()
+                    except Exception:
+                        error_pc = terminator_pc
+                        raise
+                return block
+
+            pcs = {statement: pc for statement, pc in statements}
+            statements = [statement for statement, _ in statements]
+            def block():
+                nonlocal count, error_pc
+                count += size
+                statement = None
+                try:
+                    for statement in statements:
+                        statement()
+                    statement = None
+                    return terminator()
+                except Exception:
+                    error_pc = terminator_pc if statement is None else pcs[statement]
+                    raise
+            return block
+
+        def compile_block(start, end):
+            statements = []
+            symbolic = []
+
+            def take():
+                return symbolic.pop() if symbolic else POP_OPERAND
+
+            def flush(pc):
+                # Sembolik stack'te kalan degerler gercek stack'e (alttan uste) yazilir
+                for operand in symbolic:
+                    if operand[0] != POP:
+                        statements.append((push_value(operand), pc))
+                symbolic.clear()
+
+            terminator = None
+            for pc in range(start, end):
+                opcode, arg = instructions[pc]
+                if opcode == Opcode.LOAD_CONST or opcode == Opcode.LOAD_FUNC:
+                    symbolic.append((CONST, arg))
+                elif opcode == Opcode.LOAD_GLOBAL:
+                    symbolic.append((GLOBAL, arg))
+                elif opcode == Opcode.LOAD_FAST:
+                    symbolic.append((FAST, arg))
+                elif opcode == Opcode.STORE_GLOBAL or opcode == Opcode.STORE_FAST:
+                    value = take()
+                    # Altta kalan degerler yazmadan once hesaplanmali (ayni slotu okuyor olabilirler)
+                    flush(pc)
+                    store = store_global if opcode == Opcode.STORE_GLOBAL else store_fast
+                    statements.append((store(arg, value), pc))
+                elif opcode in BINARY_OPS:
+                    b = take()
+                    a = take()
+                    symbolic.append((EXPR, binary(BINARY_OPS[opcode], a, b)))
+                elif opcode == Opcode.COMPARE:
+                    b = take()
+                    a = take()
+                    symbolic.append((EXPR, binary(COMPARE_OPS[arg], a, b)))
+                elif opcode == Opcode.NEGATE:
+                    symbolic.append((EXPR, unary(operator.neg, take())))
+                elif opcode == Opcode.NOT:
+                    symbolic.append((EXPR, unary(operator.not_, take())))
+                elif opcode == Opcode.PRINT:
+                    value = take()
+                    flush(pc)
+                    statements.append((print_value(value), pc))
+                elif opcode == Opcode.INC_FAST or opcode == Opcode.INC_GLOBAL:
+                    flush(pc)
+                    inc = inc_fast if opcode == Opcode.INC_FAST else inc_global
+                    statements.append((inc(*arg), pc))
+                elif opcode == Opcode.JUMP_ABSOLUTE:
+                    flush(pc)
+                    terminator = jump(arg)
+                elif opcode == Opcode.JUMP_IF_FALSE:
+                    cond = getter(take())
+                    flush(pc)
+                    terminator = branch(cond, arg, pc + 1)
+                elif opcode == Opcode.COMPARE_JUMP_IF_FALSE:
+                    cmp_op, target = arg
+                    b = take()
+                    a = take()
+                    cond = binary(COMPARE_OPS[cmp_op], a, b)
+                    flush(pc)
+                    terminator = branch(cond, target, pc + 1)
+                elif opcode == Opcode.CALL:
+                    target = take()
+                    flush(pc)
+                    terminator = call(target, arg, pc + 1)
+                elif opcode == Opcode.RETURN:
+                    flush(pc)
+                    terminator = return_()
+                elif opcode == Opcode.HALT:
+                    flush(pc)
+                    terminator = halt()
+                else:
+                    raise Exception(f"HATA: Bilinmeyen opcode {opcode}")
+
+            if terminator is None:
+                # Sonraki bloga (veya program sonuna) dusen blok
+                flush(end - 1)
+                terminator = jump(end)
+            return make_block(statements, terminator, start, end - start)
+
+        for start, end in zip(leaders, leaders[1:] + [end_pc]):
+            cells[start][0] = compile_block(start, end)
+
+        def executed_count():
+            return count
+
+        def failed_pc():
+            return error_pc
+
+        return cell_at(0)[0], executed_count, failed_pc
+
+    def run(self, instructions, global_names=(), line_table=None):
+        # line_table: verilirse calisma zamani hatalari kaynak satiriyla bildirilir (line_table.py)
+        if not self.quiet:
+            print("--- Closure VM Calisiyor ---")
+        self.global_names = list(global_names)
+        self.globals[:] = [None] * len(self.global_names)
+        self.return_value = None
+        block, executed_count, failed_pc = self.compile(instructions)
+
+        try:
+            while block is not None:
+                block = block()
+        except Exception as e:
+            line = line_for(line_table, failed_pc()) if line_table else None
+            if line is None:
+                raise
+            raise Exception(f"Calisma zamani hatasi (satir {line}): {e}") from e
+
+        self.instruction_count = executed_count()
+        result = ExecutionResult(self.get_globals(), self.return_value, self.instruction_count, self.output)
+        if not self.quiet:
+            print("--- Closure VM Bitti ---")
+            print("Final Global Memory:", result.globals)
+        return result
+
+if __name__ == "__main__":
+    import io
+    import time
+    from contextlib import redirect_stdout
+    from compiler import Compiler
+    from virtual_machine import VirtualMachine
+
+    code = """
+    int fib(int n) {
+        if (n <= 1) { return n; }
+        return fib(n - 1) + fib(n - 2);
+    }
+    int toplam = 0;
+    for (int i = 0; i < 100000; i = i + 1) {
+        toplam = toplam + i % 7 * 2;
+    }
+    int f = fib(16);
+    """
+
+    program = Compiler().compile(code)
+    print(f"{len(program.instructions)} instruction, {len(find_leaders(program.instructions))} blok\n")
+    for vm in (VirtualMachine(), ClosureVM()):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            vm.run(program.instructions, program.global_names, program.line_table)
+            elapsed = time.perf_counter() - start
+        print(f"{type(vm).__name__:<15} {elapsed:.4f}s  {vm.instruction_count} instruction  {vm.get_globals()}")
@@ -0,0 +1,377 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from parser import parser as base_parser, lexer as base_lexer
+from fast_lexer import FastLexer, CHUNK_SIZE, read_chunks
+from semantic_analyzer import SemanticAnalyzer
+from bytecode_generator import BytecodeGenerator
+from register_generator import RegisterGenerator
+from virtual_machine import VirtualMachine
+from register_vm import RegisterVM
+from ast_optimizer import ConstantFolder
+from peephole import optimize_with_lines, DEFAULT_LEVEL, O1
+from diagnostics import DiagnosticSink
+import bytecode_format
+import line_table
+
+# Derleme Pipeline'i ve Derleme Cache'i
+#
+# Compiler.compile(source) kaynak kodu lex -> parse -> semantic analiz -> (AST optimizasyonu) -> bytecode ->
+# (peephole) adimlarindan gecirir ve CodeObject dondurur. Compiler'a cache verilirse sonuc cache'lenir.
+# Cache anahtari kaynak kodun ozeti, derleyici versiyonu ve optimizasyon seviyesinden olusur.
+#   - Bellek ici (in-process) cache: LRU, eleman sayisi ve toplam byte limiti
+#   - Disk cache'i (opsiyonel): cache_dir altinda <anahtar>.pbc dosyalari (bytecode_format), toplam byte limiti
+#
+# parser.py/lexer.py'deki lexer ve parser modul seviyesinde tek nesne, parse sirasinda durumlarini
+# (lineno, statestack, symstack) kendi uzerlerinde tutuyorlar. Compiler her thread icin bunlarin
+# ayri bir kopyasini kullanir, ayni Compiler birden fazla thread'den ayni anda cagrilabilir.
+# lexer="fast" ile PLY lexer'i yerine ayni token akisini ureten fast_lexer.FastLexer kullanilir.
+# compile_stream(f) kaynagi dosya/socket'ten parca parca okur (her zaman FastLexer'in akis modu ile),
+# kaynak kod bellekte tek bir string olarak tutulmaz.
+# backend="register" ile stack VM yerine register VM'i (register_vm.py) icin kod uretilir. Register kodu
+# bytecode_format ile yazilamaz (sabit boyutlu tek operand'li instruction'lar), sadece bellek ici cache'lenir.
+# host_functions (execution.HostFunction) programin cagirabildigi Python fonksiyonlaridir, imzalari cache
+# anahtarina eklenir. Ayni liste programi calistiran VirtualMachine'e de verilmeli (sadece stack backend).
+# inputs ({isim: tip}) programin bildirmeden okudugu global degiskenlerdir, degerleri calistirirken verilir:
+# vm.start(..., inputs={isim: deger}). Ayni program farkli girdilerle tekrar derlenmeden calistirilabilir.
+
+# Kod uretimi veya optimizasyonlar degistiginde arttirilmali, eski cache girdileri gecersiz olur
+COMPILER_VERSION = "2"
+
+# Varsayilan disk cache klasoru bu ortam degiskeniyle verilebilir
+CACHE_DIR_ENV = "PCOMPILER_CACHE_DIR"
+
+# Secilebilir lexer'lar, ikisi de ayni token akisini uretir (cache anahtarini etkilemez)
+LEXERS = ("ply", "fast")
+
+# Kod uretim hedefleri, CodeObject.backend
+STACK = "stack"
+REGISTER = "register"
+BACKENDS = (STACK, REGISTER)
+
+def cache_key(source, opt_level, backend=STACK, host_functions=(), inputs=None):
+    # Stack kodunun anahtari backend eklenmeden onceki anahtarla ayni (disk cache'i gecerli kalir)
+    prefix = f"{COMPILER_VERSION}:{bytecode_format.FORMAT_VERSION}:{opt_level}:"
+    if backend != STACK:
+        prefix += f"{backend}:"
+    if host_functions:
+        # Host fonksiyonlari global slotlari degistirir
+        prefix += ";".join(host.signature() for host in host_functions) + ":"
+    if inputs:
+        prefix += ";".join(f"{name} {tip}" for name, tip in inputs.items()) + ":"
+    data = prefix.encode('utf-8')
+    return hashlib.sha256(data + source.encode('utf-8')).hexdigest()
+
+class CodeObject:
+    # Derlenmis program: vm.run(code.instructions, code.global_names, code.line_table) ile calistirilir
+    # line_table: instruction indekslerinden kaynak satirlarina delta kodlanmis tablo (line_table.py)
+    # backend: kodun calistigi VM, STACK (VirtualMachine) veya REGISTER (RegisterVM)
+    def __init__(self, instructions, global_names, source_hash=None, line_table=b'', backend=STACK):
+        self.instructions = instructions
+        self.global_names = global_names
+        self.source_hash = source_hash
+        self.line_table = line_table
+        self.backend = backend
+
+    def create_vm(self, **options):
+        # options: VM ayarlari. Stack VM: quiet, output, limits, host_functions. Register VM: sadece quiet, output
+        if self.backend == REGISTER:
+            unsupported = sorted(set(options) - {'quiet', 'output'})
+            if unsupported:
+                raise Exception(f"HATA: Register backend'i {', '.join(unsupported)} secenegini desteklemiyor (sadece quiet ve output).")
+            return RegisterVM(**options)
+        return VirtualMachine(**options)
+
+    def line_for(self, pc):
+        return line_table.line_for(self.line_table, pc)
+
+    def to_bytes(self):
+        if self.backend != STACK:
+            raise Exception(f"HATA: '{self.backend}' kodu binary formatta yazilamaz, sadece stack kodu yazilabilir.")
+        return bytecode_format.dumps(self.instructions, self.global_names, digest=self.source_hash,
+                                     line_table=self.line_table)
+
+    @classmethod
+    def from_bytes(cls, data):
+        # Instruction'lar bir kere listeye cevrilir, her calistirmada tekrar decode edilmez
+        with bytecode_format.loads(data) as module:
+            return cls(list(module.instructions), module.global_names, module.source_hash, module.line_table)
+
+class Compiler:
+    def __init__(self, opt_level=DEFAULT_LEVEL, cache=None, lexer="ply", backend=STACK, host_functions=(),
+                 inputs=None):
+        if lexer not in LEXERS:
+            raise Exception(f"HATA: Bilinmeyen lexer '{lexer}', secenekler: {', '.join(LEXERS)}")
+        if backend not in BACKENDS:
+            raise Exception(f"HATA: Bilinmeyen backend '{backend}', secenekler: {', '.join(BACKENDS)}")
+        if (host_functions or inputs) and backend != STACK:
+            raise Exception("HATA: Host fonksiyonlari ve girdiler sadece stack backend'i ile kullanilabilir.")
+        self.opt_level = opt_level
+        self.cache = cache
+        self.lexer = lexer
+        self.backend = backend
+        self.host_functions = tuple(host_functions)
+        self.inputs = dict(inputs or {})
+        # Thread basina lexer/parser kopyalari
+        self.local = threading.local()
+
+    def frontend(self):
+        # Cagiran thread'in lexer/parser kopyasi, ilk kullanimda olusturulur.
+        # Lexer.clone() kural tablolarini paylasir, sadece durumu kopyalar.
+        # LRParser'in kopyasi action/goto tablolarini paylasir, parse yigitlari ayri tutulur.
+        local = self.local
+        if not hasattr(local, 'parser'):
+            local.lexer = FastLexer() if self.lexer == "fast" else base_lexer.clone()
+            local.parser = copy.copy(base_parser)
+        return local.lexer, local.parser
+
+    def parse(self, source):
+        # Syntax hatasinda parser Exception firlatir
+        lexer, parser = self.frontend()
+        lexer.lineno = 1
+        return parser.parse(source, lexer=lexer)
+
+    def parse_stream(self, stream, chunk_size=CHUNK_SIZE, on_chunk=None):
+        # Parser token'lari akistan okunan parcalardan generator ile ceker
+        # on_chunk: okunan her str parcasiyla cagrilir (ornek: kaynak ozeti hesaplamak icin)
+        _, parser = self.frontend()
+        chunks = read_chunks(stream, chunk_size)
+        if on_chunk is not None:
+            chunks = self.observe_chunks(chunks, on_chunk)
+        lexer = FastLexer()
+        lexer.input_chunks(chunks)
+        return parser.parse(lexer=lexer)
+
+    @staticmethod
+    def observe_chunks(chunks, on_chunk):
+        for chunk in chunks:
+            on_chunk(chunk)
+            yield chunk
+
+    def analyze(self, ast, source=None):
+        # Sessiz analiz, butun hatalar toplanir ve hata varsa derleme basarisiz sayilir
+        # source verilirse hatalarda sutun bilgisi de olur
+        return SemanticAnalyzer(quiet=True, diagnostics=DiagnosticSink(source),
+                                host_functions=self.host_functions, inputs=self.inputs).analyze(ast)
+
+    def compile_uncached(self, source, opt_level=None):
+        # Butun pipeline'i cache'e bakmadan calistirir
+        if opt_level is None:
+            opt_level = self.opt_level
+        return self.compile_ast(self.parse(source), opt_level, bytecode_format.source_hash(source), source)
+
+    def compile_stream(self, stream, opt_level=None, chunk_size=CHUNK_SIZE):
+        # Dosya veya socket'ten (text ya da UTF-8 binary) parca parca okuyarak derler, cache kullanilmaz
+        # Kaynak ozeti okunan parcalardan hesaplanir, compile(source) ile ayni source_hash'i verir
+        if opt_level is None:
+            opt_level = self.opt_level
+        digest = hashlib.sha256()
+        ast = self.parse_stream(stream, chunk_size, lambda chunk: digest.update(chunk.encode('utf-8')))
+        return self.compile_ast(ast, opt_level, digest.digest())
+
+    def compile_ast(self, ast, opt_level, source_hash=None, source=None):
+        # Parse sonrasi adimlar: semantic analiz, AST optimizasyonu, kod uretimi, peephole
+        if ast is None:
+            raise Exception("Syntax hatasi nedeniyle AST olusturulamadi.")
+        self.analyze(ast, source)
+
+        if opt_level >= O1:
+            ast = ConstantFolder().optimize(ast)
+        if self.backend == REGISTER:
+            # Peephole stack koduna ozel, register kodunda birlestirmeler uretim sirasinda yapiliyor
+            codegen = RegisterGenerator()
+            codegen.visit(ast)
+            return CodeObject(codegen.get_bytecode(), codegen.get_global_names(), source_hash,
+                              codegen.get_line_table(), REGISTER)
+        codegen = BytecodeGenerator(self.host_functions, self.inputs)
+        codegen.visit(ast)
+        instructions, lines = optimize_with_lines(codegen.get_bytecode(), codegen.get_lines(), opt_level)
+        return CodeObject(instructions, codegen.get_global_names(), source_hash, line_table.encode(lines))
+
+    def compile(self, source, opt_level=None):
+        # Kaynak kodu derler, ayni kaynak daha once derlendiyse cache'ten dondurur
+        if opt_level is None:
+            opt_level = self.opt_level
+        cache = self.cache
+        if cache is None:
+            return self.compile_uncached(source, opt_level)
+
+        key = cache_key(source, opt_level, self.backend, self.host_functions, self.inputs)
+        code = cache.get(key)
+        if code is not None:
+            return code
+
+        with cache.lock:
+            cache.misses += 1
+        return cache.put(key, self.compile_uncached(source, opt_level))
+
+class CompileCache:
+    def __init__(self, cache_dir=None, max_entries=256, max_bytes=64 * 1024 * 1024,
+                 max_disk_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        # anahtar -> (CodeObject, binary boyutu), en son kullanilan sonda
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    # Bellek ici cache
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        data = self.read_disk(key)
+        if data is None:
+            return None
+        try:
+            code = CodeObject.from_bytes(data)
+        except Exception:
+            # Bozuk veya eski formatli dosya, miss sayilir ve yeniden derlenir
+            return None
+        with self.lock:
+            self.disk_hits += 1
+        return self.insert(key, code, len(data))
+
+    def put(self, key, code):
+        if code.backend != STACK:
+            # Diske yazilamiyor, boyut olarak instruction sayisi kadar binary instruction sayilir
+            return self.insert(key, code, len(code.instructions) * bytecode_format.INSTR_SIZE)
+        data = code.to_bytes()
+        self.write_disk(key, data)
+        return self.insert(key, code, len(data))
+
+    def insert(self, key, code, size):
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (code, size)
+            self.total_bytes += size
+
+            # LRU: en eski girdiler limitler saglanana kadar atilir (en az bir girdi kalir)
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+                _, (_, size) = self.entries.popitem(last=False)
+                self.total_bytes -= size
+        return code
+
+    # Disk cache'i
+
+    def disk_path(self, key):
+        return os.path.join(self.cache_dir, key + ".pbc")
+
+    def read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self.disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Son kullanim zamani LRU icin guncelleniyor
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def write_disk(self, key, data):
+        if not self.cache_dir:
+            return
+        path = self.disk_path(key)
+        # Yarim yazilmis dosya okunmasin diye once gecici dosyaya yaziliyor
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self.evict_disk()
+
+    def evict_disk(self):
+        # Disk limiti asildiysa en uzun suredir kullanilmayan dosyalari sil
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pbc"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+default_cache = CompileCache(cache_dir=os.environ.get(CACHE_DIR_ENV))
+default_compiler = Compiler(cache=default_cache)
+
+def compile_uncached(source, opt_level=DEFAULT_LEVEL):
+    return default_compiler.compile_uncached(source, opt_level)
+
+def compile(source, opt_level=DEFAULT_LEVEL, cache=None):
+    # Kolaylik fonksiyonu, donus: CodeObject
+    if cache is None or cache is default_cache:
+        return default_compiler.compile(source, opt_level)
+    return Compiler(opt_level, cache).compile(source)
+
+if __name__ == "__main__":
+    from virtual_machine import VirtualMachine
+
+    code = """
+    int x = 10;
+    int num = 0;
+    while (x > 0) {
+        x = x - 1;
+        num = num + 1;
+    }
+    """
+
+    for _ in range(3):
+        code_obj = compile(code)
+        VirtualMachine().run(code_obj.instructions, code_obj.global_names, code_obj.line_table)
+    print("Cache:", default_cache.stats())
+
+    # Ayni Compiler thread havuzundan paralel kullanilabilir
+    from concurrent.futures import ThreadPoolExecutor
+    sources = [f"int x = {i}; int y = x * 2;" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(default_compiler.compile, sources))
+    print("Paralel derleme:", [len(code_obj.instructions) for code_obj in results])
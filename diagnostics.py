@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+# Derleyici Hatalari (Diagnostics)
+#
+# SemanticAnalyzer buldugu hatalari yazdirmak veya Exception firlatmak yerine bir DiagnosticSink'e bildirir,
+# analiz ilk hatada durmaz, programdaki butun hatalar tek geciste toplanir. Her hata:
+#   code: hata kodu (asagidaki sabitler), severity: ERROR/WARNING, message: aciklama,
+#   line/column: kaynaktaki yer, 1'den baslar (node'da pozisyon yoksa None,
+#                sutun sadece sink'e kaynak kod verildiyse hesaplanir)
+
+ERROR = "error"
+WARNING = "warning"
+
+# Hata kodlari
+REDECLARED_VARIABLE = "E001"
+REDECLARED_FUNCTION = "E002"
+UNDEFINED_NAME = "E003"
+UNDEFINED_FUNCTION = "E004"
+NOT_A_FUNCTION = "E005"
+ARGUMENT_COUNT = "E006"
+ARGUMENT_TYPE = "E007"
+CONDITION_TYPE = "E008"
+DECLARATION_TYPE = "E009"
+ASSIGNMENT_TYPE = "E010"
+ARITHMETIC_TYPE = "E011"
+COMPARISON_TYPE = "E012"
+LOGIC_TYPE = "E013"
+UNARY_TYPE = "E014"
+
+SEVERITY_LABELS = {ERROR: "HATA", WARNING: "UYARI"}
+
+class Diagnostic(namedtuple('Diagnostic', 'code severity message line column')):
+    __slots__ = ()
+
+    def format(self):
+        # "HATA [E003] (satir 4, sutun 9): 'x' tanimli degil!"
+        location = ""
+        if self.line is not None:
+            location = f" (satir {self.line}" + (f", sutun {self.column})" if self.column is not None else ")")
+        return f"{SEVERITY_LABELS[self.severity]} [{self.code}]{location}: {self.message}"
+
+    def __str__(self):
+        return self.format()
+
+def node_position(node, source=None):
+    # Node'un (satir, sutun) bilgisi, bilinmeyenler None
+    line = getattr(node, 'lineno', None)
+    start = getattr(node, 'start', None)
+    column = None
+    if source is not None and start is not None:
+        column = start - source.rfind('\n', 0, start)
+    return line, column
+
+class DiagnosticSink:
+    # Bildirilen hatalari sirasiyla toplar
+    # source: analiz edilen kaynak kod, verilirse sutunlar node'larin baslangic pozisyonundan hesaplanir
+    def __init__(self, source=None):
+        self.diagnostics = []
+        self.source = source
+
+    def report(self, code, message, node=None, severity=ERROR):
+        line, column = node_position(node, self.source)
+        diagnostic = Diagnostic(code, severity, message, line, column)
+        self.diagnostics.append(diagnostic)
+        return diagnostic
+
+    def errors(self):
+        return [d for d in self.diagnostics if d.severity == ERROR]
+
+    def has_errors(self):
+        return any(d.severity == ERROR for d in self.diagnostics)
+
+    def clear(self):
+        self.diagnostics.clear()
+
+    def __iter__(self):
+        return iter(self.diagnostics)
+
+    def __len__(self):
+        return len(self.diagnostics)
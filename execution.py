@@ -0,0 +1,120 @@
+import inspect
+from collections import namedtuple
+
+# Calistirma Sonucu ve PRINT Ciktisi
+#
+# VM'ler (VirtualMachine, RegisterVM, ClosureVM) run() sonunda bir ExecutionResult dondurur:
+#   globals: isimli global degiskenler (get_globals()), return_value: ana programin return ettigi deger
+#   (yoksa None), instruction_count: calisan instruction sayisi, output: PRINT ciktisinin yazildigi hedef
+#
+# PRINT instruction'i degeri konsola yazmak yerine VM'e verilen cikti hedefinin write(value) metoduna verir:
+#   ConsoleOutput: "[OUTPUT] deger" satirlarini yazdirir (sessiz olmayan VM'in varsayilani)
+#   BufferedOutput: degerleri bellekte toplar (sessiz VM'in varsayilani), konsola hic yazmaz
+# write(value) metodu olan herhangi bir nesne de hedef olarak verilebilir (ornek: bir log kuyrugu).
+
+class ExecutionResult(namedtuple('ExecutionResult', 'globals return_value instruction_count output')):
+    __slots__ = ()
+
+class ConsoleOutput:
+    def write(self, value):
+        print(f"[OUTPUT] {value}")
+
+class BufferedOutput:
+    def __init__(self):
+        self.values = []
+        # PRINT basina metod cagrisi yerine dogrudan list.append
+        self.write = self.values.append
+
+    def getvalue(self):
+        return "\n".join(str(value) for value in self.values)
+
+    def clear(self):
+        self.values.clear()
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+def default_output(quiet):
+    return BufferedOutput() if quiet else ConsoleOutput()
+
+# Kaynak Limitleri
+#
+# Guvenilmeyen programlar icin VirtualMachine(limits=ResourceLimits(...)), None olan limitler uygulanmaz:
+#   max_instructions: calisan instruction sayisi, max_call_depth: ic ice cagri sayisi (frame sayisi),
+#   max_stack: operand stack'inin boyutu, timeout: saniye cinsinden duvar saati suresi (start'tan itibaren)
+# Limitler her instruction'da degil, sadece geri jump'larda ve cagrilarda kontrol edilir: dongu veya
+# ozyineleme olmadan program boyundan uzun calisilamaz. Instruction limiti en fazla bir duz kod parcasi kadar
+# asilabilir, sure ve stack boyutu her CHECK_INTERVAL instruction'da bir kontrol edilir.
+# Kontrol edilmeyen bir limit icin dongudeki maliyet tek bir tamsayi karsilastirmasidir.
+
+class ResourceLimits(namedtuple('ResourceLimits', 'max_instructions max_call_depth max_stack timeout',
+                                defaults=(None, None, None, None))):
+    __slots__ = ()
+
+UNLIMITED = ResourceLimits()
+
+CHECK_INTERVAL = 10_000
+
+class LimitExceeded(Exception):
+    # limit: asilan limitin ResourceLimits'teki adi
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+
+    def __reduce__(self):
+        # Process havuzundan (worker_pool.py) pickle ile donebilmesi icin
+        return (LimitExceeded, (self.limit, str(self)))
+
+# Host Fonksiyonlari
+#
+# Programlarin cagirabildigi Python fonksiyonlari. Compiler(host_functions=[...]) ile derlenen programda
+# global seviyede tanimliymis gibi kullanilir (tipleri semantic analizde kontrol edilir), VM'e de ayni
+# liste verilir: VirtualMachine(host_functions=[...]). Fonksiyon bir coroutine fonksiyonuysa (async def)
+# cagri VM'i durdurur ve scheduler.VMScheduler sonucu bekleyip VM'e verir, beklerken diger programlar calisir.
+
+class HostFunction:
+    __slots__ = ('name', 'func', 'params', 'return_type', 'is_async')
+
+    def __init__(self, name, func, params=(), return_type='int'):
+        # params: parametre tipleri (ornek: ('int', 'float')), return_type: donus tipi
+        self.name = name
+        self.func = func
+        self.params = tuple(params)
+        self.return_type = return_type
+        self.is_async = inspect.iscoroutinefunction(func)
+
+    def symbol(self):
+        # SemanticAnalyzer'in fonksiyon sembolu
+        return {'type': 'function', 'category': 'func', 'params': list(self.params),
+                'return_type': self.return_type}
+
+    def signature(self):
+        # Cache anahtari icin: "isim(int,float)int"
+        return f"{self.name}({','.join(self.params)}){self.return_type}"
+
+    def __repr__(self):
+        return f"HostFunction({self.signature()})"
+
+# Calisma Durumu
+#
+# VirtualMachine.save_state() calisan (veya durdurulmus) programin durumunun bir kopyasini dondurur,
+# restore_state(state) ayni program yukluyken bu duruma geri doner (ornek: bir zaman diliminden once
+# alinan durumdan tekrar calistirmak).
+
+class ExecutionState:
+    __slots__ = ('pc', 'stack', 'frames', 'return_stack', 'globals', 'instruction_count')
+
+    def __init__(self, pc, stack, frames, return_stack, globals_, instruction_count):
+        self.pc = pc
+        self.stack = stack
+        self.frames = frames
+        self.return_stack = return_stack
+        self.globals = globals_
+        self.instruction_count = instruction_count
+
+    def __repr__(self):
+        return (f"ExecutionState(pc={self.pc}, stack={len(self.stack)}, frames={len(self.frames)}, "
+                f"instructions={self.instruction_count})")
@@ -0,0 +1,248 @@
+import codecs
+import re
+from collections import namedtuple
+from functools import partial
+
+from lexer import reserved
+
+# Elle Yazilmis Hizli Lexer
+#
+# lexer.py'deki PLY lexer'i ile ayni token akisini (tip, deger, satir, pozisyon) uretir.
+# PLY her token icin master regex'i dener, LexToken nesnesi olusturur ve t_ fonksiyonlarini cagirir.
+# Burada token'in ilk karakterine gore dallanilir, sadece tanimlayici/sayi/string icin regex kullanilir
+# ve her token kucuk bir tuple olarak uretilir: (tip, deger, lineno, lexpos).
+#
+# Kurallar lexer.py ile ayni olmali, degistiginde iki lexer test_cases.py'deki
+# karsilastirma testiyle (ayni token akisi) kontrol edilir.
+#
+# Akis (streaming) modu: tokenize_stream() kaynagi dosya/socket gibi bir nesneden CHUNK_SIZE'lik
+# parcalarla okur. Hicbir token (string ve yorum dahil) satir sonunu gecemedigi icin her parcada
+# sadece son '\n'e kadar olan kisim lexlenir, yarim kalan satir sonraki parcayla birlestirilir.
+# Bellekte en fazla bir parca ve en uzun satir kadar kaynak tutulur.
+
+# Tek karakterli tokenlar
+SINGLE_TOKENS = {
+    '+': 'TOPLA',
+    '-': 'CIKAR',
+    '*': 'CARP',
+    '/': 'BOL',
+    '%': 'MODUL',
+    '=': 'ATAMA',
+    '<': 'KUCUK',
+    '>': 'BUYUK',
+    '!': 'DEGIL',
+    '(': 'SOL_PARANTEZ',
+    ')': 'SAG_PARANTEZ',
+    '{': 'SOL_SUSLU_PARANTEZ',
+    '}': 'SAG_SUSLU_PARANTEZ',
+    '[': 'SOL_KOSELI_PARANTEZ',
+    ']': 'SAG_KOSELI_PARANTEZ',
+    ';': 'NOKTALI_VIRGUL',
+    ',': 'VIRGUL',
+}
+
+# Iki karakterli tokenlar, tek karakterlilerden once denenir (PLY'de de uzun regex once)
+DOUBLE_TOKENS = {
+    '==': 'ESIT',
+    '!=': 'ESIT_DEGIL',
+    '<=': 'KUCUK_ESIT',
+    '>=': 'BUYUK_ESIT',
+    '&&': 'VE',
+    '||': 'VEYA',
+}
+
+# Ilk karakter -> {ikinci karakter: token tipi}
+DOUBLE_STARTS = {}
+for text, token_type in DOUBLE_TOKENS.items():
+    DOUBLE_STARTS.setdefault(text[0], {})[text[1]] = token_type
+
+IDENTIFIER_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+
+IDENTIFIER_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+# \d+\.\d+ (ONDALIKLI) veya \d+ (TAMSAYI); \d PLY'deki gibi Unicode rakamlari da kapsar
+NUMBER_RE = re.compile(r'\d+(\.\d+)?')
+STRING_RE = re.compile(r'"(?:[^\\\n]|\\.)*?"')
+
+def tokenize(data, lineno=1, offset=0):
+    # (tip, deger, lineno, lexpos) tuple listesi dondurur
+    # offset: data'nin tum girdideki baslangic pozisyonu (parca parca okurken lexpos icin)
+    tokens = []
+    append = tokens.append
+    identifier_match = IDENTIFIER_RE.match
+    number_match = NUMBER_RE.match
+    string_match = STRING_RE.match
+    keyword = reserved.get
+    find = data.find
+    single_tokens = SINGLE_TOKENS
+    double_starts = DOUBLE_STARTS
+    identifier_start = IDENTIFIER_START
+
+    pos = 0
+    end = len(data)
+    while pos < end:
+        c = data[pos]
+
+        # En sik gorulen durumlar once
+        if c in identifier_start:
+            m = identifier_match(data, pos)
+            value = m.group()
+            append((keyword(value, 'TANIMLAYICI'), value, lineno, pos + offset))
+            pos = m.end()
+            continue
+        if c == ' ' or c == '\t' or c == '\r':
+            pos += 1
+            continue
+        if c == '\n':
+            lineno += 1
+            pos += 1
+            continue
+
+        seconds = double_starts.get(c)
+        if seconds is not None and pos + 1 < end:
+            token_type = seconds.get(data[pos + 1])
+            if token_type is not None:
+                append((token_type, data[pos:pos + 2], lineno, pos + offset))
+                pos += 2
+                continue
+        token_type = single_tokens.get(c)
+        if token_type is not None:
+            append((token_type, c, lineno, pos + offset))
+            pos += 1
+            continue
+
+        if c == '#':
+            # Yorum satir sonuna kadar, '\n' satir sayimi icin birakilir
+            newline = find('\n', pos)
+            pos = end if newline < 0 else newline
+            continue
+        if c == '"':
+            m = string_match(data, pos)
+            if m is not None:
+                append(('STRING', m.group()[1:-1], lineno, pos + offset))
+                pos = m.end()
+                continue
+        else:
+            m = number_match(data, pos)
+            if m is not None:
+                value = m.group()
+                if m.group(1):
+                    append(('ONDALIKLI', float(value), lineno, pos + offset))
+                else:
+                    append(('TAMSAYI', int(value), lineno, pos + offset))
+                pos = m.end()
+                continue
+
+        # lexer.py'deki t_error ile ayni davranis
+        print("Geçersiz karakter '%s'" % c)
+        pos += 1
+    return tokens
+
+# Akis modunda bir okumada alinan karakter (veya byte) sayisi
+CHUNK_SIZE = 64 * 1024
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    # Text veya binary (UTF-8) akistan str parcalari uretir
+    # Binary akista parca sinirina denk gelen cok byte'li karakterler incremental decoder ile birlestirilir
+    decoder = None
+    while True:
+        chunk = stream.read(chunk_size)
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder('utf-8')()
+            text = decoder.decode(chunk, final=not chunk)
+        else:
+            text = chunk
+        if text:
+            yield text
+        if not chunk:
+            return
+
+def tokenize_chunks(chunks, lineno=1):
+    # str parcalarindan token tuple'lari ureten generator
+    offset = 0  # pending'in tum girdideki baslangic pozisyonu
+    # Bitmemis satirin parcalari, sadece satir sonu gelince birlestirilir (uzun satirda tekrar tekrar
+    # kopyalamamak icin), boylece tek satirlik buyuk girdi de dogrusal surede okunur
+    pending = []
+    for chunk in chunks:
+        cut = chunk.rfind('\n') + 1
+        if cut == 0:
+            # Satir henuz bitmedi
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        buffer = "".join(pending)
+        yield from tokenize(buffer, lineno, offset)
+        lineno += buffer.count('\n')
+        offset += len(buffer)
+        pending = [chunk[cut:]] if cut < len(chunk) else []
+    if pending:
+        yield from tokenize("".join(pending), lineno, offset)
+
+def tokenize_stream(stream, chunk_size=CHUNK_SIZE, lineno=1):
+    return tokenize_chunks(read_chunks(stream, chunk_size), lineno)
+
+class Token(namedtuple('Token', 'type value lineno lexpos')):
+    # Parser token'in alanlarina isimle eristigi icin tuple'in isimli hali
+    __slots__ = ()
+    # PLY syntax hatasinda token.lexer'i set etmeye calisir, tuple'da bu alan olmadigi icin sinif seviyesinde
+    lexer = None
+
+make_token = partial(tuple.__new__, Token)
+
+class FastLexer:
+    # PLY lexer arayuzu (input, token, lineno, clone), parser.parse(source, lexer=FastLexer()) ile kullanilir
+    # Akis modu: lexer.input_stream(f) sonrasi parser.parse(lexer=lexer), parser token'lari generator'dan ceker
+    def __init__(self):
+        self.lineno = 1
+        self.lexdata = ""
+        self.token = partial(next, iter(()), None)
+
+    def input(self, data):
+        self.lexdata = data
+        tokens = tokenize(data, self.lineno)
+        # Bir sonraki token'i, bitince None dondurur
+        self.token = partial(next, map(make_token, tokens), None)
+
+    def input_stream(self, stream, chunk_size=CHUNK_SIZE):
+        self.lexdata = None
+        self.token = partial(next, map(make_token, tokenize_stream(stream, chunk_size, self.lineno)), None)
+
+    def input_tokens(self, tokens):
+        # Onceden lexlenmis (tip, deger, lineno, lexpos) tuple'lari
+        self.lexdata = None
+        self.token = partial(next, map(make_token, tokens), None)
+
+    def input_chunks(self, chunks):
+        self.lexdata = None
+        self.token = partial(next, map(make_token, tokenize_chunks(chunks, self.lineno)), None)
+
+    def clone(self):
+        return FastLexer()
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+if __name__ == "__main__":
+    from parser import parser
+
+    data = """
+    int x = 10; # yorum
+    float f = 3.14;
+    string s = "merhaba";
+    if (x >= 5 && !(f == 2.0)) { x = x % 3; }
+    """
+
+    print(f"{'TOKEN TYPE':<25} {'VALUE':<15} {'LINE':<5} {'POS':<5}")
+    print("-" * 55)
+    for token_type, value, lineno, lexpos in tokenize(data):
+        print(f"{token_type:<25} {str(value):<15} {lineno:<5} {lexpos:<5}")
+
+    ast = parser.parse(data, lexer=FastLexer())
+    print(f"\nParser sonucu: {len(ast.statements)} statement")
+
+    # Ayni kaynak 7 karakterlik parcalarla akistan okunarak
+    import io
+    lexer = FastLexer()
+    lexer.input_stream(io.StringIO(data), chunk_size=7)
+    ast = parser.parse(lexer=lexer)
+    print(f"Akis modunda parser sonucu: {len(ast.statements)} statement")
@@ -0,0 +1,209 @@
+from symbol_table import SymbolTable
+from semantic_analyzer import SemanticAnalyzer
+from diagnostics import DiagnosticSink
+from ast_structure import DegiskenBildir, FonksiyonBildir
+
+# Artimli (incremental) Semantic Analiz
+#
+# Programin her ust seviye statement'i (degisken/fonksiyon bildirimi, atama, dongu ...) ayri bir analiz
+# birimidir. Bir birim analiz edilirken TrackingSymbolTable, birimin global scope'ta aradigi (lookup) veya
+# global scope'ta kontrol ettigi (check_current_scope) isimleri ve global scope'a ekledigi sembolleri kaydeder.
+#
+# Analiz program sirasiyla yapilir, bir birim sadece kendinden onceki bildirimleri gorur. analyze(program,
+# changed) tek geciste:
+#   - Yeni veya degisen (changed) birimleri yeniden analiz eder,
+#   - Bagimli oldugu isimlerden birinin bildirimi degisen birimleri yeniden analiz eder,
+#   - Diger birimlerin kayitli global sembollerini tabloya ekler ve onceki hatalarini kullanir.
+# Yeniden analiz edilen veya yerine yenisi gelen birimin ekledigi semboller degistiyse (ornek: fonksiyonun
+# parametre tipleri) bu isimler degismis sayilir. Boylece bir fonksiyonun govdesindeki degisiklik sadece o
+# fonksiyonu, imzasindaki degisiklik o fonksiyonu ve onu kullananlari yeniden analiz ettirir.
+#
+# Birimler AST node'unun kimligi (id) ile tutulur. incremental_parser.IncrementalParser degismeyen
+# statement'larin node'larini aynen korur, icinde degisiklik olanlari ParseResult.changed ile bildirir:
+#     result = inc.reparse(result, offset, removed, inserted)
+#     diagnostics = analyzer.analyze(result.ast, result.changed, result.lines()).diagnostics
+#
+# Birimler sessiz (quiet) analiz edilir, hatalar diagnostics.Diagnostic listesi olarak birimde saklanir.
+# Yeniden kullanilan node'larin pozisyonlari degisiklikten once kalmis olabilir: lines (ust seviye
+# statement'larin guncel satirlari) verilirse hata satirlari birimin guncel satirina gore duzeltilir.
+
+class TrackingSymbolTable(SymbolTable):
+    # Global scope'a (scopes[0]) yapilan erisimleri kaydeden sembol tablosu
+    def __init__(self, global_scope):
+        self.scopes = [global_scope]
+        # Global scope'ta aranan isimler (bulunamayanlar dahil)
+        self.dependencies = set()
+        # Global scope'a eklenen (isim, bilgi) ciftleri
+        self.declared = []
+
+    def lookup(self, name):
+        scopes = self.scopes
+        for i in range(len(scopes) - 1, 0, -1):
+            if name in scopes[i]:
+                return scopes[i][name]
+        self.dependencies.add(name)
+        return scopes[0].get(name)
+
+    def check_current_scope(self, name):
+        if len(self.scopes) == 1:
+            self.dependencies.add(name)
+        return name in self.scopes[-1]
+
+    def add_symbol(self, name, info):
+        if len(self.scopes) == 1:
+            self.declared.append((name, info))
+        self.scopes[-1][name] = info
+
+class AnalysisUnit:
+    # Bir ust seviye statement'in son analiz sonucu
+    __slots__ = ('node', 'dependencies', 'declared', 'diagnostics', 'base_line', 'analyzed')
+
+    def __init__(self, node, dependencies, declared, diagnostics):
+        self.node = node
+        self.dependencies = dependencies
+        self.declared = declared
+        self.diagnostics = diagnostics
+        # Analiz sirasinda node'un satiri (hata satirlari buna goredir)
+        self.base_line = node.lineno
+        # Son analyze() cagrisinda analiz edildiyse True, onceki sonuc kullanildiysa False
+        self.analyzed = True
+
+class AnalysisResult:
+    def __init__(self, diagnostics, analyzed, reused):
+        self.diagnostics = diagnostics
+        # Yeniden analiz edilen ve onceki sonucu kullanilan birim sayilari
+        self.analyzed = analyzed
+        self.reused = reused
+
+def declaration_name(node):
+    if isinstance(node, (DegiskenBildir, FonksiyonBildir)):
+        return node.isim
+    return None
+
+def changed_names(old_declared, new_declared):
+    # Iki (isim, bilgi) listesi arasinda bilgisi farkli olan veya sadece birinde bulunan isimler
+    old = dict(old_declared)
+    new = dict(new_declared)
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+class IncrementalAnalyzer:
+    def __init__(self):
+        # id(node) -> AnalysisUnit
+        self.units = {}
+        # Son analizdeki birimler, program sirasiyla
+        self.order = []
+
+    def dependencies(self, node):
+        # Son analizde bu ust seviye statement'in bagimli oldugu global isimler
+        return self.units[id(node)].dependencies
+
+    def analyze(self, program, changed=(), lines=None):
+        # changed: icerigi degisen ust seviye statement node'lari
+        # lines: ust seviye statement'larin guncel satirlari (ParseResult.lines())
+        # Ilk cagrida (veya yeni node'larda) butun birimler analiz edilir
+        units = self.units
+        changed_ids = {id(node) for node in changed}
+        statement_ids = {id(node) for node in program.statements}
+
+        # Silinen birimler kendinden onceki ilk kalan birime (anchor) gore gruplanir.
+        # Ayni yere gelen yeni birimlerle karsilastirilir, sadece bildirimi farkli olan isimler degismis sayilir
+        # (ornek: bir statement silinince yeniden parse edilen komsusu ayni bildirimi tekrar yapar).
+        removed = {}
+        anchor = None
+        for unit in self.order:
+            key = id(unit.node)
+            if key in statement_ids:
+                anchor = key
+            else:
+                removed.setdefault(anchor, []).extend(unit.declared)
+
+        global_scope = {}
+        new_units = {}
+        order = []
+        diagnostics = []
+        dirty_names = set()
+        anchor = None
+        region = []  # anchor'dan sonraki yeni birimlerin bildirimleri
+        for position, node in enumerate(program.statements):
+            key = id(node)
+            unit = units.get(key)
+            if unit is None or unit.node is not node:
+                unit = self.analyze_unit(node, global_scope)
+                region.extend(unit.declared)
+            else:
+                if region or anchor in removed:
+                    dirty_names |= changed_names(removed.pop(anchor, ()), region)
+                    region = []
+                anchor = key
+                if key in changed_ids or not unit.dependencies.isdisjoint(dirty_names):
+                    previous = unit
+                    unit = self.analyze_unit(node, global_scope)
+                    dirty_names |= changed_names(previous.declared, unit.declared)
+                else:
+                    # Degismedi, onceki sonuc kullanilir
+                    unit.analyzed = False
+                    for name, info in unit.declared:
+                        global_scope[name] = info
+            new_units[key] = unit
+            order.append(unit)
+            shift = lines[position] - unit.base_line if lines is not None and unit.base_line is not None else 0
+            if shift:
+                diagnostics.extend(d._replace(line=d.line + shift) if d.line is not None else d
+                                   for d in unit.diagnostics)
+            else:
+                diagnostics.extend(unit.diagnostics)
+
+        self.units = new_units
+        self.order = order
+        analyzed = sum(unit.analyzed for unit in order)
+        return AnalysisResult(diagnostics, analyzed, len(order) - analyzed)
+
+    def analyze_unit(self, node, global_scope):
+        symtab = TrackingSymbolTable(global_scope)
+        sink = DiagnosticSink()
+        SemanticAnalyzer(symtab=symtab, diagnostics=sink, quiet=True).visit(node)
+        return AnalysisUnit(node, symtab.dependencies, symtab.declared, sink.diagnostics)
+
+if __name__ == "__main__":
+    from incremental_parser import IncrementalParser
+
+    code = """int limit = 10;
+int kare(int n) {
+    return n * n;
+}
+int topla(int n) {
+    int toplam = 0;
+    int i;
+    for (i = 0; i < n; i = i + 1) { toplam = toplam + kare(i); }
+    return toplam;
+}
+int baska(int n) {
+    return n + 1;
+}
+int sonuc = topla(limit);
+"""
+    inc = IncrementalParser()
+    analyzer = IncrementalAnalyzer()
+
+    result = inc.parse(code)
+    analysis = analyzer.analyze(result.ast, result.changed, result.lines())
+    print(f"Ilk analiz: {analysis.analyzed} birim, {len(analysis.diagnostics)} hata")
+    for node in result.ast.statements:
+        print(f"  {declaration_name(node)}: {sorted(analyzer.dependencies(node))}")
+
+    # Fonksiyon govdesinde degisiklik: sadece o fonksiyon analiz edilir
+    offset = code.index("n + 1")
+    result = inc.reparse(result, offset, 5, "n + true")
+    analysis = analyzer.analyze(result.ast, result.changed, result.lines())
+    print(f"Govde degisikligi: {analysis.analyzed} birim analiz edildi, {analysis.reused} birim kullanildi")
+    for diagnostic in analysis.diagnostics:
+        print(f"  {diagnostic.format()}")
+
+    # Fonksiyon imzasinda degisiklik: kare ve onu kullanan topla analiz edilir
+    text = result.text
+    offset = text.index("int kare(int n)") + len("int kare(")
+    result = inc.reparse(result, offset, 3, "float")
+    analysis = analyzer.analyze(result.ast, result.changed, result.lines())
+    print(f"Imza degisikligi: {analysis.analyzed} birim analiz edildi, {analysis.reused} birim kullanildi")
+    for diagnostic in analysis.diagnostics:
+        print(f"  {diagnostic.format()}")
@@ -0,0 +1,399 @@
+import copy
+from bisect import bisect_right
+
+from parser import parser as base_parser
+from fast_lexer import FastLexer, tokenize
+from ast_structure import Blok, IfStatement, WhileStatement, ForStatement, FonksiyonBildir, iter_child_nodes, walk
+
+# Artimli (Incremental) Parse
+#
+# Editor entegrasyonu icin: her degisiklikte butun dosyayi yeniden parse etmek yerine onceki parse
+# sonucu ve bir metin degisikligi (offset, silinen uzunluk, eklenen metin) verilir.
+#   - Her statement'in kaynaktaki araligi (span) ve icindeki {} bloklari parse sirasinda kaydedilir
+#   - Degisiklik tamamen bir Blok'un icindeyse o Blok'un statement listesinde ayni islem tekrarlanir,
+#     disaridaki node'lar aynen kalir
+#   - Aksi halde degisiklige denk gelen statement'lardan itibaren kaynak yeniden lexlenip statement'lara
+#     bolunur; eski bir statement sinirina (kaydirilmis haliyle) denk gelinince durulur (resync)
+#   - Sadece bu statement'lar parse edilir, digerlerinin AST node'lari yeniden kullanilir
+# Statement sinirlari token'lardan bulunur: parantez disinda ';' veya en dista kapanan '}' (arkasinda
+# 'else' yoksa). Hicbir token satir sonunu ve statement sinirini gecemedigi icin sinirdan itibaren
+# lexlemek butun dosyayi lexlemekle ayni token'lari verir.
+#
+# Donen AST onceki AST'nin guncellenmis halidir (ayni Program nesnesi), onceki ParseResult kullanilmamali.
+#
+# Node pozisyonlari (lineno/start/end): degisiklikten sonraki statement'larin node'lari her degisiklikte
+# gezilip kaydirilmaz. Her ust seviye statement'in alt agaci kendi icinde tutarlidir ama toplu olarak
+# kaymis olabilir; statement'in guncel baslangici ve satiri span'inda (start, line) tutulur.
+#   - ParseResult.lines(): ust seviye statement'larin guncel satirlari
+#   - ParseResult.materialize(): butun node pozisyonlarini guncel metne gore duzeltir (O(n))
+# Degisiklik bir statement'in icindeyse (Blok'ta devam edildiyse) sadece o statement'in node'lari duzeltilir.
+
+# Kaynak bu buyuklukte (satir sonuna tamamlanmis) parcalarla, ihtiyac oldukca lexlenir
+LEX_BLOCK = 2048
+
+class StatementSpan:
+    # start/end: ait oldugu listenin taban pozisyonuna gore [start, end)
+    # line: statement'in ilk satiri (sadece program seviyesindeki span'larda guncel tutulur)
+    # bloks: statement'in {} bloklari (kaynaktaki sirayla)
+    __slots__ = ('start', 'end', 'line', 'bloks')
+
+    def __init__(self, start, end, line, bloks):
+        self.start = start
+        self.end = end
+        self.line = line
+        self.bloks = bloks
+
+class BlokSpan:
+    # start: '{' pozisyonu, end: '}' sonrasi, ikisi de statement'in start'ina gore
+    # statements: Blok icindeki statement span'lari, '{' pozisyonuna gore
+    __slots__ = ('start', 'end', 'node', 'statements')
+
+    def __init__(self, start, end, node, statements):
+        self.start = start
+        self.end = end
+        self.node = node
+        self.statements = statements
+
+class ParseResult:
+    def __init__(self, text, ast, spans):
+        self.text = text
+        self.ast = ast
+        self.spans = spans
+        # Son degisiklikte yeniden parse edilen statement sayisi
+        self.reparsed = len(ast.statements)
+        # Son degisiklikte yeni olusturulan veya ici degisen ust seviye statement node'lari
+        # (incremental_analyzer'a degisen bildirimler olarak verilir)
+        self.changed = list(ast.statements)
+
+    def lines(self):
+        # Ust seviye statement'larin guncel satirlari (ast.statements ile ayni sirada)
+        return [span.line for span in self.spans]
+
+    def materialize(self):
+        # Butun node pozisyonlarini guncel metne gore duzeltir
+        for span, node in zip(self.spans, self.ast.statements):
+            materialize_statement(span, node)
+        statements = self.ast.statements
+        if statements:
+            self.ast.start = statements[0].start
+            self.ast.lineno = statements[0].lineno
+            self.ast.end = statements[-1].end
+
+def shift_nodes(node, offset_shift, line_shift):
+    for child in walk(node):
+        if child.start is not None:
+            child.start += offset_shift
+            child.end += offset_shift
+            child.lineno += line_shift
+
+def materialize_statement(span, node):
+    # Ust seviye statement'in alt agacini span'daki guncel baslangic ve satira kaydirir
+    if node.start is None:
+        return
+    offset_shift = span.start - node.start
+    line_shift = span.line - node.lineno
+    if offset_shift or line_shift:
+        shift_nodes(node, offset_shift, line_shift)
+
+def apply_edit(node, created, edit):
+    # Ici degisen statement'ta degisiklikten sonra kalan eski node'lari kaydirir
+    # created: yeni parse edilen node'larin id'leri (pozisyonlari zaten guncel)
+    offset, old_end, delta, line_delta = edit
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if id(node) in created:
+            continue
+        if node.start is not None:
+            if node.start >= old_end:
+                node.start += delta
+                node.lineno += line_delta
+            if node.end > offset and node.end >= old_end:
+                node.end += delta
+        stack.extend(iter_child_nodes(node))
+
+def statement_bloks(node):
+    # Statement'in kaynaktaki sirayla Blok'lari (token'lardaki {} gruplariyla eslesir)
+    if isinstance(node, Blok):
+        return [node]
+    if isinstance(node, IfStatement):
+        return [node.true_blok] + ([node.else_blok] if node.else_blok is not None else [])
+    if isinstance(node, (WhileStatement, ForStatement, FonksiyonBildir)):
+        return [node.govde]
+    return []
+
+class TokenReader:
+    # Token'lari ihtiyac oldukca lexleyen, bir token geri bakabilen okuyucu
+    def __init__(self, text, pos, lineno):
+        self.text = text
+        self.pos = pos
+        self.lineno = lineno
+        self.buffer = []
+        self.index = 0
+
+    def fill(self):
+        text = self.text
+        if self.pos >= len(text):
+            return False
+        cut = text.find('\n', self.pos + LEX_BLOCK)
+        cut = len(text) if cut < 0 else cut + 1
+        self.buffer = tokenize(text[self.pos:cut], self.lineno, self.pos)
+        self.index = 0
+        self.lineno += text.count('\n', self.pos, cut)
+        self.pos = cut
+        return True
+
+    def peek(self):
+        while self.index >= len(self.buffer):
+            if not self.fill():
+                return None
+        return self.buffer[self.index]
+
+    def next(self):
+        token = self.peek()
+        if token is not None:
+            self.index += 1
+        return token
+
+def read_statement(reader):
+    # Bir statement'in token'larini okur. Liste sonu ('}' veya dosya sonu) ise None dondurur.
+    first = reader.peek()
+    if first is None or first[0] == 'SAG_SUSLU_PARANTEZ':
+        return None
+
+    tokens = []
+    braces = parens = 0
+    while True:
+        token = reader.next()
+        if token is None:
+            # Yarim statement, parser syntax hatasi verecek
+            return tokens
+        tokens.append(token)
+        token_type = token[0]
+        if token_type == 'SOL_SUSLU_PARANTEZ':
+            braces += 1
+        elif token_type == 'SAG_SUSLU_PARANTEZ':
+            braces -= 1
+            if braces <= 0 and parens == 0:
+                following = reader.peek()
+                if following is None or following[0] != 'ELSE':
+                    return tokens
+        elif token_type == 'SOL_PARANTEZ':
+            parens += 1
+        elif token_type == 'SAG_PARANTEZ':
+            parens -= 1
+        elif token_type == 'NOKTALI_VIRGUL' and braces == 0 and parens == 0:
+            return tokens
+
+def token_end(token):
+    # Token'in kaynaktaki bitis pozisyonu
+    token_type, value, _, lexpos = token
+    if token_type == 'STRING':
+        return lexpos + len(value) + 2
+    if token_type in ('TAMSAYI', 'ONDALIKLI'):
+        # Tam statement ';' veya '}' ile biter, sayiyla biten yarim statement zaten syntax hatasi
+        return lexpos + 1
+    return lexpos + len(value)
+
+def build_span(tokens, node, base):
+    # Statement token'larindan (mutlak pozisyonlu) base'e gore span olusturur
+    start = tokens[0][3]
+    end = token_end(tokens[-1])
+    bloks = []
+
+    groups = []
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token[0] == 'SOL_SUSLU_PARANTEZ':
+            if depth == 0:
+                open_index = i
+            depth += 1
+        elif token[0] == 'SAG_SUSLU_PARANTEZ':
+            depth -= 1
+            if depth == 0:
+                groups.append((open_index, i))
+
+    blok_nodes = statement_bloks(node)
+    if len(groups) == len(blok_nodes):
+        for (open_index, close_index), blok in zip(groups, blok_nodes):
+            open_pos = tokens[open_index][3]
+            inner = split_tokens(tokens[open_index + 1:close_index])
+            if len(inner) != len(blok.statements):
+                bloks = None
+                break
+            statements = [build_span(stmt_tokens, stmt, open_pos) for stmt_tokens, stmt in zip(inner, blok.statements)]
+            bloks.append(BlokSpan(open_pos - start, tokens[close_index][3] + 1 - start, blok, statements))
+    else:
+        bloks = None
+    return StatementSpan(start - base, end - base, tokens[0][2], bloks)
+
+def split_tokens(tokens):
+    # Hazir token listesini statement'lara boler
+    reader = TokenReader("", 0, 1)
+    reader.buffer = tokens
+    statements = []
+    while True:
+        stmt_tokens = read_statement(reader)
+        if stmt_tokens is None:
+            return statements
+        statements.append(stmt_tokens)
+
+class IncrementalParser:
+    def __init__(self):
+        # Compiler'daki gibi kendi parser kopyasi (parse yigitlari paylasilmaz)
+        self.parser = copy.copy(base_parser)
+
+    def parse_tokens(self, tokens, text):
+        # Token pozisyonlari text'e gore mutlak, node pozisyonlari (parser.set_span) da oyle olur
+        lexer = FastLexer()
+        lexer.input_tokens(tokens)
+        lexer.lexdata = text
+        ast = self.parser.parse(lexer=lexer)
+        if ast is None:
+            raise Exception("Syntax hatasi nedeniyle AST olusturulamadi.")
+        if ast.statements is None:
+            ast.statements = []
+        return ast
+
+    def parse(self, text):
+        # Butun kaynagi parse eder, sonraki degisiklikler icin span'lari kaydeder
+        tokens = tokenize(text)
+        ast = self.parse_tokens(tokens, text)
+        groups = split_tokens(tokens)
+        if len(groups) != len(ast.statements):
+            raise Exception("HATA: Statement sinirlari parser ile uyusmuyor.")
+        spans = [build_span(stmt_tokens, stmt, 0) for stmt_tokens, stmt in zip(groups, ast.statements)]
+        return ParseResult(text, ast, spans)
+
+    def reparse(self, previous, offset, removed_length, inserted_text):
+        # previous: onceki ParseResult, degisiklik: text[offset:offset+removed_length] -> inserted_text
+        old_text = previous.text
+        if not 0 <= offset <= offset + removed_length <= len(old_text):
+            raise Exception("HATA: Degisiklik araligi kaynak disinda.")
+        text = old_text[:offset] + inserted_text + old_text[offset + removed_length:]
+        line_delta = inserted_text.count('\n') - old_text.count('\n', offset, offset + removed_length)
+        edit = (offset, offset + removed_length, len(inserted_text) - removed_length, line_delta)
+
+        changed = []
+        reparsed = self.update(previous.spans, previous.ast.statements, 0, 0, None, text, edit, changed)
+        if previous.ast.end is not None:
+            previous.ast.end += edit[2]
+        result = ParseResult(text, previous.ast, previous.spans)
+        result.reparsed = reparsed
+        result.changed = changed
+        return result
+
+    def update(self, spans, nodes, base, content_start, close_pos, text, edit, changed=None, created=None):
+        # Bir statement listesini (program veya Blok) gunceller, yeniden parse edilen statement sayisini dondurur.
+        # base: span pozisyonlarinin tabani, content_start: listenin kaynaktaki baslangici,
+        # close_pos: Blok'un kapanan '}' pozisyonu (eski kaynakta), program icin None.
+        # Blok icinde statement sinirlari bulunamazsa (degisiklik Blok'un yapisini bozduysa) None dondurur.
+        # changed: ust seviyede degisen statement node'lari buraya eklenir (sadece program listesi icin verilir)
+        # created: Blok icinde yeni parse edilen statement node'lari buraya eklenir
+        offset, old_end, delta, line_delta = edit
+        index = bisect_right(spans, offset - base, key=lambda span: span.end)
+
+        # Degisiklik tek bir statement'in bir Blok'unun tamamen icindeyse o Blok'ta devam et
+        if index < len(spans):
+            span = spans[index]
+            stmt_start = base + span.start
+            if span.bloks and stmt_start < offset and old_end < base + span.end:
+                for blok in span.bloks:
+                    open_pos = stmt_start + blok.start
+                    close = stmt_start + blok.end - 1
+                    if open_pos < offset and old_end <= close:
+                        if changed is not None:
+                            # Ust seviye statement'in node'lari once eski metne gore guncellenir
+                            materialize_statement(span, nodes[index])
+                        inner_created = []
+                        reparsed = self.update(blok.statements, blok.node.statements, open_pos, open_pos + 1,
+                                               close, text, edit, created=inner_created)
+                        if reparsed is None:
+                            break
+                        if created is not None:
+                            created.extend(inner_created)
+                        if changed is not None:
+                            apply_edit(nodes[index], {id(node) for new in inner_created for node in walk(new)}, edit)
+                        blok.end += delta
+                        span.end += delta
+                        for later in span.bloks[span.bloks.index(blok) + 1:]:
+                            later.start += delta
+                            later.end += delta
+                        for later in spans[index + 1:]:
+                            later.start += delta
+                            later.end += delta
+                            later.line += line_delta
+                        if changed is not None:
+                            changed.append(nodes[index])
+                        return reparsed
+
+        # 'else' eklenebilecegi icin else'i olmayan onceki if de yeniden parse edilir
+        first = index
+        if first > 0 and isinstance(nodes[first - 1], IfStatement) and nodes[first - 1].else_blok is None:
+            first -= 1
+        region_start = base + spans[first - 1].end if first > 0 else content_start
+
+        reader = TokenReader(text, region_start, text.count('\n', 0, region_start) + 1)
+        new_edit_end = old_end + delta
+        groups = []
+        last = None
+        while True:
+            stmt_tokens = read_statement(reader)
+            if stmt_tokens is None:
+                closing = reader.peek()
+                if close_pos is None:
+                    if closing is not None:
+                        raise Exception(f"Syntax hatasi, token SAG_SUSLU_PARANTEZ, deger '}}', satir {closing[2]}")
+                elif closing is None or closing[3] != close_pos + delta:
+                    # Blok'un kapanisi degisti, ust seviyede yeniden parse edilmeli
+                    return None
+                last = len(spans) - 1
+                break
+
+            groups.append(stmt_tokens)
+            stmt_end = token_end(stmt_tokens[-1])
+            if close_pos is not None and stmt_end > close_pos + delta:
+                return None
+            if stmt_end >= new_edit_end:
+                # Eski bir statement'in sonuna denk geldiyse sonrasi ayni
+                old_index = bisect_right(spans, stmt_end - delta - base - 1, key=lambda span: span.end)
+                if old_index < len(spans) and base + spans[old_index].end == stmt_end - delta:
+                    last = old_index
+                    break
+            if reader.peek() is None and close_pos is None:
+                last = len(spans) - 1
+                break
+
+        new_nodes = self.parse_tokens([token for stmt_tokens in groups for token in stmt_tokens], text).statements if groups else []
+        if len(new_nodes) != len(groups):
+            raise Exception("HATA: Statement sinirlari parser ile uyusmuyor.")
+        new_spans = [build_span(stmt_tokens, node, base) for stmt_tokens, node in zip(groups, new_nodes)]
+
+        for later in spans[last + 1:]:
+            later.start += delta
+            later.end += delta
+            later.line += line_delta
+        spans[first:last + 1] = new_spans
+        nodes[first:last + 1] = new_nodes
+        if changed is not None:
+            changed.extend(new_nodes)
+        if created is not None:
+            created.extend(new_nodes)
+        return len(new_nodes)
+
+if __name__ == "__main__":
+    source = """int topla(int a, int b) {
+    int x = 25;
+    return a + b + x;
+}
+int sonuc = topla(5, 15);
+"""
+    inc = IncrementalParser()
+    result = inc.parse(source)
+    print(result.ast)
+
+    # Fonksiyon govdesindeki 25 -> 30
+    offset = source.index("25")
+    result = inc.reparse(result, offset, 2, "30")
+    print(result.ast)
+    print(f"Yeniden parse edilen statement: {result.reparsed}")
@@ -0,0 +1,90 @@
+from bisect import bisect_left
+
+# Satir Tablosu
+#
+# Bytecode'daki instruction indekslerini kaynak satirlarina esler. BytecodeGenerator satiri degisen her
+# node'un ilk instruction'inda bir (indeks, satir) kaydi yapar, bir kaydin satiri bir sonraki kayda kadar
+# olan instruction'lar icin gecerlidir.
+#
+# Tablo CPython'daki co_lnotab gibi ardisik kayitlarin farklari olarak bir byte dizisinde tutulur:
+# her kayit (indeks farki, satir farki) byte ciftidir, indeks farki 0..255, satir farki -128..127
+# (isaretli byte). Daha buyuk farklar birden fazla cifte bolunur. Tipik bir programda instruction
+# basina bir byte'tan az yer tutar.
+#
+# VM calisirken tabloya bakmaz (instruction basina ek maliyet yok), sadece hata olustugunda
+# line_for(tablo, pc) ile hatali instruction'in satiri bulunur.
+
+def add_entry(entries, index, line):
+    # Ayni indekse gelen kayitlardan sonuncusu gecerli (arada instruction uretilmemis)
+    if entries and entries[-1][0] == index:
+        entries[-1] = (index, line)
+    else:
+        entries.append((index, line))
+
+def encode(entries):
+    # [(indeks, satir)] (indeks artan sirada) -> bytes
+    data = bytearray()
+    last_index = 0
+    last_line = 0
+    for index, line in entries:
+        index_delta = index - last_index
+        line_delta = line - last_line
+        while index_delta > 255:
+            data += b'\xff\x00'
+            index_delta -= 255
+        while line_delta > 127:
+            data += bytes((index_delta, 127))
+            index_delta = 0
+            line_delta -= 127
+        while line_delta < -128:
+            data += bytes((index_delta, 0x80))
+            index_delta = 0
+            line_delta += 128
+        data += bytes((index_delta, line_delta & 0xff))
+        last_index, last_line = index, line
+    return bytes(data)
+
+def decode(data):
+    # bytes -> [(indeks, satir)]
+    entries = []
+    index = 0
+    line = 0
+    for i in range(0, len(data), 2):
+        index += data[i]
+        line_delta = data[i + 1]
+        line += line_delta - 256 if line_delta >= 128 else line_delta
+        add_entry(entries, index, line)
+    return entries
+
+def line_for(data, pc):
+    # pc'deki instruction'in satiri, tabloda yoksa None
+    index = 0
+    line = 0
+    result = None
+    for i in range(0, len(data), 2):
+        index += data[i]
+        if index > pc:
+            break
+        line_delta = data[i + 1]
+        line += line_delta - 256 if line_delta >= 128 else line_delta
+        result = line
+    return result
+
+def relocate(entries, old_indexes):
+    # Peephole sonrasi: old_indexes yeni koddaki instruction'larin eski indeksleri (artan sirada).
+    # Silinen bir indeksin kaydi bir sonraki kalan instruction'a gider.
+    result = []
+    count = len(old_indexes)
+    for index, line in entries:
+        new_index = bisect_left(old_indexes, index)
+        if new_index < count:
+            add_entry(result, new_index, line)
+    return result
+
+if __name__ == "__main__":
+    entries = [(0, 1), (3, 2), (7, 2), (9, 5), (400, 300), (402, 4)]
+    data = encode(entries)
+    print(f"{len(entries)} kayit -> {len(data)} byte: {data.hex()}")
+    print("decode:", decode(data))
+    for pc in (0, 5, 9, 401, 500):
+        print(f"pc {pc}: satir {line_for(data, pc)}")
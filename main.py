@@ -1,9 +1,16 @@
 # In your main file or test runner:
+import sys
+
 from parser import parser, lexer
 from ast_function import print_ast
 from semantic_analyzer import SemanticAnalyzer
 from bytecode_generator import BytecodeGenerator
 from virtual_machine import VirtualMachine
+from peephole import optimize_with_lines, DEFAULT_LEVEL, O1
+from ast_optimizer import ConstantFolder
+from compiler import Compiler, STACK, REGISTER
+import bytecode_format
+import line_table
 
 code1 = """
 let x = 10;
@@ -42,8 +49,35 @@ while (x > 0) {
 }
 """
 
+def run_precompiled(path):
+    # Derlenmis .pbc dosyasini lex/parse/analiz yapmadan dogrudan calistir
+    print(f"--- Precompiled Bytecode: {path} ---")
+    with bytecode_format.load(path) as module:
+        vm = VirtualMachine()
+        vm.run(module.instructions, module.global_names, module.line_table)
+
+def run_source_file(path, backend=STACK):
+    # Kaynak dosyayi bellege tek string olarak almadan, parca parca okuyarak derle ve calistir
+    print(f"--- Kaynak Dosya: {path} ---")
+    with open(path, 'rb') as f:
+        code = Compiler(backend=backend).compile_stream(f)
+    vm = code.create_vm()
+    vm.run(code.instructions, code.global_names, code.line_table)
+
 if __name__ == "__main__":
+    # python main.py program.pbc -> derlenmis programi calistir
+    # python main.py program.src -> kaynak dosyayi akis modunda derleyip calistir
+    # python main.py program.src --register -> register VM ile calistir
+    if len(sys.argv) > 1:
+        if sys.argv[1].endswith(".pbc"):
+            run_precompiled(sys.argv[1])
+        else:
+            run_source_file(sys.argv[1], REGISTER if "--register" in sys.argv[2:] else STACK)
+        sys.exit()
+
     input_code = code4
+    # Peephole optimizasyon seviyesi (0: kapali, 1: jump/dead code, 2: + superinstruction)
+    opt_level = DEFAULT_LEVEL
 
     print("==========================================\n")
     print("--- Compiler Design Project ---\n")
@@ -77,22 +111,30 @@ if __name__ == "__main__":
     print("\n--- Semantic Analysis ---")
     try:
         analyzer = SemanticAnalyzer()
-        analyzer.visit(ast)
+        analyzer.analyze(ast)
         # Note: SemanticAnalyzer errorlari/scopelari internally tutuyor
     except Exception as e:
         print(f"KRITIK SEMANTIC HATASI: {e}")
         exit()
     print("----------------------------\n")
 
+    if opt_level >= O1:
+        print("\n--- AST Optimizasyonu (Constant Folding) ---")
+        ast = ConstantFolder().optimize(ast)
+        print_ast(ast)
+        print("----------------------------\n")
+
     print("\n--- Bytecode Generation ---")
     codegen = BytecodeGenerator()
     codegen.visit(ast)
-    bytecode = codegen.get_bytecode()
+    bytecode, lines = optimize_with_lines(codegen.get_bytecode(), codegen.get_lines(), opt_level)
+    global_names = codegen.get_global_names()
+    lines = line_table.encode(lines)
 
     # instructionlari printleme
     for i, (op, arg) in enumerate(bytecode):
         arg_str = str(arg) if arg is not None else ""
-        print(f"{i:<3}: {op:<15} {arg_str}")
+        print(f"{i:<3}: {op.name:<15} {arg_str}")
     print("------------------------------\n")
 
     # dosya olarak kaydetme (opsiyonel)
@@ -102,14 +144,19 @@ if __name__ == "__main__":
             # We save it in a simple format: "OPCODE,ARGUMENT"
             # If arg is None, we just write "OPCODE"
             if arg is not None:
-                f.write(f"{op},{arg}\n")
+                f.write(f"{op.name},{arg}\n")
             else:
-                f.write(f"{op}\n")
+                f.write(f"{op.name}\n")
     print(f"\n[INFO] Bytecode'{output_filename}' dosyasina kaydedildi.")
 
+    # Binary format, 'python main.py program.pbc' ile tekrar derlemeden calistirilabilir
+    binary_filename = "program.pbc"
+    bytecode_format.dump(binary_filename, bytecode, global_names, source=input_code, line_table=lines)
+    print(f"[INFO] Binary bytecode '{binary_filename}' dosyasina kaydedildi.")
+
     print("\n--- Virtual Machine Execution ---")
     vm = VirtualMachine()
-    vm.run(bytecode)
+    vm.run(bytecode, global_names, lines)
     print("==========================================")
 """ 
 print("--- Parsing Code ---")
@@ -0,0 +1,93 @@
+from enum import IntEnum
+
+# Bytecode opcode'lari
+# BytecodeGenerator ve VirtualMachine ayni degerleri kullanir. Kucuk tamsayi oldugu icin
+# VM'de dispatch tablosunda dogrudan indeks olarak kullanilabiliyor (string karsilastirmasi yok).
+class Opcode(IntEnum):
+    LOAD_CONST = 0
+    LOAD_FAST = 1
+    STORE_FAST = 2
+    LOAD_GLOBAL = 3
+    STORE_GLOBAL = 4
+
+    ADD = 5
+    SUB = 6
+    MUL = 7
+    DIV = 8
+    MOD = 9
+    COMPARE = 10   # arg: '==', '!=', '<', '>', '<=', '>=', '&&', '||'
+    NEGATE = 11
+    NOT = 12
+
+    JUMP_IF_FALSE = 13
+    JUMP_ABSOLUTE = 14
+
+    CALL = 15      # arg: arguman sayisi, fonksiyon nesnesi argumanlarin ustunde
+    RETURN = 16
+
+    PRINT = 17
+    HALT = 18
+
+    LOAD_FUNC = 19  # arg: Function (giris adresini peephole jump'lar gibi yeniden ayarlar)
+
+    # Peephole optimizer'in urettigi superinstruction'lar
+    INC_FAST = 20               # arg: (slot, delta) -> locals[slot] += delta
+    INC_GLOBAL = 21             # arg: (slot, delta) -> globals[slot] += delta
+    COMPARE_JUMP_IF_FALSE = 22  # arg: (operator, hedef)
+
+# Fonksiyon nesnesi, derleme zamaninda olusturulur ve LOAD_FUNC ile fonksiyonun slotuna yazilir
+#   entry: ilk instruction'in adresi, arity: parametre sayisi, n_locals: yerel slot sayisi (parametreler dahil)
+# CALL yeni frame'i n_locals boyutunda acar ve argumanlari ilk arity slota yazar, fonksiyonun basinda
+# frame acan veya parametreleri yerlestiren instruction yok.
+# (namedtuple yerine __slots__: CALL'da alan okumalari daha hizli)
+class Function:
+    __slots__ = ('name', 'entry', 'arity', 'n_locals')
+
+    def __init__(self, name, entry, arity, n_locals):
+        self.name = name
+        self.entry = entry
+        self.arity = arity
+        self.n_locals = n_locals
+
+    def with_entry(self, entry):
+        # Peephole instruction'lari sildiginde giris adresi degisen kopya
+        return Function(self.name, entry, self.arity, self.n_locals)
+
+    def key(self):
+        return (self.name, self.entry, self.arity, self.n_locals)
+
+    def __eq__(self, other):
+        return type(other) is Function and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"Function({self.name}, entry={self.entry}, arity={self.arity}, n_locals={self.n_locals})"
+
+# Register tabanli VM'in (register_vm.py) opcode'lari
+# Instruction'lar (opcode, operand...) tuple'lari, operand'lar register indeksleri (r), global slotlar (g),
+# adresler veya operator string'leridir. Sabitler de register'larda durur (register_generator.py).
+class RegOpcode(IntEnum):
+    MOVE = 0             # r_dst, r_src
+    LOAD_GLOBAL = 1      # r_dst, g         (fonksiyon icinden global okuma)
+    STORE_GLOBAL = 2     # g, r_src
+    LOAD_FUNC = 3        # r_dst, Function, register sablonu (sabitler yerinde, digerleri None)
+
+    ADD = 4              # r_dst, r_a, r_b
+    SUB = 5
+    MUL = 6
+    DIV = 7
+    MOD = 8
+    COMPARE = 9          # r_dst, operator, r_a, r_b
+    NEGATE = 10          # r_dst, r_a
+    NOT = 11             # r_dst, r_a
+
+    JUMP = 12                    # hedef
+    JUMP_IF_FALSE = 13           # r_kosul, hedef
+    COMPARE_JUMP_IF_FALSE = 14   # operator, r_a, r_b, hedef
+
+    CALL = 15            # r_dst, r_fonksiyon, (r_arg, ...)  yeni register dosyasi: argumanlar + sablon
+    RETURN = 16          # r_src
+    LOAD_CONSTANTS = 17  # ((g, sabit), ...)  program basinda global seviyedeki sabit register'lari
+    HALT = 18
@@ -1,6 +1,11 @@
+import importlib
+import os
+import sys
+
 import ply.yacc as yacc
 from ast_function import print_ast
 from lexer import tokens, lexer
+from fast_lexer import NUMBER_RE
 from ast_structure import (
     Program, Blok, DegiskenBildir, FonksiyonBildir, Atama,
     IfStatement, WhileStatement, ForStatement, ReturnStatement,
@@ -20,12 +25,55 @@ precedence = (
     ('right', 'UMINUS'), # Unary Eksi (-5)
 )
 
+# Kaynak Pozisyonlari
+#
+# Her kural sonucunun kaynak araligi (ilk sembolun baslangici, son sembolun bitisi) p.slice[0]'a
+# (lexpos, lineno, endlexpos) yazilir, sonuc bir AST node'u ise node'a da (start, lineno, end) set edilir.
+# PLY'in tracking=True modu her kural icin bunu yapar ama parse'i yavaslatir, burada sadece
+# pozisyonu kullanilan kurallarda yapiliyor.
+
+def token_end(token, lexer):
+    # Terminal token'in kaynaktaki bitis pozisyonu
+    token_type = token.type
+    if token_type == 'STRING':
+        return token.lexpos + len(token.value) + 2
+    if token_type == 'TAMSAYI' or token_type == 'ONDALIKLI':
+        # Deger sayiya cevrildigi icin uzunluk kaynaktan bulunur (akis modunda kaynak yoksa yaklasik)
+        data = getattr(lexer, 'lexdata', None)
+        if data:
+            m = NUMBER_RE.match(data, token.lexpos)
+            if m is not None:
+                return m.end()
+        return token.lexpos + len(str(token.value))
+    return token.lexpos + len(token.value)
+
+def set_span(p, node=None):
+    first = p.slice[1]
+    last = p.slice[-1]
+    result = p.slice[0]
+    result.lexpos = first.lexpos
+    result.lineno = first.lineno
+    if isinstance(last, yacc.YaccSymbol):
+        result.endlexpos = last.endlexpos
+    else:
+        result.endlexpos = token_end(last, p.lexer)
+    if node is not None:
+        node.start = result.lexpos
+        node.lineno = result.lineno
+        node.end = result.endlexpos
+    return node
+
 # Gramer Kurallari
 
 def p_program(p):
     '''program : statement_list
                | empty'''
     p[0] = Program(p[1])
+    if p[1]:
+        program = p[0]
+        program.start = p[1][0].start
+        program.lineno = p[1][0].lineno
+        program.end = p[1][-1].end
 
 def p_statement_list(p):
     '''statement_list : statement_list statement
@@ -55,6 +103,7 @@ def p_blok(p):
         p[0] = Blok(p[2])
     else:
         p[0] = Blok([])
+    set_span(p, p[0])
 
 
 # Farklı tipler
@@ -65,6 +114,7 @@ def p_tip(p):
            | TIP_VOID
            | TIP_STRING'''
     p[0] = p[1]  # 'int', 'float', 'bool', 'void', 'string' string degerleri
+    set_span(p)
 
 # Bildirmeler
 
@@ -78,11 +128,12 @@ def p_var_decl(p):
         p[0] = DegiskenBildir(isim=p[2], tip=p[1], deger=p[4])
     else:
         p[0] = DegiskenBildir(isim=p[2], tip=p[1], deger=None)
+    set_span(p, p[0])
 
 def p_func_decl(p):
     '''func_decl : tip TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok
                  | TIP_VOID TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok'''
-    p[0] = FonksiyonBildir(isim=p[2], return_type=p[1], parametreler=p[4], govde=p[6])
+    p[0] = set_span(p, FonksiyonBildir(isim=p[2], return_type=p[1], parametreler=p[4], govde=p[6]))
 
 def p_param_list(p):
     '''param_list : param_list VIRGUL param
@@ -108,10 +159,11 @@ def p_if_stmt(p):
         p[0] = IfStatement(condition=p[3], true_blok=p[5])
     else:
         p[0] = IfStatement(condition=p[3], true_blok=p[5], else_blok=p[7])
+    set_span(p, p[0])
 
 def p_while_stmt(p):
     '''while_stmt : WHILE SOL_PARANTEZ expression SAG_PARANTEZ blok'''
-    p[0] = WhileStatement(condition=p[3], govde=p[5])
+    p[0] = set_span(p, WhileStatement(condition=p[3], govde=p[5]))
 
 # for loop'ta hem for(let i = 0; ...) hem de for(i = 0) şeklinde yazabilmeyi eklemek için ayri kural ekledim
 def p_for_init(p):
@@ -123,11 +175,11 @@ def p_for_stmt(p):
     '''for_stmt : FOR SOL_PARANTEZ for_init expression NOKTALI_VIRGUL assignment SAG_PARANTEZ blok'''
     # Format: for (let i=0; i<10; i=i+1) { ... }
     # for_init'in sonunda NOKTALI_VIRGUL var o yuzden yazmamiza gerek yok
-    p[0] = ForStatement(init=p[3], condition=p[4], update=p[6], govde=p[8])
+    p[0] = set_span(p, ForStatement(init=p[3], condition=p[4], update=p[6], govde=p[8]))
 
 def p_return_stmt(p):
     '''return_stmt : RETURN expression NOKTALI_VIRGUL'''
-    p[0] = ReturnStatement(p[2])
+    p[0] = set_span(p, ReturnStatement(p[2]))
 
 # Assignment
 
@@ -137,7 +189,7 @@ def p_assignment_stmt(p):
 
 def p_assignment(p):
     '''assignment : TANIMLAYICI ATAMA expression'''
-    p[0] = Atama(isim=p[1], deger=p[3])
+    p[0] = set_span(p, Atama(isim=p[1], deger=p[3]))
 
 def p_expr_stmt(p):
     '''expr_stmt : expression NOKTALI_VIRGUL'''
@@ -159,21 +211,23 @@ def p_expression_binop(p):
                   | expression BUYUK_ESIT expression
                   | expression VE expression
                   | expression VEYA expression'''
-    p[0] = BinaryOp(sol=p[1], op=p[2], sag=p[3])
+    p[0] = set_span(p, BinaryOp(sol=p[1], op=p[2], sag=p[3]))
 
 # Negatif sayilar öncelikli oldugundan %prec ile precedence override diyoruz
 def p_expression_unary(p):
     '''expression : CIKAR expression %prec UMINUS
                   | DEGIL expression'''
-    p[0] = UnaryOp(op=p[1], expr=p[2])
+    p[0] = set_span(p, UnaryOp(op=p[1], expr=p[2]))
 
 def p_expression_group(p):
     '''expression : SOL_PARANTEZ expression SAG_PARANTEZ'''
+    # Node'un kendi araligi parantezleri icermez, ust kurallar icin aralik parantezlerle birlikte
     p[0] = p[2]
+    set_span(p)
 
 def p_expression_call(p):
     '''expression : TANIMLAYICI SOL_PARANTEZ arg_list SAG_PARANTEZ'''
-    p[0] = FonksiyonCall(isim=p[1], args=p[3])
+    p[0] = set_span(p, FonksiyonCall(isim=p[1], args=p[3]))
 
 def p_arg_list(p):
     '''arg_list : arg_list VIRGUL expression
@@ -208,11 +262,11 @@ def p_expression_literal(p):
         # Default'a integer diyoruz (TAMSAYI)
         val, type_ = p[1], 'int'
     
-    p[0] = Literal(deger=val, tip=type_)
+    p[0] = set_span(p, Literal(deger=val, tip=type_))
 
 def p_expression_id(p):
     '''expression : TANIMLAYICI'''
-    p[0] = Tanimlayici(isim=p[1])
+    p[0] = set_span(p, Tanimlayici(isim=p[1]))
 
 def p_empty(p):
     'empty :'
@@ -224,8 +278,61 @@ def p_error(p):
     else:
         raise Exception("Syntax hatasi, dosya sonu EOF")
 
-# Build parser
-parser = yacc.yacc()
+# Parse Tablolari
+#
+# LALR tablolari (parsetab.py) ve debug ciktisi (parser.out) import sirasinda uretilmez,
+# gramer degistiginde 'python parser.py --build-tables' ile bir kere uretilip repoda tutulur.
+# Import sirasinda tablolar sadece okunur (write_tables=False, debug=False), hicbir dosya yazilmaz.
+# Tablodaki gramer imzasi (_lr_signature) veya PLY tablo versiyonu uyusmuyorsa PLY'in yaptigi gibi
+# tablolar sessizce yeniden uretilmez, hata verilir.
+
+TABLE_MODULE = 'parsetab'
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def grammar_signature():
+    # PLY'in tablo dosyasina yazdigi imza: start, oncelikler, tokenlar ve kurallarin docstring'leri
+    pinfo = yacc.ParserReflect(globals())
+    pinfo.get_all()
+    if pinfo.error:
+        raise Exception("HATA: Gramer tanimi okunamadi.")
+    return pinfo.signature()
+
+def check_tables():
+    try:
+        tables = importlib.import_module(TABLE_MODULE)
+    except ImportError:
+        raise Exception(f"HATA: Parse tablolari ({TABLE_MODULE}.py) bulunamadi. "
+                        f"'python parser.py --build-tables' ile uretin.")
+
+    if tables._tabversion != yacc.__tabversion__:
+        raise Exception(f"HATA: Parse tablolari PLY tablo versiyonu {tables._tabversion} ile uretilmis, "
+                        f"kurulu PLY {yacc.__tabversion__} bekliyor. 'python parser.py --build-tables' ile yeniden uretin.")
+    if tables._lr_signature != grammar_signature():
+        raise Exception("HATA: Parse tablolari gramerle uyusmuyor (imza farkli). "
+                        "'python parser.py --build-tables' ile yeniden uretin.")
+
+def load_parser():
+    check_tables()
+    # Imza kontrol edildigi icin PLY'in kendi kontrolu atlanir (optimize=True)
+    return yacc.yacc(tabmodule=TABLE_MODULE, write_tables=False, debug=False, optimize=True)
+
+def build_tables():
+    # Tablolari gramerden uretip parsetab.py ve parser.out olarak yazar
+    # Eski tablo modulu okunmasin diye parsetab.py once silinir (import cache de temizlenir), ayni isimle yeniden uretilir
+    sys.modules.pop(TABLE_MODULE, None)
+    table_path = os.path.join(TABLE_DIR, TABLE_MODULE + ".py")
+    if os.path.exists(table_path):
+        os.remove(table_path)
+    importlib.invalidate_caches()
+    return yacc.yacc(tabmodule=TABLE_MODULE, outputdir=TABLE_DIR, write_tables=True, debug=True)
+
+# python parser.py --build-tables: tablolari yeniden uret ve cik
+if __name__ == "__main__" and "--build-tables" in sys.argv[1:]:
+    build_tables()
+    print(f"[INFO] Parse tablolari '{TABLE_MODULE}.py' ve 'parser.out' dosyalarina yazildi.")
+    sys.exit()
+
+parser = load_parser()
 
 # Test helper
 
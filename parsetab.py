@@ -27,69 +27,69 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_program','parser.py',26),
-  ('program -> empty','program',1,'p_program','parser.py',27),
-  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',31),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',32),
-  ('statement -> var_decl','statement',1,'p_statement','parser.py',39),
-  ('statement -> func_decl','statement',1,'p_statement','parser.py',40),
-  ('statement -> assignment_stmt','statement',1,'p_statement','parser.py',41),
-  ('statement -> if_stmt','statement',1,'p_statement','parser.py',42),
-  ('statement -> while_stmt','statement',1,'p_statement','parser.py',43),
-  ('statement -> for_stmt','statement',1,'p_statement','parser.py',44),
-  ('statement -> return_stmt','statement',1,'p_statement','parser.py',45),
-  ('statement -> expr_stmt','statement',1,'p_statement','parser.py',46),
-  ('statement -> blok','statement',1,'p_statement','parser.py',47),
-  ('blok -> SOL_SUSLU_PARANTEZ statement_list SAG_SUSLU_PARANTEZ','blok',3,'p_blok','parser.py',52),
-  ('blok -> SOL_SUSLU_PARANTEZ SAG_SUSLU_PARANTEZ','blok',2,'p_blok','parser.py',53),
-  ('tip -> TIP_INT','tip',1,'p_tip','parser.py',62),
-  ('tip -> TIP_FLOAT','tip',1,'p_tip','parser.py',63),
-  ('tip -> TIP_BOOL','tip',1,'p_tip','parser.py',64),
-  ('tip -> TIP_VOID','tip',1,'p_tip','parser.py',65),
-  ('tip -> TIP_STRING','tip',1,'p_tip','parser.py',66),
-  ('var_decl -> tip TANIMLAYICI ATAMA expression NOKTALI_VIRGUL','var_decl',5,'p_var_decl','parser.py',75),
-  ('var_decl -> tip TANIMLAYICI NOKTALI_VIRGUL','var_decl',3,'p_var_decl','parser.py',76),
-  ('func_decl -> tip TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok','func_decl',6,'p_func_decl','parser.py',83),
-  ('func_decl -> TIP_VOID TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok','func_decl',6,'p_func_decl','parser.py',84),
-  ('param_list -> param_list VIRGUL param','param_list',3,'p_param_list','parser.py',88),
-  ('param_list -> param','param_list',1,'p_param_list','parser.py',89),
-  ('param_list -> empty','param_list',1,'p_param_list','parser.py',90),
-  ('param -> tip TANIMLAYICI','param',2,'p_param','parser.py',99),
-  ('if_stmt -> IF SOL_PARANTEZ expression SAG_PARANTEZ blok','if_stmt',5,'p_if_stmt','parser.py',105),
-  ('if_stmt -> IF SOL_PARANTEZ expression SAG_PARANTEZ blok ELSE blok','if_stmt',7,'p_if_stmt','parser.py',106),
-  ('while_stmt -> WHILE SOL_PARANTEZ expression SAG_PARANTEZ blok','while_stmt',5,'p_while_stmt','parser.py',113),
-  ('for_init -> var_decl','for_init',1,'p_for_init','parser.py',118),
-  ('for_init -> assignment_stmt','for_init',1,'p_for_init','parser.py',119),
-  ('for_stmt -> FOR SOL_PARANTEZ for_init expression NOKTALI_VIRGUL assignment SAG_PARANTEZ blok','for_stmt',8,'p_for_stmt','parser.py',123),
-  ('return_stmt -> RETURN expression NOKTALI_VIRGUL','return_stmt',3,'p_return_stmt','parser.py',129),
-  ('assignment_stmt -> assignment NOKTALI_VIRGUL','assignment_stmt',2,'p_assignment_stmt','parser.py',135),
-  ('assignment -> TANIMLAYICI ATAMA expression','assignment',3,'p_assignment','parser.py',139),
-  ('expr_stmt -> expression NOKTALI_VIRGUL','expr_stmt',2,'p_expr_stmt','parser.py',143),
-  ('expression -> expression TOPLA expression','expression',3,'p_expression_binop','parser.py',149),
-  ('expression -> expression CIKAR expression','expression',3,'p_expression_binop','parser.py',150),
-  ('expression -> expression CARP expression','expression',3,'p_expression_binop','parser.py',151),
-  ('expression -> expression BOL expression','expression',3,'p_expression_binop','parser.py',152),
-  ('expression -> expression MODUL expression','expression',3,'p_expression_binop','parser.py',153),
-  ('expression -> expression ESIT expression','expression',3,'p_expression_binop','parser.py',154),
-  ('expression -> expression ESIT_DEGIL expression','expression',3,'p_expression_binop','parser.py',155),
-  ('expression -> expression KUCUK expression','expression',3,'p_expression_binop','parser.py',156),
-  ('expression -> expression BUYUK expression','expression',3,'p_expression_binop','parser.py',157),
-  ('expression -> expression KUCUK_ESIT expression','expression',3,'p_expression_binop','parser.py',158),
-  ('expression -> expression BUYUK_ESIT expression','expression',3,'p_expression_binop','parser.py',159),
-  ('expression -> expression VE expression','expression',3,'p_expression_binop','parser.py',160),
-  ('expression -> expression VEYA expression','expression',3,'p_expression_binop','parser.py',161),
-  ('expression -> CIKAR expression','expression',2,'p_expression_unary','parser.py',166),
-  ('expression -> DEGIL expression','expression',2,'p_expression_unary','parser.py',167),
-  ('expression -> SOL_PARANTEZ expression SAG_PARANTEZ','expression',3,'p_expression_group','parser.py',171),
-  ('expression -> TANIMLAYICI SOL_PARANTEZ arg_list SAG_PARANTEZ','expression',4,'p_expression_call','parser.py',175),
-  ('arg_list -> arg_list VIRGUL expression','arg_list',3,'p_arg_list','parser.py',179),
-  ('arg_list -> expression','arg_list',1,'p_arg_list','parser.py',180),
-  ('arg_list -> empty','arg_list',1,'p_arg_list','parser.py',181),
-  ('expression -> TAMSAYI','expression',1,'p_expression_literal','parser.py',190),
-  ('expression -> ONDALIKLI','expression',1,'p_expression_literal','parser.py',191),
-  ('expression -> DOGRU','expression',1,'p_expression_literal','parser.py',192),
-  ('expression -> YANLIS','expression',1,'p_expression_literal','parser.py',193),
-  ('expression -> STRING','expression',1,'p_expression_literal','parser.py',194),
-  ('expression -> TANIMLAYICI','expression',1,'p_expression_id','parser.py',204),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',208),
+  ('program -> statement_list','program',1,'p_program','parser.py',69),
+  ('program -> empty','program',1,'p_program','parser.py',70),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',79),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',80),
+  ('statement -> var_decl','statement',1,'p_statement','parser.py',87),
+  ('statement -> func_decl','statement',1,'p_statement','parser.py',88),
+  ('statement -> assignment_stmt','statement',1,'p_statement','parser.py',89),
+  ('statement -> if_stmt','statement',1,'p_statement','parser.py',90),
+  ('statement -> while_stmt','statement',1,'p_statement','parser.py',91),
+  ('statement -> for_stmt','statement',1,'p_statement','parser.py',92),
+  ('statement -> return_stmt','statement',1,'p_statement','parser.py',93),
+  ('statement -> expr_stmt','statement',1,'p_statement','parser.py',94),
+  ('statement -> blok','statement',1,'p_statement','parser.py',95),
+  ('blok -> SOL_SUSLU_PARANTEZ statement_list SAG_SUSLU_PARANTEZ','blok',3,'p_blok','parser.py',100),
+  ('blok -> SOL_SUSLU_PARANTEZ SAG_SUSLU_PARANTEZ','blok',2,'p_blok','parser.py',101),
+  ('tip -> TIP_INT','tip',1,'p_tip','parser.py',111),
+  ('tip -> TIP_FLOAT','tip',1,'p_tip','parser.py',112),
+  ('tip -> TIP_BOOL','tip',1,'p_tip','parser.py',113),
+  ('tip -> TIP_VOID','tip',1,'p_tip','parser.py',114),
+  ('tip -> TIP_STRING','tip',1,'p_tip','parser.py',115),
+  ('var_decl -> tip TANIMLAYICI ATAMA expression NOKTALI_VIRGUL','var_decl',5,'p_var_decl','parser.py',125),
+  ('var_decl -> tip TANIMLAYICI NOKTALI_VIRGUL','var_decl',3,'p_var_decl','parser.py',126),
+  ('func_decl -> tip TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok','func_decl',6,'p_func_decl','parser.py',134),
+  ('func_decl -> TIP_VOID TANIMLAYICI SOL_PARANTEZ param_list SAG_PARANTEZ blok','func_decl',6,'p_func_decl','parser.py',135),
+  ('param_list -> param_list VIRGUL param','param_list',3,'p_param_list','parser.py',139),
+  ('param_list -> param','param_list',1,'p_param_list','parser.py',140),
+  ('param_list -> empty','param_list',1,'p_param_list','parser.py',141),
+  ('param -> tip TANIMLAYICI','param',2,'p_param','parser.py',150),
+  ('if_stmt -> IF SOL_PARANTEZ expression SAG_PARANTEZ blok','if_stmt',5,'p_if_stmt','parser.py',156),
+  ('if_stmt -> IF SOL_PARANTEZ expression SAG_PARANTEZ blok ELSE blok','if_stmt',7,'p_if_stmt','parser.py',157),
+  ('while_stmt -> WHILE SOL_PARANTEZ expression SAG_PARANTEZ blok','while_stmt',5,'p_while_stmt','parser.py',165),
+  ('for_init -> var_decl','for_init',1,'p_for_init','parser.py',170),
+  ('for_init -> assignment_stmt','for_init',1,'p_for_init','parser.py',171),
+  ('for_stmt -> FOR SOL_PARANTEZ for_init expression NOKTALI_VIRGUL assignment SAG_PARANTEZ blok','for_stmt',8,'p_for_stmt','parser.py',175),
+  ('return_stmt -> RETURN expression NOKTALI_VIRGUL','return_stmt',3,'p_return_stmt','parser.py',181),
+  ('assignment_stmt -> assignment NOKTALI_VIRGUL','assignment_stmt',2,'p_assignment_stmt','parser.py',187),
+  ('assignment -> TANIMLAYICI ATAMA expression','assignment',3,'p_assignment','parser.py',191),
+  ('expr_stmt -> expression NOKTALI_VIRGUL','expr_stmt',2,'p_expr_stmt','parser.py',195),
+  ('expression -> expression TOPLA expression','expression',3,'p_expression_binop','parser.py',201),
+  ('expression -> expression CIKAR expression','expression',3,'p_expression_binop','parser.py',202),
+  ('expression -> expression CARP expression','expression',3,'p_expression_binop','parser.py',203),
+  ('expression -> expression BOL expression','expression',3,'p_expression_binop','parser.py',204),
+  ('expression -> expression MODUL expression','expression',3,'p_expression_binop','parser.py',205),
+  ('expression -> expression ESIT expression','expression',3,'p_expression_binop','parser.py',206),
+  ('expression -> expression ESIT_DEGIL expression','expression',3,'p_expression_binop','parser.py',207),
+  ('expression -> expression KUCUK expression','expression',3,'p_expression_binop','parser.py',208),
+  ('expression -> expression BUYUK expression','expression',3,'p_expression_binop','parser.py',209),
+  ('expression -> expression KUCUK_ESIT expression','expression',3,'p_expression_binop','parser.py',210),
+  ('expression -> expression BUYUK_ESIT expression','expression',3,'p_expression_binop','parser.py',211),
+  ('expression -> expression VE expression','expression',3,'p_expression_binop','parser.py',212),
+  ('expression -> expression VEYA expression','expression',3,'p_expression_binop','parser.py',213),
+  ('expression -> CIKAR expression','expression',2,'p_expression_unary','parser.py',218),
+  ('expression -> DEGIL expression','expression',2,'p_expression_unary','parser.py',219),
+  ('expression -> SOL_PARANTEZ expression SAG_PARANTEZ','expression',3,'p_expression_group','parser.py',223),
+  ('expression -> TANIMLAYICI SOL_PARANTEZ arg_list SAG_PARANTEZ','expression',4,'p_expression_call','parser.py',229),
+  ('arg_list -> arg_list VIRGUL expression','arg_list',3,'p_arg_list','parser.py',233),
+  ('arg_list -> expression','arg_list',1,'p_arg_list','parser.py',234),
+  ('arg_list -> empty','arg_list',1,'p_arg_list','parser.py',235),
+  ('expression -> TAMSAYI','expression',1,'p_expression_literal','parser.py',244),
+  ('expression -> ONDALIKLI','expression',1,'p_expression_literal','parser.py',245),
+  ('expression -> DOGRU','expression',1,'p_expression_literal','parser.py',246),
+  ('expression -> YANLIS','expression',1,'p_expression_literal','parser.py',247),
+  ('expression -> STRING','expression',1,'p_expression_literal','parser.py',248),
+  ('expression -> TANIMLAYICI','expression',1,'p_expression_id','parser.py',268),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',272),
 ]
@@ -0,0 +1,218 @@
+from bisect import bisect_left
+
+from opcodes import Opcode
+import line_table
+
+# Peephole Optimizer
+# BytecodeGenerator'in urettigi (opcode, arg) listesini VM'e verilmeden once yeniden yazar.
+#
+# Optimizasyon seviyeleri:
+#   0: Hicbir degisiklik yapilmaz
+#   1: Jump threading, ulasilamayan (dead) kodun silinmesi, bir sonraki instruction'a jump'larin silinmesi
+#   2: 1 + superinstruction'lar (INC_FAST/INC_GLOBAL, COMPARE_JUMP_IF_FALSE)
+#
+# Silinen veya birlestirilen instruction'lardan sonra tum jump hedefleri (ve LOAD_FUNC adresleri)
+# yeni indekslere gore tekrar ayarlanir. optimize_with_lines() satir tablosu kayitlarini da tasir.
+
+O0, O1, O2 = 0, 1, 2
+DEFAULT_LEVEL = O2
+
+# Arg'i bir kod adresi olan instruction'lar (LOAD_FUNC'ta fonksiyon nesnesinin giris adresi)
+JUMP_OPS = (Opcode.JUMP_IF_FALSE, Opcode.JUMP_ABSOLUTE)
+
+# Bu instruction'lardan sonra akis bir sonraki instruction'a gecmez
+TERMINATORS = (Opcode.JUMP_ABSOLUTE, Opcode.RETURN, Opcode.HALT)
+
+# LOAD x; LOAD_CONST c; ADD/SUB; STORE x -> INC x c
+INC_PATTERNS = {
+    (Opcode.LOAD_FAST, Opcode.STORE_FAST): Opcode.INC_FAST,
+    (Opcode.LOAD_GLOBAL, Opcode.STORE_GLOBAL): Opcode.INC_GLOBAL,
+}
+
+def get_target(op, arg):
+    # Instruction bir kod adresine isaret ediyorsa o adresi dondurur
+    if op in JUMP_OPS:
+        return arg
+    if op == Opcode.COMPARE_JUMP_IF_FALSE:
+        return arg[1]
+    if op == Opcode.LOAD_FUNC:
+        return arg.entry
+    return None
+
+def set_target(op, arg, target):
+    if op == Opcode.COMPARE_JUMP_IF_FALSE:
+        return (op, (arg[0], target))
+    if op == Opcode.LOAD_FUNC:
+        return (op, arg.with_entry(target))
+    return (op, target)
+
+def thread_jumps(instructions):
+    # Jump'in hedefi baska bir JUMP_ABSOLUTE ise dogrudan son hedefe atla
+    # Hedefi HALT/RETURN olan JUMP_ABSOLUTE, o instruction'in kendisiyle degistirilir
+    code = list(instructions)
+    for i, (op, arg) in enumerate(code):
+        if op not in JUMP_OPS:
+            continue
+
+        target = arg
+        seen = set()
+        while target < len(code) and code[target][0] == Opcode.JUMP_ABSOLUTE and target not in seen:
+            seen.add(target)
+            target = code[target][1]
+
+        if op == Opcode.JUMP_ABSOLUTE and target < len(code) and code[target][0] in (Opcode.HALT, Opcode.RETURN):
+            code[i] = code[target]
+        else:
+            code[i] = (op, target)
+    return code
+
+def find_reachable(code):
+    # Program basindan ve fonksiyon giris adreslerinden (LOAD_FUNC) ulasilabilen instruction'lar
+    roots = [0] + [arg.entry for op, arg in code if op == Opcode.LOAD_FUNC]
+    reachable = set()
+    worklist = [r for r in roots if r < len(code)]
+
+    while worklist:
+        i = worklist.pop()
+        if i in reachable or i >= len(code):
+            continue
+        reachable.add(i)
+        op, arg = code[i]
+
+        target = get_target(op, arg)
+        if target is not None and op != Opcode.LOAD_FUNC:
+            worklist.append(target)
+        if op not in TERMINATORS:
+            worklist.append(i + 1)
+
+    return reachable
+
+def remove_dead_code(code):
+    # Ulasilamayan instruction'lari ve hemen bir sonraki instruction'a giden JUMP_ABSOLUTE'lari sil
+    # Donus: [(old_index, (op, arg)), ...]
+    reachable = find_reachable(code)
+    kept = [i for i in range(len(code)) if i in reachable]
+
+    result = []
+    for pos, i in enumerate(kept):
+        op, arg = code[i]
+        if op == Opcode.JUMP_ABSOLUTE:
+            next_kept = kept[pos + 1] if pos + 1 < len(kept) else len(code)
+            if arg == next_kept:
+                continue
+        result.append((i, code[i]))
+    return result
+
+def is_numeric_const(op, arg):
+    # bool da int alt sinifi oldugu icin ayrica kontrol ediliyor
+    return op == Opcode.LOAD_CONST and type(arg) in (int, float)
+
+def fuse_superinstructions(entries):
+    # Sik gorulen instruction dizilerini tek instruction'a birlestir
+    # Ara instruction'lardan biri bir jump hedefiyse birlestirme yapilmaz
+    targets = set()
+    for _, (op, arg) in entries:
+        target = get_target(op, arg)
+        if target is not None:
+            targets.add(target)
+
+    def no_targets_inside(start, length):
+        return all(entries[start + k][0] not in targets for k in range(1, length))
+
+    result = []
+    i = 0
+    while i < len(entries):
+        old_index, (op, arg) = entries[i]
+        window = [instr for _, instr in entries[i:i + 4]]
+
+        # x = x + c / x = x - c
+        if len(window) == 4 and no_targets_inside(i, 4):
+            (load_op, slot), (const_op, const), (arith_op, _), (store_op, store_slot) = window
+            inc_op = INC_PATTERNS.get((load_op, store_op))
+            if (inc_op is not None and slot == store_slot and is_numeric_const(const_op, const)
+                    and arith_op in (Opcode.ADD, Opcode.SUB)):
+                delta = const if arith_op == Opcode.ADD else -const
+                result.append((old_index, (inc_op, (slot, delta))))
+                i += 4
+                continue
+
+        # COMPARE op; JUMP_IF_FALSE t
+        if len(window) >= 2 and no_targets_inside(i, 2):
+            (cmp_op, cmp_arg), (jump_op, jump_arg) = window[:2]
+            if cmp_op == Opcode.COMPARE and jump_op == Opcode.JUMP_IF_FALSE:
+                result.append((old_index, (Opcode.COMPARE_JUMP_IF_FALSE, (cmp_arg, jump_arg))))
+                i += 2
+                continue
+
+        result.append(entries[i])
+        i += 1
+    return result
+
+def relocate(entries):
+    # Eski indeksleri yeni indekslere esle, silinen bir indeks bir sonraki kalan instruction'a gider
+    old_indexes = [old for old, _ in entries]
+
+    code = []
+    for _, (op, arg) in entries:
+        target = get_target(op, arg)
+        if target is not None:
+            code.append(set_target(op, arg, bisect_left(old_indexes, target)))
+        else:
+            code.append((op, arg))
+    return code
+
+def optimize_entries(instructions, level):
+    # [(eski indeks, (op, arg))], jump hedefleri henuz eski indekslere gore
+    code = thread_jumps(instructions)
+    entries = remove_dead_code(code)
+    if level >= O2:
+        entries = fuse_superinstructions(entries)
+    return entries
+
+def optimize(instructions, level=DEFAULT_LEVEL):
+    if level <= O0:
+        return list(instructions)
+    return relocate(optimize_entries(instructions, level))
+
+def optimize_with_lines(instructions, lines, level=DEFAULT_LEVEL):
+    # lines: [(indeks, satir)] satir tablosu kayitlari (line_table.py)
+    # Donus: (optimize edilmis kod, yeni indekslere gore satir kayitlari)
+    if level <= O0:
+        return list(instructions), list(lines)
+    entries = optimize_entries(instructions, level)
+    return relocate(entries), line_table.relocate(lines, [old for old, _ in entries])
+
+if __name__ == "__main__":
+    from parser import parser
+    from bytecode_generator import BytecodeGenerator
+
+    code = """
+    int x = 10;
+    int num = 0;
+
+    int azalt(int n) {
+        if (n > 0) {
+            return n - 1;
+        } else {
+            return 0;
+        }
+    }
+
+    while (x > 0) {
+        x = x - 1;
+        num = num + 1;
+    }
+    """
+
+    ast = parser.parse(code)
+    generator = BytecodeGenerator()
+    generator.visit(ast)
+    bytecode = generator.get_bytecode()
+
+    for level in (O0, O1, O2):
+        optimized = optimize(bytecode, level)
+        print(f"--- Optimizasyon Seviyesi {level} ({len(optimized)} instruction) ---")
+        for i, (op, arg) in enumerate(optimized):
+            arg_str = str(arg) if arg is not None else ""
+            print(f"{i:<3}: {op.name:<22} {arg_str}")
+        print()
@@ -0,0 +1,384 @@
+from ast_structure import BinaryOp, FonksiyonCall, Tanimlayici, iter_child_nodes, walk
+from bytecode_generator import BytecodeGenerator
+from opcodes import RegOpcode, Function
+
+# Register Tabanli Kod Uretimi
+#
+# Ayni AST'den stack VM yerine register VM'i (register_vm.py) icin uc adresli kod uretir:
+#   x = a + b * 2   ->   MUL t0, b, k2 ; ADD x, a, t0
+# Stack kodundaki LOAD/STORE instruction'lari yok, operand'lar dogrudan register indeksleridir.
+#
+# Register dosyalari BytecodeGenerator'daki slot'larla ayni:
+#   - Fonksiyon icinde: cagrinin frame'i. Parametreler 0..n-1, sonra yerel degiskenler, gecici degerler
+#     ve sabitler. Fonksiyondaki global degiskenlere LOAD_GLOBAL/STORE_GLOBAL ile erisilir.
+#   - Global seviyede: global slot dizisinin kendisi. Gecici degerler ve sabitler isimsiz (None) global
+#     slotlardir, get_globals()'ta gorunmez.
+# Sabitler (Literal) register'lara bir kere yazilir: fonksiyonlarda LOAD_FUNC'un register sablonunda, global
+# seviyede programin basindaki LOAD_CONSTANTS ile. Boylece VM'deki her instruction sadece register okur.
+#
+# Gecici register'lar bir serbest listeden alinir ve degeri kullanildiginda geri verilir. Bir atamanin
+# degerini ureten son instruction'in hedefi dogrudan degiskenin register'ina cevrilir (MOVE gerekmez).
+# Global seviyede degiskenler register oldugu icin, bir operand olarak okunan degisken ile onu kullanan
+# instruction arasinda bir fonksiyon cagrisi calisiyorsa (x + f() gibi) degisken once gecici bir register'a
+# kopyalanir: cagrilan fonksiyon globali degistirse de stack VM'deki degerlendirme sirasi korunur.
+
+# Hedef register'i ilk operand olan instruction'lar (atama hedefi bunlarda degistirilebilir)
+WRITES_FIRST = frozenset((
+    RegOpcode.MOVE, RegOpcode.LOAD_GLOBAL, RegOpcode.LOAD_FUNC,
+    RegOpcode.ADD, RegOpcode.SUB, RegOpcode.MUL, RegOpcode.DIV, RegOpcode.MOD,
+    RegOpcode.COMPARE, RegOpcode.NEGATE, RegOpcode.NOT, RegOpcode.CALL,
+))
+
+BINARY_OPCODES = {
+    '+': RegOpcode.ADD,
+    '-': RegOpcode.SUB,
+    '*': RegOpcode.MUL,
+    '/': RegOpcode.DIV,
+    '%': RegOpcode.MOD,
+}
+
+# Kosul olarak kullanildiginda COMPARE_JUMP_IF_FALSE'a birlestirilen operatorler
+COMPARE_OPS = ('==', '!=', '<', '>', '<=', '>=')
+
+def protected_reads(node):
+    # Kendisinden sonraki bir operand'da fonksiyon cagrisi olan Tanimlayici node'larinin id'leri.
+    # walk ust node'u alt node'larindan once verir, ters sirada her node'un alt node'lari hazir olur.
+    has_call = set()
+    protected = set()
+    for child in reversed(list(walk(node))):
+        operands = list(iter_child_nodes(child))
+        later_call = False
+        for operand in reversed(operands):
+            if later_call and type(operand) is Tanimlayici:
+                protected.add(id(operand))
+            if id(operand) in has_call:
+                later_call = True
+        if later_call or type(child) is FonksiyonCall:
+            has_call.add(id(child))
+    return protected
+
+class RegisterGenerator(BytecodeGenerator):
+    def __init__(self):
+        super().__init__()
+        # Global seviyenin register bilgileri, fonksiyonlarinkiler self.functions'taki dict'lerde
+        self.top = self.new_context()
+        # Okunurken gecici register'a kopyalanacak Tanimlayici node'lari (protected_reads)
+        self.protected = set()
+
+    @staticmethod
+    def new_context():
+        # free: serbest gecici register'lar, temps: gecici register'lar, constants: (tip, deger) -> register
+        return {'free': [], 'temps': set(), 'constants': {}}
+
+    def context(self):
+        return self.functions[-1] if self.functions else self.top
+
+    def emit(self, *instruction):
+        self.instructions.append(instruction)
+
+    # Register ayirma
+
+    def new_register(self):
+        if self.functions:
+            func = self.functions[-1]
+            reg = func['n_locals']
+            func['n_locals'] += 1
+        else:
+            reg = len(self.global_names)
+            self.global_names.append(None)
+        return reg
+
+    def new_temp(self):
+        ctx = self.context()
+        if ctx['free']:
+            return ctx['free'].pop()
+        reg = self.new_register()
+        ctx['temps'].add(reg)
+        return reg
+
+    def free(self, reg):
+        # Sadece gecici register'lar geri verilir (degiskenler ve sabitler degil)
+        ctx = self.context()
+        if reg in ctx['temps']:
+            ctx['free'].append(reg)
+
+    def constant(self, value):
+        ctx = self.context()
+        key = (type(value), value)
+        reg = ctx['constants'].get(key)
+        if reg is None:
+            reg = self.new_register()
+            ctx['constants'][key] = reg
+        return reg
+
+    def variable(self, info):
+        # Degiskenin register'i, fonksiyon icindeki globaller icin None (LOAD_GLOBAL/STORE_GLOBAL gerekir)
+        if info['kind'] == 'local' or not self.functions:
+            return info['slot']
+        return None
+
+    def expression(self, node):
+        # Ifadenin kodunu uretir, degerinin bulundugu register'i dondurur
+        if not self.functions:
+            self.protected = protected_reads(node)
+        result = self.visit(node)
+        self.protected = set()
+        return result
+
+    def store(self, info, reg):
+        # reg'deki degeri degiskene yazar
+        target = self.variable(info)
+        if target is None:
+            self.emit(RegOpcode.STORE_GLOBAL, info['slot'], reg)
+            self.free(reg)
+            return
+        if target == reg:
+            return
+        last = self.instructions[-1] if self.instructions else None
+        if reg in self.context()['temps'] and last is not None and last[0] in WRITES_FIRST and last[1] == reg:
+            # Degeri ureten instruction dogrudan degiskene yazsin
+            self.instructions[-1] = (last[0], target) + last[2:]
+        else:
+            self.emit(RegOpcode.MOVE, target, reg)
+        self.free(reg)
+
+    def emit_condition_jump(self, node):
+        # Kosul yanlissa atlayan instruction'i uretir, hedefi sonra patch_jump ile yazilir
+        if type(node) is BinaryOp and node.op in COMPARE_OPS:
+            if not self.functions:
+                self.protected = protected_reads(node)
+            self.enter_line(node)
+            a = self.visit(node.sol)
+            b = self.visit(node.sag)
+            self.protected = set()
+            self.free(a)
+            self.free(b)
+            self.emit(RegOpcode.COMPARE_JUMP_IF_FALSE, node.op, a, b, None)
+            self.leave_line()
+        else:
+            reg = self.expression(node)
+            self.free(reg)
+            self.emit(RegOpcode.JUMP_IF_FALSE, reg, None)
+        return len(self.instructions) - 1
+
+    def patch_jump(self, idx, target=None):
+        # Instruction'in son operand'i (atlama hedefi)
+        if target is None:
+            target = len(self.instructions)
+        self.instructions[idx] = self.instructions[idx][:-1] + (target,)
+
+    # Visitor'lar
+
+    def visit_Program(self, node):
+        # Global seviyedeki sabitler, tum program uretildikten sonra belli oluyor
+        self.emit(RegOpcode.LOAD_CONSTANTS, None)
+        for stmt in node.statements:
+            self.visit(stmt)
+        self.emit(RegOpcode.HALT)
+        constants = tuple((reg, value) for (_, value), reg in self.top['constants'].items())
+        self.instructions[0] = (RegOpcode.LOAD_CONSTANTS, constants)
+
+    def visit_DegiskenBildir(self, node):
+        # Format: int x = 5;
+        reg = self.expression(node.deger) if node.deger else self.constant(0)
+        self.store(self.declare(node.isim), reg)
+
+    def visit_Atama(self, node):
+        # Format: x = 10;
+        reg = self.expression(node.deger)
+        self.store(self.resolve(node.isim), reg)
+
+    # Ifadeler stack kodundaki gibi ozyinelemesiz uretilir (NodeVisitor.evaluate), her node'un degeri
+    # sonucunun bulundugu register'dir
+
+    def visit_BinaryOp(self, node):
+        return self.evaluate(node)
+
+    def visit_UnaryOp(self, node):
+        return self.evaluate(node)
+
+    def visit_FonksiyonCall(self, node):
+        return self.evaluate(node)
+
+    def post_BinaryOp(self, node, values):
+        a, b = values
+        self.free(a)
+        self.free(b)
+        dst = self.new_temp()
+        opcode = BINARY_OPCODES.get(node.op)
+        if opcode is None:
+            self.emit(RegOpcode.COMPARE, dst, node.op, a, b)
+        else:
+            self.emit(opcode, dst, a, b)
+        self.leave_line()
+        return dst
+
+    def post_UnaryOp(self, node, values):
+        a, = values
+        self.free(a)
+        dst = self.new_temp()
+        self.emit(RegOpcode.NEGATE if node.op == '-' else RegOpcode.NOT, dst, a)
+        self.leave_line()
+        return dst
+
+    def post_FonksiyonCall(self, node, values):
+        # Fonksiyon register'i argumanlar serbest birakilmadan once ayrilir, CALL argumanlari okuyana kadar
+        # uzerlerine yazilmasin diye
+        info = self.resolve(node.isim)
+        func = self.variable(info)
+        if func is None:
+            func = self.new_temp()
+            self.emit(RegOpcode.LOAD_GLOBAL, func, info['slot'])
+        for reg in values:
+            self.free(reg)
+        self.free(func)
+        dst = self.new_temp()
+        self.emit(RegOpcode.CALL, dst, func, tuple(values))
+        self.leave_line()
+        return dst
+
+    def visit_Literal(self, node):
+        return self.constant(node.deger)
+
+    def visit_Tanimlayici(self, node):
+        info = self.resolve(node.isim)
+        reg = self.variable(info)
+        if reg is None:
+            reg = self.new_temp()
+            self.emit(RegOpcode.LOAD_GLOBAL, reg, info['slot'])
+        elif id(node) in self.protected:
+            copy = self.new_temp()
+            self.emit(RegOpcode.MOVE, copy, reg)
+            reg = copy
+        return reg
+
+    def visit_IfStatement(self, node):
+        jump_to_else_idx = self.emit_condition_jump(node.condition)
+        self.visit(node.true_blok)
+        if node.else_blok:
+            jump_over_else_idx = len(self.instructions)
+            self.emit(RegOpcode.JUMP, None)
+            self.patch_jump(jump_to_else_idx)
+            self.visit(node.else_blok)
+            self.patch_jump(jump_over_else_idx)
+        else:
+            self.patch_jump(jump_to_else_idx)
+
+    def visit_WhileStatement(self, node):
+        start_idx = len(self.instructions)
+        jump_out_idx = self.emit_condition_jump(node.condition)
+        self.visit(node.govde)
+        self.emit(RegOpcode.JUMP, start_idx)
+        self.patch_jump(jump_out_idx)
+
+    def visit_ForStatement(self, node):
+        self.visit(node.init)
+        start_idx = len(self.instructions)
+        jump_out_idx = self.emit_condition_jump(node.condition)
+        self.visit(node.govde)
+        self.visit(node.update)
+        self.emit(RegOpcode.JUMP, start_idx)
+        self.patch_jump(jump_out_idx)
+
+    def visit_FonksiyonBildir(self, node):
+        # Fonksiyon nesnesi (opcodes.Function) degiskenin register'ina yazilir, govde atlanir
+        # (fonksiyonlar global seviyede global, fonksiyon icinde yerel degisken oldugu icin hep register'da)
+        # Fonksiyon ve register sablonu govde derlendikten sonra LOAD_FUNC'a yaziliyor
+        load_func_idx = len(self.instructions)
+        dst = self.variable(self.declare(node.isim))
+        self.emit(RegOpcode.LOAD_FUNC, dst, None, None)
+        jump_over_idx = len(self.instructions)
+        self.emit(RegOpcode.JUMP, None)
+        entry = len(self.instructions)
+
+        func = {'isim': node.isim, 'n_locals': 0}
+        func.update(self.new_context())
+        self.functions.append(func)
+        self.symtab.enter_scope()
+
+        # Parametreler ilk register'lar, CALL argumanlari bunlara kopyalar
+        for _, param_name in node.parametreler:
+            self.declare(param_name)
+
+        if node.govde:
+            self.visit(node.govde)
+
+        # Safety Return
+        self.emit(RegOpcode.RETURN, self.constant(None))
+
+        self.symtab.exit_scope()
+        self.functions.pop()
+        # Register sablonu: sabitler yerinde, parametreler ve digerleri None
+        template = [None] * func['n_locals']
+        for (_, value), reg in func['constants'].items():
+            template[reg] = value
+        function = Function(node.isim, entry, len(node.parametreler), func['n_locals'])
+        self.instructions[load_func_idx] = (RegOpcode.LOAD_FUNC, dst, function, tuple(template))
+        self.patch_jump(jump_over_idx)
+
+    def visit_ReturnStatement(self, node):
+        reg = self.expression(node.deger)
+        self.free(reg)
+        self.emit(RegOpcode.RETURN, reg)
+
+# Instruction'larin operand turleri (format_instruction icin):
+# r: register, g: global slot, R: register tuple'i, diger: oldugu gibi (adres, operator, sabitler)
+OPERAND_KINDS = {
+    RegOpcode.MOVE: 'rr',
+    RegOpcode.LOAD_GLOBAL: 'rg',
+    RegOpcode.STORE_GLOBAL: 'gr',
+    RegOpcode.LOAD_FUNC: 'r--',
+    RegOpcode.ADD: 'rrr',
+    RegOpcode.SUB: 'rrr',
+    RegOpcode.MUL: 'rrr',
+    RegOpcode.DIV: 'rrr',
+    RegOpcode.MOD: 'rrr',
+    RegOpcode.COMPARE: 'r-rr',
+    RegOpcode.NEGATE: 'rr',
+    RegOpcode.NOT: 'rr',
+    RegOpcode.JUMP: '-',
+    RegOpcode.JUMP_IF_FALSE: 'r-',
+    RegOpcode.COMPARE_JUMP_IF_FALSE: '-rr-',
+    RegOpcode.CALL: 'rrR',
+    RegOpcode.RETURN: 'r',
+    RegOpcode.LOAD_CONSTANTS: '-',
+    RegOpcode.HALT: '',
+}
+
+def format_operand(kind, value):
+    if kind == 'r':
+        return f"r{value}"
+    if kind == 'g':
+        return f"g{value}"
+    if kind == 'R':
+        return "(" + ", ".join(f"r{reg}" for reg in value) + ")"
+    return str(value)
+
+def format_instruction(instruction):
+    # "ADD r3, r1, r2" gibi okunabilir hali
+    opcode, *args = instruction
+    operands = ", ".join(format_operand(kind, arg) for kind, arg in zip(OPERAND_KINDS[opcode], args))
+    return f"{opcode.name:<24} {operands}"
+
+if __name__ == "__main__":
+    from compiler import Compiler
+
+    code = """
+    int topla(int a, int b) {
+        return a + b * 2;
+    }
+    int i = 0;
+    int t = 0;
+    while (i < 3) {
+        t = topla(t, i);
+        i = i + 1;
+    }
+    """
+
+    print("REGISTER KOD URETIMI\n")
+    print(f"Verilen Kod:\n{code.strip()}\n")
+    generator = RegisterGenerator()
+    generator.visit(Compiler().parse(code))
+    for i, instruction in enumerate(generator.get_bytecode()):
+        print(f"{i:<6} {format_instruction(instruction)}")
+    print("Global slotlar:", generator.get_global_names())
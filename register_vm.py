@@ -0,0 +1,275 @@
+import operator
+
+from opcodes import RegOpcode, Function
+from line_table import line_for
+from execution import ExecutionResult, default_output
+from virtual_machine import COMPARE_OPS
+
+# Register Tabanli VM
+#
+# register_generator.RegisterGenerator'in urettigi uc adresli kodu calistirir. VirtualMachine ile ayni
+# arayuz: run(instructions, global_names, line_table), get_globals(), instruction_count.
+# Operand stack'i yok, her instruction degerlerini register'lardan okur ve sonucu bir register'a yazar:
+# stack kodunda LOAD, LOAD, ADD, STORE olan atama tek bir ADD instruction'idir.
+#
+# Register dosyasi (regs) global seviyede global slot dizisi, fonksiyon icinde cagrinin frame'idir.
+# CALL yeni register dosyasini argumanlar ve fonksiyonun sablonundan (sabitler yerinde) olusturur,
+# CALL ve RETURN closure'larin paylastigi regs degiskenini degistirir. Instruction'lar VirtualMachine
+# gibi bir kere closure'lara cevrilir (predecode), run() dongusu sadece pc = code[pc]() yapar.
+
+class RegisterVM:
+    def __init__(self, quiet=False, output=None):
+        # quiet: konsola hicbir sey yazilmaz (baslik, son global hafiza), run() sonucu ExecutionResult ile alinir
+        # output: PRINT ciktisinin hedefi, register kodunda PRINT yok, VirtualMachine ile ayni arayuz icin tutulur
+        self.quiet = quiet
+        self.output = output if output is not None else default_output(quiet)
+        # Ana programin RETURN ile dondurdugu deger
+        self.return_value = None
+        self.globals = []
+        self.global_names = []
+        # Her cagri icin (donus adresi, sonucun yazilacagi register, cagiranin register dosyasi)
+        self.return_stack = []
+        self.instruction_count = 0
+
+    def get_globals(self):
+        # Global slotlari isimleriyle dondurur (gecici register'lar, sabitler ve blok icindeki slotlar haric)
+        return {name: val for name, val in zip(self.global_names, self.globals) if name is not None}
+
+    def predecode(self, instructions):
+        globals_ = self.globals
+        return_stack = self.return_stack
+        end_pc = len(instructions)
+        # Calisan fonksiyonun register dosyasi, global seviyede global slot dizisi
+        regs = globals_
+        # Fonksiyonlarin giris adresinden parametre disi register'larinin baslangic degerleri
+        templates = {instruction[2].entry: list(instruction[3][instruction[2].arity:])
+                     for instruction in instructions if instruction[0] == RegOpcode.LOAD_FUNC}
+
+        # Calisan instruction sayisi VirtualMachine'deki gibi bloklarin uzunluklari eklenerek hesaplanir
+        count = 0
+        block_start = 0
+
+        def move(args, idx):
+            nxt = idx + 1
+            dst, src = args
+            def handler():
+                r = regs
+                r[dst] = r[src]
+                return nxt
+            return handler
+
+        def load_global(args, idx):
+            nxt = idx + 1
+            dst, slot = args
+            def handler():
+                regs[dst] = globals_[slot]
+                return nxt
+            return handler
+
+        def store_global(args, idx):
+            nxt = idx + 1
+            slot, src = args
+            def handler():
+                globals_[slot] = regs[src]
+                return nxt
+            return handler
+
+        def load_func(args, idx):
+            nxt = idx + 1
+            dst, func, _ = args
+            def handler():
+                regs[dst] = func
+                return nxt
+            return handler
+
+        def binary(func):
+            def factory(args, idx):
+                nxt = idx + 1
+                dst, a, b = args
+                def handler():
+                    r = regs
+                    r[dst] = func(r[a], r[b])
+                    return nxt
+                return handler
+            return factory
+
+        def compare(args, idx):
+            # Karsilastirma operatoru decode sirasinda cozuluyor
+            dst, cmp_op, a, b = args
+            return binary(COMPARE_OPS[cmp_op])((dst, a, b), idx)
+
+        def unary(func):
+            def factory(args, idx):
+                nxt = idx + 1
+                dst, a = args
+                def handler():
+                    r = regs
+                    r[dst] = func(r[a])
+                    return nxt
+                return handler
+            return factory
+
+        def jump(args, idx):
+            nxt = idx + 1
+            target, = args
+            def handler():
+                nonlocal count, block_start
+                count += nxt - block_start
+                block_start = target
+                return target
+            return handler
+
+        def jump_if_false(args, idx):
+            nxt = idx + 1
+            cond, target = args
+            def handler():
+                nonlocal count, block_start
+                if regs[cond]:
+                    return nxt
+                count += nxt - block_start
+                block_start = target
+                return target
+            return handler
+
+        def compare_jump_if_false(args, idx):
+            nxt = idx + 1
+            cmp_op, a, b, target = args
+            func = COMPARE_OPS[cmp_op]
+            def handler():
+                nonlocal count, block_start
+                r = regs
+                if func(r[a], r[b]):
+                    return nxt
+                count += nxt - block_start
+                block_start = target
+                return target
+            return handler
+
+        def call(args, idx):
+            nxt = idx + 1
+            dst, func, arg_regs = args
+            def handler():
+                nonlocal count, block_start, regs
+                r = regs
+                callee = r[func]
+                if type(callee) is not Function:
+                    raise Exception("HATA: Cagrilan deger bir fonksiyon degil.")
+                target_addr = callee.entry
+                return_stack.append((nxt, dst, r))
+                regs = [r[reg] for reg in arg_regs] + templates[target_addr]
+                count += nxt - block_start
+                block_start = target_addr
+                return target_addr
+            return handler
+
+        def return_(args, idx):
+            nxt = idx + 1
+            src, = args
+            def handler():
+                nonlocal count, block_start, regs
+                count += nxt - block_start
+                value = regs[src]
+                if not return_stack:
+                    block_start = end_pc
+                    self.return_value = value
+                    return end_pc # Ana program bitti
+                block_start, dst, regs = return_stack.pop()
+                regs[dst] = value
+                return block_start
+            return handler
+
+        def load_constants(args, idx):
+            nxt = idx + 1
+            constants, = args
+            def handler():
+                for slot, value in constants:
+                    globals_[slot] = value
+                return nxt
+            return handler
+
+        def halt(args, idx):
+            nxt = idx + 1
+            def handler():
+                nonlocal count, block_start
+                count += nxt - block_start
+                block_start = end_pc
+                return end_pc
+            return handler
+
+        dispatch = {
+            RegOpcode.MOVE: move,
+            RegOpcode.LOAD_GLOBAL: load_global,
+            RegOpcode.STORE_GLOBAL: store_global,
+            RegOpcode.LOAD_FUNC: load_func,
+            RegOpcode.ADD: binary(operator.add),
+            RegOpcode.SUB: binary(operator.sub),
+            RegOpcode.MUL: binary(operator.mul),
+            RegOpcode.DIV: binary(operator.truediv),
+            RegOpcode.MOD: binary(operator.mod),
+            RegOpcode.COMPARE: compare,
+            RegOpcode.NEGATE: unary(operator.neg),
+            RegOpcode.NOT: unary(operator.not_),
+            RegOpcode.JUMP: jump,
+            RegOpcode.JUMP_IF_FALSE: jump_if_false,
+            RegOpcode.COMPARE_JUMP_IF_FALSE: compare_jump_if_false,
+            RegOpcode.CALL: call,
+            RegOpcode.RETURN: return_,
+            RegOpcode.LOAD_CONSTANTS: load_constants,
+            RegOpcode.HALT: halt,
+        }
+        table = [dispatch[op] for op in RegOpcode]
+        code = [table[instruction[0]](instruction[1:], idx) for idx, instruction in enumerate(instructions)]
+
+        def executed_count():
+            return count + max(end_pc - block_start, 0)
+
+        return code, executed_count
+
+    def run(self, instructions, global_names=(), line_table=None):
+        # line_table: verilirse calisma zamani hatalari kaynak satiriyla bildirilir (line_table.py)
+        if not self.quiet:
+            print("--- Register VM Calisiyor ---")
+        self.global_names = list(global_names)
+        self.globals[:] = [None] * len(self.global_names)
+        self.return_stack.clear()
+        self.return_value = None
+        code, executed_count = self.predecode(instructions)
+        end_pc = len(code)
+        pc = 0
+
+        try:
+            while pc < end_pc:
+                pc = code[pc]()
+        except Exception as e:
+            line = line_for(line_table, pc) if line_table else None
+            if line is None:
+                raise
+            raise Exception(f"Calisma zamani hatasi (satir {line}): {e}") from e
+
+        self.instruction_count = executed_count()
+        result = ExecutionResult(self.get_globals(), self.return_value, self.instruction_count, self.output)
+        if not self.quiet:
+            print("--- Register VM Bitti ---")
+            print("Final Global Memory:", result.globals)
+        return result
+
+if __name__ == "__main__":
+    from compiler import Compiler
+    from virtual_machine import VirtualMachine
+
+    code = """
+    int fib(int n) {
+        if (n < 2) { return n; }
+        return fib(n - 1) + fib(n - 2);
+    }
+    int toplam = 0;
+    for (int i = 0; i < 1000; i = i + 1) {
+        toplam = toplam + i * 2;
+    }
+    int f = fib(15);
+    """
+
+    for backend, vm in (("stack", VirtualMachine()), ("register", RegisterVM())):
+        program = Compiler(backend=backend).compile(code)
+        vm.run(program.instructions, program.global_names, program.line_table)
+        print(f"{backend}: {len(program.instructions)} instruction, {vm.instruction_count} calisan instruction\n")
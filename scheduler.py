@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections import deque
+
+from virtual_machine import VirtualMachine
+
+# Asyncio VM Zamanlayicisi
+#
+# Bircok programi ayni event loop'ta es zamanli calistirir. Her program kendi VirtualMachine'inde start()
+# ile yuklenir, worker hazir programlari sirayla (round-robin) resume(slice_steps) ile birer zaman dilimi
+# calistirir ve her dilimden sonra event loop'a doner. Uzun bir program digerlerini bekletmez.
+#
+# Async host fonksiyonu (execution.HostFunction) cagiran program beklemeye alinir: awaitable ayri bir task'ta
+# beklenir, sonucu VM'e verilince (complete_call) program tekrar hazir kuyruguna girer. Bu sirada diger
+# programlar calismaya devam eder.
+#
+#   async with VMScheduler(slice_steps=1000, host_functions=hosts) as scheduler:
+#       result = await scheduler.run(code)      # ExecutionResult
+#
+# metrics(): biten program sayisi, saniyede program ve instruction, gecikme (gonderimden bitise) dagilimi.
+
+# Gecikme istatistikleri icin tutulan son olcum sayisi
+LATENCY_WINDOW = 10_000
+
+class Job:
+    __slots__ = ('vm', 'future', 'submitted')
+
+    def __init__(self, vm, future, submitted):
+        self.vm = vm
+        self.future = future
+        self.submitted = submitted
+
+class VMScheduler:
+    def __init__(self, slice_steps=1000, limits=None, host_functions=()):
+        # slice_steps: bir programin sirasini birakmadan once calistirdigi en az instruction sayisi
+        # limits: her programin VM'ine verilen execution.ResourceLimits
+        self.slice_steps = slice_steps
+        self.limits = limits
+        self.host_functions = tuple(host_functions)
+        # Calismaya hazir programlar ve bos kalan worker'i uyandiran event
+        self.ready = deque()
+        self.wakeup = None
+        self.worker = None
+        # Host cagrisini bekleyen task'lar ve programlari (iptal icin)
+        self.waiting = {}
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.instructions = 0
+        self.slices = 0
+        self.host_calls = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.perf_counter()
+
+    # Yasam dongusu
+
+    def start(self):
+        if self.worker is None:
+            self.wakeup = asyncio.Event()
+            self.worker = asyncio.get_running_loop().create_task(self.work())
+
+    async def close(self):
+        # Worker'i ve bekleyen host cagrilarini durdurur, bitmemis programlarin future'lari iptal edilir
+        waiting = list(self.waiting.items())
+        tasks = [task for task, _ in waiting]
+        if self.worker is not None:
+            tasks.append(self.worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.worker = None
+        self.waiting.clear()
+        # Host cagrisi yarida kalan programlar da bitmedi, task baslamadan iptal edildiyse bile
+        for _, job in waiting:
+            job.future.cancel()
+        while self.ready:
+            self.ready.popleft().future.cancel()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # Program gonderme
+
+    def submit(self, code, output=None):
+        # Programi kuyruga ekler, sonucu (ExecutionResult) veren bir future dondurur
+        self.start()
+        vm = VirtualMachine(quiet=True, output=output, limits=self.limits, host_functions=self.host_functions)
+        vm.start(code.instructions, code.global_names, code.line_table)
+        future = asyncio.get_running_loop().create_future()
+        self.submitted += 1
+        self.ready.append(Job(vm, future, time.perf_counter()))
+        self.wakeup.set()
+        return future
+
+    async def run(self, code, output=None):
+        return await self.submit(code, output)
+
+    # Worker
+
+    async def work(self):
+        ready = self.ready
+        wakeup = self.wakeup
+        slice_steps = self.slice_steps
+        while True:
+            if not ready:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            job = ready.popleft()
+            if job.future.cancelled():
+                continue
+            vm = job.vm
+            before = vm.instruction_count
+            try:
+                result = vm.resume(slice_steps)
+            except Exception as e:
+                self.instructions += vm.instruction_count - before
+                self.finish(job, error=e)
+            else:
+                self.slices += 1
+                self.instructions += vm.instruction_count - before
+                if result is not None:
+                    self.finish(job, result)
+                elif vm.pending_call is not None:
+                    self.host_calls += 1
+                    task = asyncio.ensure_future(self.wait_host_call(job))
+                    self.waiting[task] = job
+                    task.add_done_callback(self.host_call_done)
+                else:
+                    ready.append(job)
+            # Diger task'lar (host cagrilari, yeni gonderimler) bu noktada calisir
+            await asyncio.sleep(0)
+
+    async def wait_host_call(self, job):
+        try:
+            value = await job.vm.pending_call
+        except Exception as e:
+            self.finish(job, error=e)
+            return
+        job.vm.complete_call(value)
+        self.ready.append(job)
+        self.wakeup.set()
+
+    def host_call_done(self, task):
+        self.waiting.pop(task, None)
+
+    def finish(self, job, result=None, error=None):
+        self.latencies.append(time.perf_counter() - job.submitted)
+        if job.future.cancelled():
+            return
+        if error is not None:
+            self.failed += 1
+            job.future.set_exception(error)
+        else:
+            self.completed += 1
+            job.future.set_result(result)
+
+    # Metrikler
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'running': self.submitted - self.completed - self.failed,
+            'slices': self.slices,
+            'host_calls': self.host_calls,
+            'instructions': self.instructions,
+            'elapsed': elapsed,
+            'programs_per_second': self.completed / elapsed if elapsed else 0.0,
+            'instructions_per_second': self.instructions / elapsed if elapsed else 0.0,
+            'latency_p50': percentile(0.50),
+            'latency_p95': percentile(0.95),
+            'latency_max': latencies[-1] if latencies else 0.0,
+        }
+
+if __name__ == "__main__":
+    from compiler import Compiler
+    from execution import HostFunction
+
+    async def sorgula(n):
+        # Ornek I/O: bir servisten cevap bekleniyormus gibi
+        await asyncio.sleep(0.01)
+        return n * 10
+
+    hosts = [HostFunction('sorgula', sorgula, ['int'])]
+    compiler = Compiler(host_functions=hosts)
+    hesap = compiler.compile("""
+    int fib(int n) {
+        if (n < 2) { return n; }
+        return fib(n - 1) + fib(n - 2);
+    }
+    int f = fib(18);
+    """)
+    istek = compiler.compile("""
+    int toplam = 0;
+    for (int i = 0; i < 5; i = i + 1) {
+        toplam = toplam + sorgula(i);
+    }
+    """)
+
+    async def main():
+        async with VMScheduler(slice_steps=1000, host_functions=hosts) as scheduler:
+            jobs = [scheduler.submit(hesap) for _ in range(4)] + [scheduler.submit(istek) for _ in range(20)]
+            results = await asyncio.gather(*jobs)
+            print("fib(18):", results[0].globals['f'], "| toplam:", results[-1].globals['toplam'])
+            for key, value in scheduler.metrics().items():
+                print(f"  {key}: {value:.4f}" if isinstance(value, float) else f"  {key}: {value}")
+
+    asyncio.run(main())
@@ -1,8 +1,73 @@
 from symbol_table import SymbolTable
+from visitor import NodeVisitor
+from diagnostics import (DiagnosticSink, REDECLARED_VARIABLE, REDECLARED_FUNCTION, UNDEFINED_NAME,
+                         UNDEFINED_FUNCTION, NOT_A_FUNCTION, ARGUMENT_COUNT, ARGUMENT_TYPE, CONDITION_TYPE,
+                         DECLARATION_TYPE, ASSIGNMENT_TYPE, ARITHMETIC_TYPE, COMPARISON_TYPE, LOGIC_TYPE,
+                         UNARY_TYPE)
 
-class SemanticAnalyzer:
-    def __init__(self):
-        self.symtab = SymbolTable()
+ARITHMETIC_OPS = ['+', '-', '*', '/', '%']
+COMPARISON_OPS = ['<', '>', '<=', '>=', '==', '!=']
+LOGIC_OPS = ['&&', '||']
+NUMERIC_TYPES = ['int', 'float']
+
+# Tip kurallari, SemanticAnalyzer ve AST optimizasyonu (ast_optimizer.py) ortak kullanir
+# Operasyon bu tiplerle gecersizse None dondurur
+
+def binary_op_type(op, left_type, right_type):
+    if op in ARITHMETIC_OPS:
+        if left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES:
+            if left_type == 'float' or right_type == 'float':
+                return 'float'
+            return 'int'
+        return None
+
+    if op in COMPARISON_OPS:
+        if left_type == right_type or (left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES):
+            return 'bool'
+        return None
+
+    if op in LOGIC_OPS:
+        if left_type == 'bool' and right_type == 'bool':
+            return 'bool'
+        return None
+
+    return 'unknown'
+
+def unary_op_type(op, expr_type):
+    if op == '!':
+        return 'bool' if expr_type == 'bool' else None
+    if op == '-':
+        return expr_type if expr_type in NUMERIC_TYPES else None
+    return expr_type
+
+class SemanticAnalyzer(NodeVisitor):
+    def __init__(self, log=print, symtab=None, diagnostics=None, quiet=False, host_functions=(), inputs=None):
+        # symtab: hazir bir sembol tablosu verilebilir (ornek: incremental_analyzer.TrackingSymbolTable)
+        self.symtab = symtab if symtab is not None else SymbolTable()
+        # Scope tablolari ve hata mesajlari bu fonksiyonla yazdirilir (varsayilan: print)
+        # Birden fazla thread ayni anda analiz yaparken her biri kendi log fonksiyonunu verebilir
+        self.log = log
+        # Bulunan hatalar diagnostics'e (DiagnosticSink) bildirilir, analiz ilk hatada durmaz
+        self.diagnostics = diagnostics if diagnostics is not None else DiagnosticSink()
+        # quiet=True: scope tablolari ve hatalar yazdirilmaz, sadece diagnostics'e eklenir
+        self.quiet = quiet
+        # Programin cagirabildigi Python fonksiyonlari (execution.HostFunction), global fonksiyon gibi tanimli
+        self.host_functions = host_functions
+        # Programa calistirilirken verilen global degiskenler {isim: tip}, bildirilmeden kullanilir
+        self.inputs = inputs or {}
+
+    def analyze(self, node):
+        # Butun programi analiz eder, hata varsa hepsini iceren bir Exception firlatir
+        self.visit(node)
+        if self.diagnostics.has_errors():
+            raise Exception("\n".join(d.format() for d in self.diagnostics.errors()))
+        return self.diagnostics
+
+    def error(self, code, node, message):
+        diagnostic = self.diagnostics.report(code, message, node)
+        if not self.quiet:
+            self.log(diagnostic.format())
+        return 'error'
 
     def visit(self, node):
         if isinstance(node, list):
@@ -10,31 +75,31 @@ class SemanticAnalyzer:
                 self.visit(item)
             return
         
-        # Dinamik method cagirma, isme gore ziyaret eder
-        method_name = f'visit_{node.__class__.__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
-    # Genel ziyaret metodu, visit methodu bulunamazsa alt dugumleri ziyaret eder
-    def generic_visit(self, node):
-        for key, value in vars(node).items():
-            if hasattr(value, '__dict__') or isinstance(value, list):
-                self.visit(value)
+        # Sinif basina cache'lenmis dispatch tablosu (visitor.NodeVisitor), visit_ metodu yoksa
+        # generic_visit alt dugumleri ziyaret eder
+        return self.visit_table[type(node)](self, node)
 
     # Visit methodlari
 
     def visit_Program(self, node):
-        print("Analiz Basliyor...")
+        if not self.quiet:
+            self.log("Analiz Basliyor...")
+        for host in self.host_functions:
+            self.symtab.add_symbol(host.name, host.symbol())
+        for name, tip in self.inputs.items():
+            self.symtab.add_symbol(name, {'type': tip, 'category': 'var'})
         self.visit(node.statements)
-        # Global scope'u yazdir
-        self.symtab.print_current_scope("Global Scope") 
-        print("Analiz Bitti.")
+        if not self.quiet:
+            # Global scope'u yazdir
+            self.symtab.print_current_scope("Global Scope", log=self.log) 
+            self.log("Analiz Bitti.")
 
     def visit_Blok(self, node):
         self.symtab.enter_scope()
         self.visit(node.statements)
-        # Blok scope'u yazdir
-        self.symtab.print_current_scope("Blok Scope") 
+        if not self.quiet:
+            # Blok scope'u yazdir
+            self.symtab.print_current_scope("Blok Scope", log=self.log) 
         self.symtab.exit_scope()
 
     def visit_DegiskenBildir(self, node):
@@ -46,7 +111,7 @@ class SemanticAnalyzer:
             val_type = self.visit(node.deger)
         
         if self.symtab.check_current_scope(node.isim):
-            print(f"HATA: '{node.isim}' zaten tanimli!")
+            self.log(f"HATA: '{node.isim}' zaten tanimli!")
         else:
             # Scope'ta yoksa ekle
             self.symtab.add_symbol(node.isim, {'type': val_type, 'category': 'var'})        
@@ -56,11 +121,12 @@ class SemanticAnalyzer:
         if node.deger:
             expr_type = self.visit(node.deger)
             if expr_type != node.tip and expr_type != 'error':
-                raise Exception(f"HATA: {node.isim} degiskeni '{node.tip}' turunde ama '{expr_type}' atandi.")
+                self.error(DECLARATION_TYPE, node, f"{node.isim} degiskeni '{node.tip}' turunde ama '{expr_type}' atandi.")
         
         # Sembol tablosuna bildirilen degiskeni ekle (artik unknown degil, belirli tipte)
+        # Tip hatasi olsa da bildirilen tiple eklenir, sonraki kullanimlarda ayni hata tekrar bildirilmez
         if self.symtab.check_current_scope(node.isim):
-            raise Exception(f"HATA: '{node.isim}' zaten tanimli!")
+            self.error(REDECLARED_VARIABLE, node, f"'{node.isim}' zaten tanimli!")
         else:
             self.symtab.add_symbol(node.isim, {'type': node.tip, 'category': 'var'})
         
@@ -71,7 +137,7 @@ class SemanticAnalyzer:
         
         # Fonksiyonu parametre tipleri ile birlikte kaydet
         if self.symtab.check_current_scope(node.isim):
-            print(f"HATA: '{node.isim}' fonksiyonu zaten tanimli!")
+            self.error(REDECLARED_FUNCTION, node, f"'{node.isim}' fonksiyonu zaten tanimli!")
         else:
             # 'params': param_types seklinde kaydediyoruz, cagrida kontrol edebiliriz
             #  AST'de henuz belirtilmediyse donus tipinin 'void' veya 'any' oldugunu varsayiyoruz
@@ -91,35 +157,41 @@ class SemanticAnalyzer:
         
         self.visit(node.govde) 
         
-        self.symtab.print_current_scope(f"Fonksiyon: {node.isim}") 
+        if not self.quiet:
+            self.symtab.print_current_scope(f"Fonksiyon: {node.isim}", log=self.log) 
         self.symtab.exit_scope()
 
     
+    # Ifadeler (BinaryOp, UnaryOp, FonksiyonCall) ozyinelemesiz hesaplanir (NodeVisitor.evaluate),
+    # cok derin ifadelerde de Python stack'i buyumez. Alt ifadelerin tipleri values ile gelir.
+
     def visit_FonksiyonCall(self, node):
-        # Fonksiyonun tanimli olup olmadigini kontrol et
+        return self.evaluate(node)
+
+    def pre_FonksiyonCall(self, node):
+        # Fonksiyonun tanimli olup olmadigini kontrol et, hata varsa argumanlar analiz edilmez
         func_symbol = self.symtab.lookup(node.isim)
         if func_symbol is None:
-            print(f"HATA: '{node.isim}' adinda bir fonksiyon bulunamadi!")
-            return 'error'
+            return self.error(UNDEFINED_FUNCTION, node, f"'{node.isim}' adinda bir fonksiyon bulunamadi!")
         
         if func_symbol['category'] != 'func':
-            print(f"HATA: '{node.isim}' bir fonksiyon degil!")
-            return 'error'
+            return self.error(NOT_A_FUNCTION, node, f"'{node.isim}' bir fonksiyon degil!")
 
         # Arguman sayisini kontrol et
         expected_params = func_symbol['params']
         given_args = node.args # Node listesi
         
         if len(given_args) != len(expected_params):
-            print(f"HATA: '{node.isim}' fonksiyonu {len(expected_params)} parametre bekliyor, {len(given_args)} verildi.")
-            return 'error'
+            return self.error(ARGUMENT_COUNT, node, f"'{node.isim}' fonksiyonu {len(expected_params)} parametre bekliyor, {len(given_args)} verildi.")
+        return None
+
+    def post_FonksiyonCall(self, node, arg_types):
+        func_symbol = self.symtab.lookup(node.isim)
 
         # Arguman tipi kontrolu
-        for i, (arg_expr, expected_type) in enumerate(zip(given_args, expected_params)):
-            arg_type = self.visit(arg_expr)
-            
+        for i, (arg_expr, arg_type, expected_type) in enumerate(zip(node.args, arg_types, func_symbol['params'])):
             if arg_type != expected_type and arg_type != 'error':
-                print(f"HATA: '{node.isim}' fonksiyonunun {i+1}. parametresi '{expected_type}' olmali, '{arg_type}' verildi.")
+                self.error(ARGUMENT_TYPE, arg_expr, f"'{node.isim}' fonksiyonunun {i+1}. parametresi '{expected_type}' olmali, '{arg_type}' verildi.")
 
         # Fonksiyonun return tipi (e.g. 'void', 'int')
         return func_symbol.get('return_type', 'void')
@@ -127,7 +199,7 @@ class SemanticAnalyzer:
     def visit_IfStatement(self, node):
         condition_type = self.visit(node.condition)
         if condition_type != 'bool' and condition_type != 'error':
-            print(f"HATA: If kosulu 'bool' olmali, '{condition_type}' bulundu.")
+            self.error(CONDITION_TYPE, node.condition, f"If kosulu 'bool' olmali, '{condition_type}' bulundu.")
         
         self.visit(node.true_blok)
         if node.else_blok:
@@ -136,7 +208,7 @@ class SemanticAnalyzer:
     def visit_WhileStatement(self, node):
         condition_type = self.visit(node.condition)
         if condition_type != 'bool' and condition_type != 'error':
-            print(f"HATA: While kosulu 'bool' olmali, '{condition_type}' bulundu.")
+            self.error(CONDITION_TYPE, node.condition, f"While kosulu 'bool' olmali, '{condition_type}' bulundu.")
         
         self.visit(node.govde)
         
@@ -145,7 +217,7 @@ class SemanticAnalyzer:
         
         condition_type = self.visit(node.condition)
         if condition_type != 'bool' and condition_type != 'error':
-             print(f"HATA: For kosulu 'bool' olmali, '{condition_type}' bulundu.")
+             self.error(CONDITION_TYPE, node.condition, f"For kosulu 'bool' olmali, '{condition_type}' bulundu.")
              
         self.visit(node.update)
         self.visit(node.govde)
@@ -154,56 +226,45 @@ class SemanticAnalyzer:
     def visit_Tanimlayici(self, node):
         symbol = self.symtab.lookup(node.isim)
         if symbol is None:
-            raise Exception(f"HATA: '{node.isim}' tanimli degil!") 
+            return self.error(UNDEFINED_NAME, node, f"'{node.isim}' tanimli degil!")
         return symbol['type']
 
     def visit_Literal(self, node):
         return node.tip
 
     def visit_BinaryOp(self, node):
-        # Tipleri almak icin children node'lari ziyaret et
-        left_type = self.visit(node.sol)
-        right_type = self.visit(node.sag)
+        return self.evaluate(node)
+
+    def post_BinaryOp(self, node, values):
+        # Children node'larin tipleri
+        left_type, right_type = values
 
         if left_type == 'error' or right_type == 'error':
             return 'error'
 
         op = node.op
+        result_type = binary_op_type(op, left_type, right_type)
+        if result_type is not None:
+            return result_type
 
         # Arithmetic
-        if op in ['+', '-', '*', '/', '%']:
-            if left_type in ['int', 'float'] and right_type in ['int', 'float']:
-                if left_type == 'float' or right_type == 'float':
-                    return 'float'
-                return 'int'
-            else:
-                print(f"HATA: Tip uyusmazligi! {left_type} {op} {right_type}. (Sayisal tur bekleniyor)")
-                return 'error'
+        if op in ARITHMETIC_OPS:
+            return self.error(ARITHMETIC_TYPE, node, f"Tip uyusmazligi! {left_type} {op} {right_type}. (Sayisal tur bekleniyor)")
         
         # Karsilastirma
-        elif op in ['<', '>', '<=', '>=', '==', '!=']:
-            if left_type == right_type or (left_type in ['int', 'float'] and right_type in ['int', 'float']):
-                return 'bool'
-            else:
-                print(f"HATA: Karsilastirma icin tipler uyumlu olmali: {left_type} vs {right_type}")
-                return 'error'
+        elif op in COMPARISON_OPS:
+            return self.error(COMPARISON_TYPE, node, f"Karsilastirma icin tipler uyumlu olmali: {left_type} vs {right_type}")
         
         # Logic islemleri
-        elif op in ['&&', '||']:
-            if left_type == 'bool' and right_type == 'bool':
-                return 'bool'
-            else:
-                print(f"HATA: Mantiksal islemler ({op}) sadece 'bool' turu ile calisir.")
-                return 'error'
-        
-        return 'unknown'
+        elif op in LOGIC_OPS:
+            return self.error(LOGIC_TYPE, node, f"Mantiksal islemler ({op}) sadece 'bool' turu ile calisir.")
 
     def visit_Atama(self, node):
         val_type = self.visit(node.deger)
         symbol = self.symtab.lookup(node.isim)
         
         if symbol is None:
-            raise Exception(f"HATA: '{node.isim}' tanimli degil!")
+            return self.error(UNDEFINED_NAME, node, f"'{node.isim}' tanimli degil!")
         
         var_type = symbol['type']
 
@@ -212,26 +273,25 @@ class SemanticAnalyzer:
             symbol['type'] = val_type
             # print(f"Bilgi: {node.isim} degiskeninin tipi '{val_type}' olarak guncellendi.")
         elif var_type != val_type and val_type != 'error':
-            raise Exception(f"HATA: Tip uyusmazligi! '{node.isim}' ({var_type}) degiskenine '{val_type}' atanmaya calisildi.")
+            self.error(ASSIGNMENT_TYPE, node, f"Tip uyusmazligi! '{node.isim}' ({var_type}) degiskenine '{val_type}' atanmaya calisildi.")
         
         return symbol['type']
 
     def visit_UnaryOp(self, node):
-        expr_type = self.visit(node.expr)
+        return self.evaluate(node)
+
+    def post_UnaryOp(self, node, values):
+        expr_type, = values
         if expr_type == 'error': return 'error'
 
+        result_type = unary_op_type(node.op, expr_type)
+        if result_type is not None:
+            return result_type
+
         if node.op == '!':
-            if expr_type != 'bool':
-                print(f"HATA: '!' operatoru sadece bool ile kullanilabilir. Gelen: {expr_type}")
-                return 'error'
-            return 'bool'
+            return self.error(UNARY_TYPE, node, f"'!' operatoru sadece bool ile kullanilabilir. Gelen: {expr_type}")
         elif node.op == '-':
-            if expr_type not in ['int', 'float']:
-                print(f"HATA: '-' operatoru sadece sayilarla kullanilabilir. Gelen: {expr_type}")
-                return 'error'
-            return expr_type
-        
-        return expr_type
+            return self.error(UNARY_TYPE, node, f"'-' operatoru sadece sayilarla kullanilabilir. Gelen: {expr_type}")
     
 if __name__ == "__main__":
     from lexer import lexer
@@ -255,7 +315,7 @@ if __name__ == "__main__":
         
         # Analyze -> Symbol Table
         analyzer = SemanticAnalyzer()
-        analyzer.visit(ast)
+        analyzer.analyze(ast)
         print("\n[SUCCESS] Test 1 Passed: Symbol Table duzgun olusturuldu.")
         
     except Exception as e:
@@ -280,7 +340,7 @@ if __name__ == "__main__":
         
         # Analyze (Should raise an exception)
         analyzer = SemanticAnalyzer()
-        analyzer.visit(ast)
+        analyzer.analyze(ast)
         
     except Exception as e:
         # If we catch the error, the test is successful
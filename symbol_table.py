@@ -21,14 +21,14 @@ class SymbolTable:
         return name in self.scopes[-1]
 
     # Debuglamak icin scope'u yazdirma
-    def print_current_scope(self, scope_name="Scope"):
+    def print_current_scope(self, scope_name="Scope", log=print):
         """En ustteki (topmost) scope'u yazdirir."""
         depth = len(self.scopes) - 1
         indent = "    " * depth
-        print(f"{indent}--- {scope_name} (Derinlik: {depth}) ---")
+        log(f"{indent}--- {scope_name} (Derinlik: {depth}) ---")
         if not self.scopes[-1]:
-            print(f"{indent}(Bos)")
+            log(f"{indent}(Bos)")
         else:
             for name, info in self.scopes[-1].items():
-                print(f"{indent}  {name}: {info}")
-        print(f"{indent}------------------------------")
\ No newline at end of file
+                log(f"{indent}  {name}: {info}")
+        log(f"{indent}------------------------------")
\ No newline at end of file
@@ -1,31 +1,56 @@
+import asyncio
+import io
+import os
+import time
 import sys
-from parser import parser, lexer
+import tempfile
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
 from semantic_analyzer import SemanticAnalyzer
 from bytecode_generator import BytecodeGenerator
 from virtual_machine import VirtualMachine
+from register_vm import RegisterVM
+from closure_vm import ClosureVM
+from execution import BufferedOutput, ResourceLimits, LimitExceeded, HostFunction
+from opcodes import Opcode, Function
+from peephole import optimize, DEFAULT_LEVEL, O1
+from ast_optimizer import ConstantFolder
+import bytecode_format
+import compiler
+from compiler import CompileCache, Compiler
+from scheduler import VMScheduler
+from worker_pool import VMWorkerPool
+import batch_compile
+from lexer import lexer as ply_lexer
+from fast_lexer import tokenize, tokenize_stream
+from incremental_parser import IncrementalParser
+from ast_structure import walk
+from ast_arena import AstArena
+from visitor import NodeVisitor
+from ast_function import print_ast
+from incremental_analyzer import IncrementalAnalyzer
 
-# Onceki durumu temizlemek icin yardimci fonksiyon
-def reset_compiler():
-    # Lexer satir numarasini (lineno) sifirlamamiz gerekebilir,
-    # ancak genellikle yeni Analyzer/VM ornekleri olusturmak yeterlidir.
-    lexer.lineno = 1
+# Parse icin kullanilan derleyici, lexer durumunu (lineno) her parse'ta kendisi sifirlar
+test_compiler = Compiler()
 
-def run_test(name, code, test_type="valid", expected_vars=None):
+def run_test(name, code, test_type="valid", expected_vars=None, opt_level=DEFAULT_LEVEL, via_binary=False,
+             vm_class=VirtualMachine):
     """
     test_type secenekleri: 
       - "valid": Basarili calisma beklenir. Final VM degiskenlerini kontrol eder.
       - "semantic_error": SemanticAnalyzer'in bir istisna (exception) firlatmasi beklenir.
       - "syntax_error": Parser'in hata vermesi beklenir.
+    opt_level: Bytecode'a uygulanacak peephole optimizasyon seviyesi.
+    via_binary: True ise bytecode binary formata yazilip tekrar okunarak calistirilir.
+    vm_class: Bytecode'u calistiran VM (VirtualMachine veya ClosureVM).
     """
     print(f"TEST: {name}")
     print("-" * 50)
     # print(f"Kod:\n{code.strip()}\n")
-    
-    reset_compiler()
 
     # --- 1. PARSING (AYRISTIRMA) ---
     try:
-        ast = parser.parse(code)
+        ast = test_compiler.parse(code)
     except Exception as e:
         if test_type == "syntax_error":
             print(f"[TAMAM] Syntax Hatasi beklendigi gibi yakalandi: {e}")
@@ -51,7 +76,7 @@ def run_test(name, code, test_type="valid", expected_vars=None):
     # --- 2. SEMANTICS (ANLAM ANALIZI) ---
     analyzer = SemanticAnalyzer()
     try:
-        analyzer.visit(ast)
+        analyzer.analyze(ast)
     except Exception as e:
         if test_type == "semantic_error":
             print(f"[TAMAM] Semantik Hata yakalandi: {e}")
@@ -67,19 +92,25 @@ def run_test(name, code, test_type="valid", expected_vars=None):
 
     # --- 3. CODE GEN (KOD URETIMI) ---
     try:
+        if opt_level >= O1:
+            ast = ConstantFolder().optimize(ast)
         codegen = BytecodeGenerator()
         codegen.visit(ast)
-        bytecode = codegen.get_bytecode()
+        bytecode = optimize(codegen.get_bytecode(), opt_level)
+        global_names = codegen.get_global_names()
+        if via_binary:
+            module = bytecode_format.loads(bytecode_format.dumps(bytecode, global_names, code), code)
+            bytecode, global_names = module.instructions, module.global_names
     except Exception as e:
         print(f"[HATA] Kod Uretim Hatasi: {e}")
         return
 
     # --- 4. VM EXECUTION (VM CALISTIRMA) ---
-    vm = VirtualMachine()
+    vm = vm_class()
     try:
         # Test loglarini temiz tutmak icin VM ciktilarini (print) gizleyebilirsiniz (opsiyonel)
         # sys.stdout = open('os.devnull', 'w') 
-        vm.run(bytecode)
+        vm.run(bytecode, global_names)
         # sys.stdout = sys.__stdout__ # Print'i geri yukle
     except Exception as e:
         # sys.stdout = sys.__stdout__
@@ -89,8 +120,9 @@ def run_test(name, code, test_type="valid", expected_vars=None):
     # --- 5. VERIFICATION (DOGRULAMA) ---
     if expected_vars:
         all_match = True
+        final_globals = vm.get_globals()
         for var_name, expected_val in expected_vars.items():
-            actual_val = vm.frames[0].get(var_name)
+            actual_val = final_globals.get(var_name)
             if actual_val != expected_val:
                 print(f"[HATA] Degisken '{var_name}' uyusmazligi! Beklenen {expected_val}, gelen {actual_val}")
                 all_match = False
@@ -102,13 +134,890 @@ def run_test(name, code, test_type="valid", expected_vars=None):
     
     print("="*50 + "\n")
 
+def run_parallel_test(name, programs, workers=4):
+    # Ayni Compiler thread havuzundan paralel kullanilir, her program sirali derlemeyle ayni sonucu vermeli
+    # programs: [(kod, beklenen degiskenler)]
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    parallel_compiler = Compiler()
+    sources = [code for code, _ in programs]
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parallel_compiler.compile, sources))
+    except Exception as e:
+        print(f"[HATA] Paralel Derleme Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    for (code, expected_vars), code_obj in zip(programs, results):
+        if code_obj.instructions != Compiler().compile(code).instructions:
+            print("[HATA] Paralel derleme sonucu sirali derlemeden farkli.")
+            print("="*50 + "\n")
+            return
+        vm = VirtualMachine()
+        vm.run(code_obj.instructions, code_obj.global_names)
+        final_globals = vm.get_globals()
+        mismatches = {k: final_globals.get(k) for k, v in expected_vars.items() if final_globals.get(k) != v}
+        if mismatches:
+            print(f"[HATA] Degisken uyusmazligi: {mismatches}")
+            print("="*50 + "\n")
+            return
+
+    print(f"[TAMAM] Test Gecti. {len(programs)} program {workers} thread ile derlendi.")
+    print("="*50 + "\n")
+
+def ply_tokens(code):
+    # PLY lexer'inin token akisi, karsilastirma icin tuple olarak
+    lexer = ply_lexer.clone()
+    lexer.lineno = 1
+    lexer.input(code)
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in iter(lexer.token, None)]
+
+def run_lexer_diff_test(name, sources):
+    # Hizli lexer her kaynakta PLY lexer'i ile ayni token akisini (tip, deger, satir, pozisyon)
+    # ve ayni hata ciktisini uretmeli, iki lexer'la derlenen bytecode da ayni olmali
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    ply_compiler = Compiler()
+    fast_compiler = Compiler(lexer="fast")
+    for i, code in enumerate(sources):
+        ply_output, fast_output = io.StringIO(), io.StringIO()
+        with redirect_stdout(ply_output):
+            expected = ply_tokens(code)
+        with redirect_stdout(fast_output):
+            actual = tokenize(code)
+        # 1 == 1.0 oldugu icin deger tipleri de karsilastiriliyor
+        if (actual != expected or [type(tok[1]) for tok in actual] != [type(tok[1]) for tok in expected]
+                or ply_output.getvalue() != fast_output.getvalue()):
+            print(f"[HATA] {i}. kaynakta token akisi farkli.")
+            print("="*50 + "\n")
+            return
+
+        try:
+            ply_code = ply_compiler.compile(code).instructions
+        except Exception:
+            continue
+        if fast_compiler.compile(code).instructions != ply_code:
+            print(f"[HATA] {i}. kaynakta uretilen bytecode farkli.")
+            print("="*50 + "\n")
+            return
+
+    print(f"[TAMAM] Test Gecti. {len(sources)} kaynakta token akislari ayni.")
+    print("="*50 + "\n")
+
+def run_stream_test(name, code, expected_vars, chunk_sizes=(1, 3, 16, 4096)):
+    # Kaynak kucuk parcalarla (binary akis) okununca token akisi ve derleme sonucu
+    # butun kaynagin tek seferde islenmesiyle ayni olmali
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    expected_tokens = tokenize(code)
+    expected_code = Compiler().compile(code)
+    for chunk_size in chunk_sizes:
+        tokens = list(tokenize_stream(io.BytesIO(code.encode('utf-8')), chunk_size))
+        if tokens != expected_tokens:
+            print(f"[HATA] Parca boyutu {chunk_size}: token akisi farkli.")
+            print("="*50 + "\n")
+            return
+
+        code_obj = Compiler().compile_stream(io.BytesIO(code.encode('utf-8')), chunk_size=chunk_size)
+        if (code_obj.instructions != expected_code.instructions
+                or code_obj.source_hash != expected_code.source_hash):
+            print(f"[HATA] Parca boyutu {chunk_size}: derleme sonucu farkli.")
+            print("="*50 + "\n")
+            return
+
+    # Tek satirlik uzun kaynak: satir sonu gelene kadar parcalar birikir, akis butun kaynak kadar surmeli
+    long_line = "int t = 0; " + "t = t + 1; " * 30_000 + "\n"
+    start = time.perf_counter()
+    expected_long = tokenize(long_line)
+    whole_time = time.perf_counter() - start
+    start = time.perf_counter()
+    streamed_long = list(tokenize_stream(io.BytesIO(long_line.encode('utf-8')), 64))
+    stream_time = time.perf_counter() - start
+    if streamed_long != expected_long:
+        print("[HATA] Uzun tek satirda token akisi farkli.")
+        print("="*50 + "\n")
+        return
+    if stream_time > 3 * whole_time + 0.1:
+        print(f"[HATA] Uzun tek satir akista cok yavas: {stream_time:.3f} s (tek seferde {whole_time:.3f} s)")
+        print("="*50 + "\n")
+        return
+
+    vm = VirtualMachine()
+    vm.run(code_obj.instructions, code_obj.global_names)
+    final_globals = vm.get_globals()
+    mismatches = {k: final_globals.get(k) for k, v in expected_vars.items() if final_globals.get(k) != v}
+    if mismatches:
+        print(f"[HATA] Degisken uyusmazligi: {mismatches}")
+    else:
+        print(f"[TAMAM] Test Gecti. Parca boyutlari {list(chunk_sizes)} ile ayni sonuc, "
+              f"{len(long_line)} karakterlik tek satir {stream_time:.3f} s (tek seferde {whole_time:.3f} s).")
+    print("="*50 + "\n")
+
+def run_incremental_test(name, code, edits):
+    # Her degisiklikten sonra artimli parse sonucu butun kaynagin parse edilmesiyle ayni olmali
+    # edits: [(eski metin, yeni metin, en fazla yeniden parse edilecek statement)], ilk eslesme degistirilir
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    inc = IncrementalParser()
+    try:
+        result = inc.parse(code)
+        text = code
+        for old, new, max_reparsed in edits:
+            offset = text.index(old)
+            first_nodes = list(result.ast.statements)
+            result = inc.reparse(result, offset, len(old), new)
+            text = text[:offset] + new + text[offset + len(old):]
+
+            full = test_compiler.parse(text)
+            if repr(result.ast) != repr(full):
+                print(f"[HATA] '{old}' -> '{new}' sonrasi AST tam parse ile ayni degil.")
+                print("="*50 + "\n")
+                return
+            result.materialize()
+            positions = [(node.lineno, node.start, node.end) for node in walk(result.ast)]
+            if positions != [(node.lineno, node.start, node.end) for node in walk(full)]:
+                print(f"[HATA] '{old}' -> '{new}' sonrasi node pozisyonlari tam parse ile ayni degil.")
+                print("="*50 + "\n")
+                return
+            if result.reparsed > max_reparsed:
+                print(f"[HATA] '{old}' -> '{new}': {result.reparsed} statement yeniden parse edildi, beklenen en fazla {max_reparsed}.")
+                print("="*50 + "\n")
+                return
+            reused = sum(any(node is old_node for old_node in first_nodes) for node in result.ast.statements)
+            if reused < len(result.ast.statements) - max_reparsed:
+                print(f"[HATA] '{old}' -> '{new}': degismeyen statement'lar yeniden kullanilmadi.")
+                print("="*50 + "\n")
+                return
+    except Exception as e:
+        print(f"[HATA] Artimli Parse Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    print(f"[TAMAM] Test Gecti. {len(edits)} degisiklik artimli parse edildi.")
+    print("="*50 + "\n")
+
+def run_incremental_analysis_test(name, code, edits):
+    # Artimli analizin hatalari her degisiklikten sonra butun programin analiz edilmesiyle ayni olmali
+    # edits: [(eski metin, yeni metin, en fazla yeniden analiz edilecek birim)], ilk eslesme degistirilir
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    inc = IncrementalParser()
+    analyzer = IncrementalAnalyzer()
+    try:
+        result = inc.parse(code)
+        analyzer.analyze(result.ast, result.changed, result.lines())
+        text = code
+        for old, new, max_analyzed in edits:
+            offset = text.index(old)
+            result = inc.reparse(result, offset, len(old), new)
+            text = text[:offset] + new + text[offset + len(old):]
+            analysis = analyzer.analyze(result.ast, result.changed, result.lines())
+
+            expected = IncrementalAnalyzer().analyze(test_compiler.parse(text)).diagnostics
+            if analysis.diagnostics != expected:
+                print(f"[HATA] '{old}' -> '{new}' sonrasi hatalar tam analiz ile ayni degil.")
+                print(f"       Bulunan: {analysis.diagnostics}\n       Beklenen: {expected}")
+                print("="*50 + "\n")
+                return
+            if analysis.analyzed > max_analyzed:
+                print(f"[HATA] '{old}' -> '{new}': {analysis.analyzed} birim analiz edildi, beklenen en fazla {max_analyzed}.")
+                print("="*50 + "\n")
+                return
+    except Exception as e:
+        print(f"[HATA] Artimli Analiz Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    print(f"[TAMAM] Test Gecti. {len(edits)} degisiklik artimli analiz edildi.")
+    print("="*50 + "\n")
+
+def run_diagnostics_test(name, code, expected_codes):
+    # Sessiz analiz hicbir sey yazdirmamali ve programdaki butun hatalari tek geciste bulmali
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    output = io.StringIO()
+    try:
+        ast = test_compiler.parse(code)
+        analyzer = SemanticAnalyzer(quiet=True)
+        with redirect_stdout(output):
+            analyzer.visit(ast)
+    except Exception as e:
+        print(f"[HATA] Analiz Exception firlatmamaliydi: {e}")
+        print("="*50 + "\n")
+        return
+
+    codes = [d.code for d in analyzer.diagnostics]
+    if output.getvalue():
+        print(f"[HATA] Sessiz analiz cikti yazdirdi: {output.getvalue()[:100]!r}")
+    elif codes != expected_codes:
+        print(f"[HATA] Hata kodlari uyusmuyor. Beklenen {expected_codes}, gelen {codes}")
+        for diagnostic in analyzer.diagnostics:
+            print(f"       {diagnostic.format()}")
+    else:
+        print(f"[TAMAM] Test Gecti. {len(codes)} hata tek geciste bulundu.")
+    print("="*50 + "\n")
+
+def run_line_table_test(name, code, expected_line, levels=(0, 1, 2), vm_class=VirtualMachine):
+    # Calisma zamani hatasi her optimizasyon seviyesinde ve .pbc'den yuklenince ayni kaynak satiriyla bildirilmeli
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    for level in levels:
+        try:
+            code_object = compiler.compile_uncached(code, level)
+            loaded = compiler.CodeObject.from_bytes(code_object.to_bytes())
+        except Exception as e:
+            print(f"[HATA] Derleme Hatasi (O{level}): {e}")
+            print("="*50 + "\n")
+            return
+        for label, program in (("bellek", code_object), ("binary", loaded)):
+            vm = vm_class()
+            try:
+                with redirect_stdout(io.StringIO()):
+                    vm.run(program.instructions, program.global_names, program.line_table)
+                message = "hata olusmadi"
+            except Exception as e:
+                message = str(e)
+            if f"(satir {expected_line})" not in message:
+                print(f"[HATA] O{level} {label}: satir {expected_line} bekleniyordu, gelen: {message}")
+                print("="*50 + "\n")
+                return
+
+    print(f"[TAMAM] Test Gecti. Hata satiri {len(levels)} seviyede ve binary'de dogru bildirildi.")
+    print("="*50 + "\n")
+
+def run_arena_test(name, code):
+    # Node'larda __dict__ olmamali, arena'ya cevrilip geri cevrilen agac ayni olmali (pozisyonlar dahil)
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    def positions(root):
+        return [(type(node).__name__, node.lineno, node.start, node.end) for node in walk(root)]
+
+    try:
+        ast = test_compiler.parse(code)
+        with_dict = [type(node).__name__ for node in walk(ast) if hasattr(node, '__dict__')]
+        arena = AstArena.from_tree(ast)
+        rebuilt = arena.to_tree()
+    except Exception as e:
+        print(f"[HATA] Arena Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    if with_dict:
+        print(f"[HATA] __dict__'li node'lar var: {with_dict}")
+    elif len(arena) != sum(1 for _ in walk(ast)):
+        print(f"[HATA] Arena'da {len(arena)} node var, agacta {sum(1 for _ in walk(ast))}.")
+    elif repr(rebuilt) != repr(ast) or positions(rebuilt) != positions(ast):
+        print("[HATA] Arena'dan geri cevrilen agac ayni degil.")
+    else:
+        print(f"[TAMAM] Test Gecti. {len(arena)} node, {len(arena.values)} farkli deger, ~{arena.nbytes()} byte.")
+    print("="*50 + "\n")
+
+class OrderVisitor(NodeVisitor):
+    # Ziyaret sirasini kaydeder: visit generic_visit ile butun node'lari, traverse enter_ metodlariyla
+    # sadece BinaryOp/Tanimlayici/Literal node'larini
+    def __init__(self):
+        self.order = []
+
+    def generic_visit(self, node):
+        self.order.append(type(node).__name__)
+        super().generic_visit(node)
+
+    def enter_BinaryOp(self, node):
+        self.order.append('BinaryOp')
+
+    def enter_Tanimlayici(self, node):
+        self.order.append('Tanimlayici')
+
+    def enter_Literal(self, node):
+        self.order.append('Literal')
+
+class LiteralVisitor(OrderVisitor):
+    # Alt sinifin metodu sadece kendi dispatch tablosunda olmali
+    def visit_Literal(self, node):
+        self.order.append('literal')
+
+def run_visitor_test(name, code, depth):
+    # Dispatch tablolari sinif basina ayri olmali, traverse ozyinelemeli ziyaretle ayni sirada gezmeli
+    # ve derin agacta ozyinelemesiz calismali
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    try:
+        ast = test_compiler.parse(code)
+        recursive = OrderVisitor()
+        recursive.visit(ast)
+        iterative = OrderVisitor()
+        iterative.traverse(ast)
+        literal = LiteralVisitor()
+        literal.visit(ast)
+
+        deep = test_compiler.parse("int x = 1;\nint y = " + " + ".join(["x"] * depth) + ";\n")
+        deep_visitor = OrderVisitor()
+        deep_visitor.traverse(deep)
+    except Exception as e:
+        print(f"[HATA] Visitor Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    expected = [name for name in recursive.order if name in ('BinaryOp', 'Tanimlayici', 'Literal')]
+    if iterative.order != expected:
+        print("[HATA] traverse sirasi ozyinelemeli ziyaret ile ayni degil.")
+    elif 'literal' not in literal.order or 'literal' in recursive.order:
+        print("[HATA] Alt sinifin visit_Literal metodu dispatch tablosunda yanlis.")
+    elif deep_visitor.order.count('BinaryOp') != depth - 1:
+        print(f"[HATA] Derin agacta {deep_visitor.order.count('BinaryOp')} BinaryOp gezildi, beklenen {depth - 1}.")
+    else:
+        print(f"[TAMAM] Test Gecti. {len(expected)} node ayni sirada, {depth - 1} derinlik ozyinelemesiz gezildi.")
+    print("="*50 + "\n")
+
+def deep_expression(kind, depth):
+    # depth seviyelik ifade: sola derin (x + x + ...) veya parantezle saga derin (x + (x + (...)))
+    if kind == "sol":
+        return " + ".join(["x"] * depth)
+    return "(x + " * (depth - 1) + "x" + ")" * (depth - 1)
+
+def run_deep_expression_test(name, depth, print_depth=3000):
+    # Cok derin ifadeler RecursionError olmadan analiz edilmeli, derlenmeli ve calismali
+    # print_ast ciktisi girinti yuzunden derinligin karesiyle buyudugu icin daha sig (ama ozyineleme
+    # limitinden derin) bir ifadeyle denenir
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    for kind in ("sol", "sag"):
+        code = f"int x = 1;\nint y = {deep_expression(kind, depth)};\n"
+        try:
+            for level in (0, 2):
+                code_object = Compiler(level, lexer="fast").compile_uncached(code)
+                vm = VirtualMachine()
+                with redirect_stdout(io.StringIO()):
+                    vm.run(code_object.instructions, code_object.global_names, code_object.line_table)
+                if vm.get_globals().get("y") != depth:
+                    print(f"[HATA] {kind} O{level}: y = {vm.get_globals().get('y')}, beklenen {depth}")
+                    print("="*50 + "\n")
+                    return
+
+            # Zincirin sonundaki tip hatasi bir kere bildirilmeli
+            ast = test_compiler.parse(f"int x = 1;\nint y = {deep_expression(kind, depth - 1)} + true;\n")
+            analyzer = SemanticAnalyzer(quiet=True)
+            analyzer.visit(ast)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                print_ast(test_compiler.parse(f"int y = {deep_expression(kind, print_depth)};"))
+        except RecursionError:
+            print(f"[HATA] {kind}: RecursionError")
+            print("="*50 + "\n")
+            return
+        except Exception as e:
+            print(f"[HATA] {kind}: {e}")
+            print("="*50 + "\n")
+            return
+
+        codes = [d.code for d in analyzer.diagnostics]
+        if codes != ["E011"]:
+            print(f"[HATA] {kind}: hata kodlari {codes[:5]}, beklenen ['E011']")
+            print("="*50 + "\n")
+            return
+        if output.getvalue().count("BinaryOp") != print_depth - 1:
+            print(f"[HATA] {kind}: print_ast {output.getvalue().count('BinaryOp')} BinaryOp yazdirdi.")
+            print("="*50 + "\n")
+            return
+
+    print(f"[TAMAM] Test Gecti. {depth} seviyelik ifadeler analiz edildi, derlendi ve calistirildi.")
+    print("="*50 + "\n")
+
+def run_register_test(name, programs, error_code, error_line, levels=(0, 2)):
+    # Register backend'i ayni programlarda stack VM ile ayni degiskenleri ve daha az calisan instruction vermeli,
+    # calisma zamani hatasi ayni kaynak satiriyla bildirilmeli
+    # programs: [(kod, beklenen degiskenler)]
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    for level in levels:
+        stack_compiler = Compiler(level)
+        register_compiler = Compiler(level, backend=compiler.REGISTER)
+        for code, expected_vars in programs:
+            results = []
+            for program in (stack_compiler.compile(code), register_compiler.compile(code)):
+                vm = program.create_vm()
+                try:
+                    with redirect_stdout(io.StringIO()):
+                        vm.run(program.instructions, program.global_names, program.line_table)
+                except Exception as e:
+                    print(f"[HATA] O{level} {program.backend}: Calisma Zamani Hatasi: {e}")
+                    print("="*50 + "\n")
+                    return
+                final_globals = vm.get_globals()
+                results.append(({k: final_globals.get(k) for k in expected_vars}, vm.instruction_count))
+            (stack_vars, stack_count), (register_vars, register_count) = results
+            if stack_vars != expected_vars or register_vars != expected_vars:
+                print(f"[HATA] O{level} degisken uyusmazligi. Beklenen {expected_vars}, "
+                      f"stack {stack_vars}, register {register_vars}")
+                print("="*50 + "\n")
+                return
+            if register_count > stack_count:
+                print(f"[HATA] O{level} register VM daha fazla instruction calistirdi: {register_count} > {stack_count}")
+                print("="*50 + "\n")
+                return
+
+        program = register_compiler.compile(error_code)
+        try:
+            with redirect_stdout(io.StringIO()):
+                RegisterVM().run(program.instructions, program.global_names, program.line_table)
+            message = "hata olusmadi"
+        except Exception as e:
+            message = str(e)
+        if f"(satir {error_line})" not in message:
+            print(f"[HATA] O{level}: satir {error_line} bekleniyordu, gelen: {message}")
+            print("="*50 + "\n")
+            return
+
+    try:
+        register_compiler.compile(error_code).to_bytes()
+        print("[HATA] Register kodu binary formata yazilmamaliydi.")
+        print("="*50 + "\n")
+        return
+    except Exception:
+        pass
+
+    print(f"[TAMAM] Test Gecti. {len(programs)} program iki backend'de ayni sonucu verdi.")
+    print("="*50 + "\n")
+
+def print_loop(count):
+    # for (i = 0; i < count; i = i + 1) { print(i * 2); } bytecode'u (dilde print ifadesi yok)
+    return [
+        (Opcode.LOAD_CONST, 0), (Opcode.STORE_GLOBAL, 0),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.LOAD_CONST, count), (Opcode.COMPARE, '<'), (Opcode.JUMP_IF_FALSE, 15),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.LOAD_CONST, 2), (Opcode.MUL, None), (Opcode.PRINT, None),
+        (Opcode.LOAD_GLOBAL, 0), (Opcode.LOAD_CONST, 1), (Opcode.ADD, None), (Opcode.STORE_GLOBAL, 0),
+        (Opcode.JUMP_ABSOLUTE, 2),
+        (Opcode.HALT, None),
+    ]
+
+class ListSink:
+    # write(value) metodu olan ozel cikti hedefi
+    def __init__(self):
+        self.items = []
+
+    def write(self, value):
+        self.items.append(("print", value))
+
+def run_quiet_test(name, code, expected_vars, count=1000):
+    # Sessiz VM'ler konsola hicbir sey yazmamali, PRINT ciktisi verilen hedefe gitmeli, run() sonuc dondurmeli
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    expected_output = [i * 2 for i in range(count)]
+    checks = []
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        for vm_class in (VirtualMachine, ClosureVM):
+            result = vm_class(quiet=True).run(print_loop(count), ["i"])
+            checks.append((f"{vm_class.__name__} PRINT", type(result.output) is BufferedOutput and
+                           list(result.output) == expected_output and result.globals == {"i": count} and
+                           result.instruction_count == 13 * count + 7))
+
+            sink = ListSink()
+            result = vm_class(quiet=True, output=sink).run(print_loop(3), ["i"])
+            checks.append((f"{vm_class.__name__} ozel hedef", result.output is sink and
+                           sink.items == [("print", 0), ("print", 2), ("print", 4)]))
+
+        for backend in (compiler.STACK, compiler.REGISTER):
+            program = Compiler(backend=backend).compile(code)
+            result = program.create_vm(quiet=True).run(program.instructions, program.global_names)
+            values = {k: result.globals.get(k) for k in expected_vars}
+            checks.append((f"{backend} sonuc", values == expected_vars and result.return_value is None and
+                           result.instruction_count > 0))
+
+        # Ifade olarak cagrilan fonksiyonun degeri stack'te kalsa da ana programda return yok, return_value None
+        call_statement = "int f() {\n    return 3;\n}\nf();\nint x = 1;\n"
+        for backend in (compiler.STACK, compiler.REGISTER):
+            program = Compiler(backend=backend).compile(call_statement)
+            vm_classes = (VirtualMachine, ClosureVM) if backend == compiler.STACK else (RegisterVM,)
+            for vm_class in vm_classes:
+                result = vm_class(quiet=True).run(program.instructions, program.global_names)
+                checks.append((f"{vm_class.__name__} return_value", result.return_value is None and
+                               result.globals.get('x') == 1))
+
+        # Register VM limits ve host_functions almaz, create_vm acik bir hata vermeli
+        try:
+            Compiler(backend=compiler.REGISTER).compile(code).create_vm(quiet=True, limits=ResourceLimits())
+            checks.append(("register limits hatasi", False))
+        except Exception as e:
+            checks.append(("register limits hatasi", "HATA" in str(e) and "limits" in str(e)))
+
+    failed = [label for label, ok in checks if not ok]
+    if stdout.getvalue():
+        print(f"[HATA] Sessiz VM konsola yazdi: {stdout.getvalue()[:100]!r}")
+    elif failed:
+        print(f"[HATA] Basarisiz kontroller: {failed}")
+    else:
+        print(f"[TAMAM] Test Gecti. {len(checks)} kontrol, konsola cikti yok.")
+    print("="*50 + "\n")
+
+def run_limits_test(name, code, expected_vars, slice_steps=50):
+    # Sonsuz dongu ve kontrolsuz ozyineleme limitlerle durdurulmali,
+    # parca parca (resume) calisan programlar tek seferde calisanla ayni sonucu vermeli
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    loop = "int i = 0;\nwhile (true) {\n    i = i + 1;\n}\n"
+    recursion = "int f(int n) {\n    return f(n + 1);\n}\nint x = f(0);\n"
+    deep_stack = "int f(int n) {\n    return n + f(n + 1);\n}\nint x = f(0);\n"
+    cases = [
+        (loop, ResourceLimits(max_instructions=100_000), 'max_instructions'),
+        (loop, ResourceLimits(timeout=0.05), 'timeout'),
+        (recursion, ResourceLimits(max_call_depth=500), 'max_call_depth'),
+        (deep_stack, ResourceLimits(max_stack=200), 'max_stack'),
+    ]
+    for source, limits, expected_limit in cases:
+        program = test_compiler.compile(source)
+        vm = VirtualMachine(quiet=True, limits=limits)
+        try:
+            vm.run(program.instructions, program.global_names, program.line_table)
+            print(f"[HATA] {expected_limit}: program durdurulmadi")
+            print("="*50 + "\n")
+            return
+        except LimitExceeded as e:
+            if e.limit != expected_limit:
+                print(f"[HATA] {expected_limit} bekleniyordu, gelen {e.limit}: {e}")
+                print("="*50 + "\n")
+                return
+        if expected_limit == 'max_instructions' and not 100_000 <= vm.instruction_count < 100_010:
+            print(f"[HATA] Instruction limiti {vm.instruction_count} instruction'da durdu.")
+            print("="*50 + "\n")
+            return
+
+    # Zaman dilimleri: uc program sirayla max_steps'lik dilimlerle calistirilir
+    program = test_compiler.compile(code)
+    expected = VirtualMachine(quiet=True).run(program.instructions, program.global_names)
+    vms = []
+    for _ in range(3):
+        vm = VirtualMachine(quiet=True, limits=ResourceLimits(max_instructions=10 * expected.instruction_count))
+        vm.start(program.instructions, program.global_names)
+        vms.append(vm)
+    results = [None] * len(vms)
+    slices = 0
+    while any(result is None for result in results):
+        for i, vm in enumerate(vms):
+            if results[i] is None:
+                results[i] = vm.resume(slice_steps)
+                slices += 1
+    for result in results:
+        values = {k: result.globals.get(k) for k in expected_vars}
+        if values != expected_vars or result.instruction_count != expected.instruction_count:
+            print(f"[HATA] Parca parca calisan program farkli sonuc verdi: {values}, {result.instruction_count}")
+            print("="*50 + "\n")
+            return
+    if slices <= len(vms):
+        print(f"[HATA] Programlar zaman dilimlerine bolunmedi ({slices} dilim).")
+        print("="*50 + "\n")
+        return
+
+    print(f"[TAMAM] Test Gecti. {len(cases)} limit durduruldu, 3 program {slices} dilimde ayni sonucu verdi.")
+    print("="*50 + "\n")
+
+def run_scheduler_test(name, code, expected_vars, count=10, delay=0.02):
+    # Programlar ayni event loop'ta zaman dilimleriyle calismali, async host cagrisini bekleyen program
+    # digerlerini bekletmemeli. Kaydedilen durumdan (save_state) tekrar calistirmak ayni sonucu vermeli.
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    async def bekle(n):
+        await asyncio.sleep(delay)
+        return n + 1
+
+    hosts = [HostFunction('kare', lambda x: x * x, ['int']), HostFunction('bekle', bekle, ['int'])]
+    host_compiler = Compiler(host_functions=hosts)
+    io_code = host_compiler.compile("int x = kare(3);\nint y = bekle(x) + bekle(1);\n")
+    cpu_code = host_compiler.compile(code)
+
+    async def main():
+        async with VMScheduler(slice_steps=100, host_functions=hosts) as scheduler:
+            started = time.perf_counter()
+            jobs = [scheduler.submit(io_code) for _ in range(count)] + [scheduler.submit(cpu_code)]
+            results = await asyncio.gather(*jobs)
+            return results, time.perf_counter() - started, scheduler.metrics()
+
+    results, elapsed, metrics = asyncio.run(main())
+    for result in results[:-1]:
+        if (result.globals['x'], result.globals['y']) != (9, 12):
+            print(f"[HATA] Host cagrili program yanlis sonuc verdi: {result.globals}")
+            print("="*50 + "\n")
+            return
+    values = {k: results[-1].globals.get(k) for k in expected_vars}
+    if values != expected_vars:
+        print(f"[HATA] Beklenen: {expected_vars}, Gelen: {values}")
+        print("="*50 + "\n")
+        return
+    # Her program iki kere bekliyor, sirayla beklenseydi count * 2 * delay surerdi
+    if elapsed >= count * 2 * delay:
+        print(f"[HATA] Host cagrilari programlari bekletti ({elapsed:.3f} s).")
+        print("="*50 + "\n")
+        return
+    if metrics['completed'] != count + 1 or metrics['host_calls'] != 2 * count or metrics['slices'] <= count + 1:
+        print(f"[HATA] Metrikler beklenenden farkli: {metrics}")
+        print("="*50 + "\n")
+        return
+
+    # Host cagrisi beklenirken kapatilan zamanlayici programin future'ini iptal etmeli
+    async def yavas(n):
+        await asyncio.sleep(10)
+        return n
+
+    slow_hosts = [HostFunction('yavas', yavas, ['int'])]
+    slow_code = Compiler(host_functions=slow_hosts).compile("int x = yavas(1);\n")
+
+    async def close_while_waiting():
+        scheduler = VMScheduler(host_functions=slow_hosts)
+        future = scheduler.submit(slow_code)
+        await asyncio.sleep(0.05)
+        await scheduler.close()
+        try:
+            await asyncio.wait_for(future, 1)
+        except asyncio.CancelledError:
+            return True
+        except asyncio.TimeoutError:
+            return False
+        return False
+
+    if not asyncio.run(close_while_waiting()):
+        print("[HATA] Host cagrisi beklerken kapatilan programin future'i iptal edilmedi.")
+        print("="*50 + "\n")
+        return
+
+    # Durum kaydetme: ilk dilimden sonraki durumdan iki kere devam etmek ayni sonucu vermeli
+    program = test_compiler.compile(code)
+    vm = VirtualMachine(quiet=True)
+    vm.start(program.instructions, program.global_names)
+    vm.resume(50)
+    state = vm.save_state()
+    first = vm.resume()
+    vm.restore_state(state)
+    second = vm.resume()
+    if first.globals != second.globals or first.instruction_count != second.instruction_count:
+        print(f"[HATA] Kaydedilen durumdan farkli sonuc: {first.globals} / {second.globals}")
+        print("="*50 + "\n")
+        return
+
+    print(f"[TAMAM] Test Gecti. {count + 1} program {metrics['slices']} dilimde {elapsed:.3f} s'de bitti, "
+          f"{metrics['host_calls']} host cagrisi.")
+    print("="*50 + "\n")
+
+def run_worker_pool_test(name, code, inputs_list, result_var, workers=2):
+    # Ayni program process havuzunda farkli girdilerle ayni process'teki VM ile ayni sonucu vermeli,
+    # program bir kere kaydedilmeli, hata ve limit asimi ana process'e donmeli
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    input_names = {key: 'int' for key in inputs_list[0]}
+    program = Compiler(inputs=input_names).compile(code)
+    expected = [VirtualMachine(quiet=True).run(program.instructions, program.global_names, inputs=inputs).globals
+                for inputs in inputs_list]
+    failing = Compiler(inputs=input_names).compile("int z = 1 / 0;")
+    looping = Compiler().compile("while (true) { }")
+
+    # Host fonksiyonlu program: ayni host'lar havuza verilir ve worker'lara gider
+    hosts = [HostFunction('mutlak', abs, ['int'])]
+    host_program = Compiler(host_functions=hosts).compile("int m = mutlak(0 - 42);")
+
+    with VMWorkerPool(workers, limits=ResourceLimits(max_instructions=1_000_000), host_functions=hosts) as pool:
+        results = pool.map(program, inputs_list)
+        again = pool.submit(program, inputs_list[0]).result()
+        stored = [f for f in os.listdir(pool.store_dir) if f.endswith(".pbc")]
+        host_result = pool.submit(host_program).result()
+        errors = []
+        for bad in (failing, looping):
+            try:
+                pool.submit(bad, inputs_list[0] if bad is failing else None).result()
+            except Exception as e:
+                errors.append(e)
+
+    values = [result.globals[result_var] for result in results]
+    if values != [globals_[result_var] for globals_ in expected] or again.globals != expected[0]:
+        print(f"[HATA] Havuz farkli sonuc verdi: {values}")
+        print("="*50 + "\n")
+        return
+    if len(stored) != 1:
+        print(f"[HATA] Her program bir kere kaydedilmeliydi: {stored}")
+        print("="*50 + "\n")
+        return
+    if host_result.globals.get('m') != 42:
+        print(f"[HATA] Host fonksiyonu worker'da calismadi: {host_result.globals}")
+        print("="*50 + "\n")
+        return
+    if len(errors) != 2 or "division by zero" not in str(errors[0]) or getattr(errors[1], 'limit', None) != 'max_instructions':
+        print(f"[HATA] Hatalar ana process'e donmedi: {errors}")
+        print("="*50 + "\n")
+        return
+
+    print(f"[TAMAM] Test Gecti. {len(inputs_list)} calistirma {workers} process'te: {values}")
+    print("="*50 + "\n")
+
+def run_call_frame_test(name, code, func_name, arity, expected_vars, max_frames):
+    # Fonksiyon derleme zamaninda Function nesnesi olmali, CALL arguman sayisini tasimali, binary formattan
+    # ayni nesne okunmali ve ozyinelemede frame'ler havuzdan tekrar kullanilmali
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    program = test_compiler.compile(code)
+    functions = [arg for op, arg in program.instructions if op == Opcode.LOAD_FUNC]
+    calls = [arg for op, arg in program.instructions if op == Opcode.CALL]
+    func = next((f for f in functions if f.name == func_name), None)
+    if func is None or func.arity != arity or any(type(argc) is not int for argc in calls):
+        print(f"[HATA] Fonksiyon nesnesi veya CALL arg'i beklenenden farkli: {functions}, {calls}")
+        print("="*50 + "\n")
+        return
+
+    loaded = compiler.CodeObject.from_bytes(program.to_bytes())
+    if [arg for op, arg in loaded.instructions if op == Opcode.LOAD_FUNC] != functions:
+        print("[HATA] Binary formattan okunan fonksiyon nesneleri farkli.")
+        print("="*50 + "\n")
+        return
+
+    vm = VirtualMachine(quiet=True)
+    result = vm.run(program.instructions, program.global_names)
+    values = {k: result.globals.get(k) for k in expected_vars}
+    closure_values = {k: ClosureVM(quiet=True).run(program.instructions, program.global_names).globals.get(k)
+                      for k in expected_vars}
+    if values != expected_vars or closure_values != expected_vars or result.globals[func_name] != func:
+        print(f"[HATA] Beklenen: {expected_vars}, Gelen: {values} / {closure_values}")
+        print("="*50 + "\n")
+        return
+    # Program bittiginde butun frame'ler havuzda: cagri sayisi kadar degil, en derin cagri zinciri kadar olmali
+    frames = sum(len(pool) for pool in vm.frame_pool)
+    if not 0 < frames <= max_frames:
+        print(f"[HATA] Frame'ler havuzdan kullanilmadi: {frames} frame")
+        print("="*50 + "\n")
+        return
+
+    # Yanlis arguman sayisiyla cagri calisma zamaninda yakalanmali
+    bad = [(Opcode.LOAD_CONST, 1), (Opcode.LOAD_CONST, Function("f", 4, 2, 2)), (Opcode.CALL, 1), (Opcode.HALT, None),
+           (Opcode.LOAD_CONST, None), (Opcode.RETURN, None)]
+    try:
+        VirtualMachine(quiet=True).run(bad, [])
+        print("[HATA] Yanlis arguman sayisi yakalanmadi.")
+        print("="*50 + "\n")
+        return
+    except Exception as e:
+        if "parametre bekliyor" not in str(e):
+            print(f"[HATA] Beklenmeyen hata: {e}")
+            print("="*50 + "\n")
+            return
+
+    print(f"[TAMAM] Test Gecti. {func}, {frames} frame ile {values}")
+    print("="*50 + "\n")
+
+def run_batch_test(name, programs, bad_code, workers=2):
+    # Kaynaklar gecici klasore yazilip process havuzunda toplu derlenir, hatali dosya raporlanmali,
+    # ikinci calistirmada degismeyen dosyalar atlanmali
+    # programs: {dosya adi: (kod, beklenen degiskenler)}
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src_dir = os.path.join(tmp, "src")
+        out_dir = os.path.join(tmp, "out")
+        os.makedirs(os.path.join(src_dir, "alt"))
+        for file_name, (code, _) in programs.items():
+            with open(os.path.join(src_dir, file_name), "w") as f:
+                f.write(code)
+        with open(os.path.join(src_dir, "alt", "hatali.src"), "w") as f:
+            f.write(bad_code)
+
+        results = batch_compile.compile_batch([src_dir], out_dir, workers)
+        statuses = {os.path.relpath(r['path'], src_dir): r['status'] for r in results}
+        expected = {file_name: batch_compile.STATUS_OK for file_name in programs}
+        expected[os.path.join("alt", "hatali.src")] = batch_compile.STATUS_ERROR
+        if statuses != expected:
+            print(f"[HATA] Derleme sonuclari beklenmiyordu: {statuses}")
+            print("="*50 + "\n")
+            return
+
+        for file_name, (_, expected_vars) in programs.items():
+            out_path = batch_compile.artifact_path(out_dir, file_name)
+            with bytecode_format.load(out_path) as module:
+                vm = VirtualMachine()
+                vm.run(module.instructions, module.global_names)
+            final_globals = vm.get_globals()
+            mismatches = {k: final_globals.get(k) for k, v in expected_vars.items() if final_globals.get(k) != v}
+            if mismatches:
+                print(f"[HATA] {file_name} degisken uyusmazligi: {mismatches}")
+                print("="*50 + "\n")
+                return
+
+        second = batch_compile.compile_batch([src_dir], out_dir, workers)
+        skipped = [r for r in second if r['status'] == batch_compile.STATUS_SKIP]
+        if len(skipped) != len(programs):
+            print(f"[HATA] Degismeyen dosyalar atlanmadi: {[r['status'] for r in second]}")
+            print("="*50 + "\n")
+            return
+
+        # Manifest anahtari worker'in derledigi kaynaktan gelmeli (ana process'in okudugundan degil)
+        file_name = next(iter(programs))
+        path = os.path.join(src_dir, file_name)
+        with open(path, "a") as f:
+            f.write("int eklenen = 1;\n")
+        with open(path) as f:
+            changed_key = compiler.cache_key(f.read(), DEFAULT_LEVEL)
+        status, _, _, key = batch_compile.compile_job((path, batch_compile.artifact_path(out_dir, file_name), DEFAULT_LEVEL))
+        third = batch_compile.compile_batch([src_dir], out_dir, workers)
+        manifest = batch_compile.load_manifest(out_dir)
+        if (status != batch_compile.STATUS_OK or key != changed_key or manifest.get(file_name) != changed_key
+                or sum(r['status'] == batch_compile.STATUS_OK for r in third) != 1):
+            print(f"[HATA] Manifest anahtari derlenen kaynakla uyusmuyor: {key} / {manifest.get(file_name)}")
+            print("="*50 + "\n")
+            return
+
+    print(f"[TAMAM] Test Gecti. {len(programs)} dosya derlendi, hatali dosya raporlandi, tekrar derlemede atlandi.")
+    print("="*50 + "\n")
+
+
+def run_cache_test(name, code, expected_vars):
+    # Ayni kaynak iki kez derlenir, ikincisi cache'ten gelmeli ve ayni sonucu vermeli
+    print(f"TEST: {name}")
+    print("-" * 50)
+
+    cache = CompileCache()
+    try:
+        first = compiler.compile(code, cache=cache)
+        second = compiler.compile(code, cache=cache)
+    except Exception as e:
+        print(f"[HATA] Derleme Hatasi: {e}")
+        print("="*50 + "\n")
+        return
+
+    stats = cache.stats()
+    if second is not first or stats['hits'] != 1 or stats['misses'] != 1:
+        print(f"[HATA] Cache beklendigi gibi calismadi: {stats}")
+        print("="*50 + "\n")
+        return
+
+    vm = VirtualMachine()
+    vm.run(second.instructions, second.global_names)
+    final_globals = vm.get_globals()
+    mismatches = {k: final_globals.get(k) for k, v in expected_vars.items() if final_globals.get(k) != v}
+    if mismatches:
+        print(f"[HATA] Degisken uyusmazligi: {mismatches}")
+    else:
+        print(f"[TAMAM] Test Gecti. Cache: {stats}")
+    print("="*50 + "\n")
+
 
 # ==========================================
-# TEST SUITE (15 Cases)
+# TEST SUITE
 # ==========================================
 
 if __name__ == "__main__":
-    print("15 TESTLIK SUITE BASLATILIYOR...\n")
+    print("TEST SUITE BASLATILIYOR...\n")
 
     # --- GRUP A: Temel Veri Tipleri & Matematik ---
     
@@ -233,4 +1142,250 @@ if __name__ == "__main__":
     int x = 10
     int y = 20;
     """
-    run_test("15. Syntax: Eksik Noktali Virgul", code_15, "syntax_error")
\ No newline at end of file
+    run_test("15. Syntax: Eksik Noktali Virgul", code_15, "syntax_error")
+
+
+    # --- GRUP E: Peephole Optimizasyonu ---
+
+    code_16 = """
+    int isaret(int n) {
+        if (n > 0) {
+            return 1;
+        } else {
+            return 0 - 1;
+        }
+    }
+    int toplam = 0;
+    int i = 10;
+    while (i > 0 - 10) {
+        toplam = toplam + isaret(i);
+        i = i - 1;
+    }
+    """
+    for level in (0, 1, 2):
+        run_test(f"16. Peephole Seviye {level}: Erken Return & Dongu", code_16, "valid",
+                 {"toplam": 0, "i": -10}, opt_level=level)
+
+    code_17 = """
+    int x = 3 * 4 + 5;       # 17, derleme zamaninda hesaplanir
+    int y = x * 2 - 4;       # x hic yeniden atanmadigi icin 30
+    float z = 7.0 / 2.0;     # 3.5
+    int bolum = 7 / 2;       # int / int katlanmaz, VM'deki sonuc korunur
+    int sayac = 0;
+    if (x > 10) {
+        sayac = sayac + 1;
+    } else {
+        sayac = sayac - 1;
+    }
+    while (false) {
+        sayac = 100;
+    }
+    for (int i = 0; false; i = i + 1) {
+        sayac = 200;
+    }
+    """
+    for level in (0, 2):
+        run_test(f"17. AST Sabit Katlama Seviye {level}", code_17, "valid",
+                 {"x": 17, "y": 30, "z": 3.5, "bolum": 3.5, "sayac": 1}, opt_level=level)
+
+    # --- GRUP F: Binary Bytecode Formati ---
+
+    code_18 = """
+    int fib(int n) {
+        if (n <= 1) { return n; }
+        return fib(n-1) + fib(n-2);
+    }
+    int res = fib(10);
+    float f = -2.5;
+    string s = "Merhaba Dunya";
+    bool b = !(res > 50);
+    int buyuk = 123456789012345678901234567890;
+    """
+    for level in (0, 2):
+        run_test(f"18. Binary Format Seviye {level}: Yaz, Oku ve Calistir", code_18, "valid",
+                 {"res": 55, "f": -2.5, "s": "Merhaba Dunya", "b": False,
+                  "buyuk": 123456789012345678901234567890}, opt_level=level, via_binary=True)
+
+    # --- GRUP G: Derleme Cache'i ---
+
+    run_cache_test("19. Derleme Cache'i (Ikinci Derleme Cache'ten)", code_7, {"fact": 120, "i": 0})
+
+    # --- GRUP H: Paralel Derleme ---
+
+    programs_20 = [(code_7, {"fact": 120, "i": 0}), (code_8, {"sum": 10}), (code_10, {"res": 8}),
+                   (code_17, {"x": 17, "sayac": 1}), (code_18, {"res": 55})] * 4
+    run_parallel_test("20. Thread Havuzunda Paralel Derleme", programs_20)
+
+    # --- GRUP I: Toplu Derleme ---
+
+    programs_21 = {"faktoriyel.src": (code_7, {"fact": 120, "i": 0}), "toplam.src": (code_8, {"sum": 10}),
+                   "fib.src": (code_10, {"res": 8})}
+    run_batch_test("21. Process Havuzunda Toplu Derleme", programs_21, code_12)
+
+    # --- GRUP J: Hizli Lexer ---
+
+    code_22 = 'string s = "a\\"b" ; # yorum\nfloat f = 1.5 + 2. + .5;\n$ x @ "acik string\nif(a<=b&&c!=d||!e){}'
+    sources_22 = [code_1, code_2, code_3, code_4, code_5, code_6, code_7, code_8, code_9, code_10,
+                  code_11, code_12, code_13, code_14, code_15, code_16, code_17, code_18, code_22, ""]
+    run_lexer_diff_test("22. Hizli Lexer PLY ile Ayni Token Akisi", sources_22)
+
+    # --- GRUP K: Akis (Streaming) Lexer ---
+
+    code_23 = code_18 + """
+    string uzun = "parca sinirini gecen \\"uzun\\" string; # yorum degil";
+    float kesir = 12345.678; # parca sinirinda kalabilecek yorum
+    string turkce = "gunaydin dunya ğüşiöç";
+    """
+    run_stream_test("23. Akis Modunda Parca Parca Lexleme ve Derleme", code_23,
+                    {"res": 55, "uzun": 'parca sinirini gecen \\"uzun\\" string; # yorum degil',
+                     "kesir": 12345.678, "turkce": "gunaydin dunya ğüşiöç"})
+
+    # --- GRUP L: Artimli Parse ---
+
+    edits_24 = [
+        ("return n;", "return n + 0;", 1),                 # fonksiyon govdesinde, sadece ic statement
+        ("int res = fib(10);", "int res = fib(11);", 1),   # ust seviye statement
+        ("float f = -2.5;", "float f = -2.5; int yeni = 3;", 2),  # statement ekleme
+        ("if (n <= 1) { return n + 0; }", "if (n <= 1) { return n + 0; } else { n = n; }", 2),
+        ("bool b = !(res > 50);", "", 1),                  # statement silme
+    ]
+    run_incremental_test("24. Artimli Parse: Degisiklikten Sonra Ayni AST", code_18, edits_24)
+
+    # --- GRUP M: Artimli Semantic Analiz ---
+
+    code_25 = """
+    int limit = 10;
+    int kare(int n) {
+        return n * n;
+    }
+    int topla(int n) {
+        int toplam = 0;
+        int i;
+        for (i = 0; i < n; i = i + 1) { toplam = toplam + kare(i); }
+        return toplam;
+    }
+    int baska(int n) {
+        return n + 1;
+    }
+    int sonuc = topla(limit);
+    """
+    edits_25 = [
+        ("return n + 1;", "return n + true;", 1),       # govde hatasi, sadece baska
+        ("int kare(int n)", "int kare(float n)", 2),    # imza degisikligi, kare ve topla
+        ("int kare(float n)", "int kare(int n)", 2),    # geri alma, hata kalkar
+        ("int limit = 10;", "", 2),                     # silinen bildirim, yeniden parse edilen kare ve sonuc
+        ("int sonuc", "int limit = 5;\n    int sonuc", 2),  # yeni bildirim, sonuc tekrar gecerli
+    ]
+    run_incremental_analysis_test("25. Artimli Analiz: Sadece Degisen Fonksiyonlar ve Bagimlilari", code_25, edits_25)
+
+    # --- GRUP N: Hatalarin Toplanmasi (Diagnostics) ---
+
+    code_26 = """
+    int x = "metin";
+    int x = 5;
+    y = 3;
+    int kare(int n) { return n * n; }
+    int a = kare(1, 2);
+    int b = kare(true);
+    if (x) { x = x + 1; }
+    bool c = !x;
+    int d = tanimsiz + 1;
+    """
+    run_diagnostics_test("26. Diagnostics: Butun Hatalar Tek Geciste, Sessiz Mod", code_26,
+                         ["E009", "E001", "E003", "E006", "E007", "E008", "E014", "E003"])
+
+    # --- GRUP O: Satir Tablosu ---
+    code_27 = """
+    int bol(int a, int b) {
+        int q = a / b;
+        return q;
+    }
+    int x = 10;
+    int y = bol(x, 2);
+    int z = bol(x, y - 5);
+    """
+    run_line_table_test("27. Satir Tablosu: Calisma Zamani Hatasinin Kaynak Satiri", code_27, 3)
+
+    # --- GRUP P: AST Gosterimi ve Gezinti ---
+    run_arena_test("28. Slot'lu AST Node'lari ve Arena Gosterimi", code_18)
+
+    run_visitor_test("29. Visitor: Sinif Basina Dispatch Tablosu ve Ozyinelemesiz Gezinti", code_18, 5000)
+
+    run_deep_expression_test("30. Stres: 100k Seviyelik Ifadeler (Ozyinelemesiz Analiz ve Kod Uretimi)", 100_000)
+
+    # --- GRUP Q: Register VM ---
+    # Global seviyede degiskeni okuyan ifadenin devaminda degiskeni degistiren bir cagri var
+    code_31 = """
+    int g = 1;
+    int arttir() {
+        g = g + 10;
+        return g;
+    }
+    int a = g + arttir();      # 1 + 11
+    int b = arttir() + g;      # 21 + 21
+    int c = g * (g + arttir()); # 21 * (21 + 31)
+    int d = 0;
+    if (g < arttir()) { d = g; }
+    """
+    programs_31 = [(code_1, {"x": 20, "y": 30}), (code_3, {"c": False, "d": True, "e": False}),
+                   (code_7, {"fact": 120, "i": 0}), (code_8, {"sum": 10}), (code_11, {"x": 10}),
+                   (code_16, {"toplam": 0, "i": -10}), (code_17, {"x": 17, "y": 30, "bolum": 3.5, "sayac": 1}),
+                   (code_18, {"res": 55, "f": -2.5, "b": False}),
+                   (code_31, {"g": 41, "a": 12, "b": 42, "c": 1092, "d": 41})]
+    run_register_test("31. Register VM: Stack VM ile Ayni Sonuclar, Daha Az Instruction", programs_31, code_27, 3)
+
+    # --- GRUP R: Closure Derleyici VM ---
+    # Ayni senaryolar bytecode'u temel blok closure'larina derleyen ClosureVM ile
+
+    closure_cases = [("1", code_1, {"x": 20, "y": 30}), ("3", code_3, {"c": False, "d": True, "e": False}),
+                     ("4", code_4, {"b": -10, "c": 5}), ("6", code_6, {"y": 1}),
+                     ("7", code_7, {"fact": 120, "i": 0}), ("8", code_8, {"sum": 10}),
+                     ("10", code_10, {"res": 8}), ("11", code_11, {"x": 10}),
+                     ("16", code_16, {"toplam": 0, "i": -10}),
+                     ("17", code_17, {"x": 17, "y": 30, "z": 3.5, "bolum": 3.5, "sayac": 1}),
+                     ("31", code_31, {"g": 41, "a": 12, "b": 42, "c": 1092, "d": 41})]
+    closure_number = 0
+    for level in (0, 2):
+        for label, code, expected in closure_cases:
+            closure_number += 1
+            run_test(f"32.{closure_number}. Closure VM Seviye {level}: Senaryo {label}", code, "valid", expected,
+                     opt_level=level, vm_class=ClosureVM)
+    run_test(f"32.{closure_number + 1}. Closure VM: Binary Formattan Yuklenen Bytecode", code_18, "valid",
+             {"res": 55, "f": -2.5, "s": "Merhaba Dunya", "b": False}, via_binary=True, vm_class=ClosureVM)
+    run_line_table_test(f"32.{closure_number + 2}. Closure VM: Calisma Zamani Hatasinin Kaynak Satiri", code_27, 3,
+                        vm_class=ClosureVM)
+
+    # --- GRUP S: Sessiz VM ve Kaynak Limitleri ---
+    run_quiet_test("33. Sessiz VM: Konsol Ciktisi Yok, PRINT Hedefe, Sonuc Nesnesi", code_16, {"toplam": 0, "i": -10})
+
+    run_limits_test("34. Kaynak Limitleri ve Zaman Dilimli Calistirma", code_16, {"toplam": 0, "i": -10})
+
+    # --- GRUP T: Es Zamanli ve Paralel Calistirma ---
+    run_scheduler_test("35. Asyncio Zamanlayici: Es Zamanli Programlar, Async Host Cagrilari", code_16,
+                       {"toplam": 0, "i": -10})
+
+    code_36 = """
+    int fib(int k) {
+        if (k <= 1) { return k; }
+        return fib(k-1) + fib(k-2);
+    }
+    int res = fib(n);
+    """
+    run_worker_pool_test("36. Process Havuzu: Girdilerle Paralel Calistirma", code_36,
+                         [{"n": n} for n in range(6, 16)], "res")
+
+    # --- GRUP U: Fonksiyon Nesneleri ve Cagri Frame'leri ---
+    code_37 = """
+    int fib(int n) {
+        if (n <= 1) { return n; }
+        return fib(n-1) + fib(n-2);
+    }
+    int uc(int a, int b, int c) {
+        int t = a * 100 + b * 10;
+        return t + c;
+    }
+    int res = fib(15);
+    int u = uc(1, 2, 3);
+    """
+    run_call_frame_test("37. Fonksiyon Nesneleri, CALL argc ve Frame Havuzu", code_37, "fib", 1,
+                        {"res": 610, "u": 123}, 16)
@@ -1,158 +1,519 @@
+import operator
+import sys
+import time
+
+from opcodes import Opcode, Function
+from line_table import line_for
+from execution import (ExecutionResult, ExecutionState, HostFunction, default_output, UNLIMITED,
+                       CHECK_INTERVAL, LimitExceeded)
+
+# COMPARE instruction'inin arg'ina gore kullanilan operator fonksiyonlari
+# (&& ve || icin iki taraf da zaten hesaplanmis oldugundan kisa devre yok)
+COMPARE_OPS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '&&': lambda a, b: a and b,
+    '||': lambda a, b: a or b,
+}
+
+# Cagrilar ve frame'ler
+#
+# Fonksiyonlar derleme zamaninda olusan opcodes.Function nesneleridir. CALL argc stack'ten fonksiyonu
+# alir, n_locals boyutunda bir frame acip argumanlari ilk argc slota yazar ve giris adresine atlar.
+# RETURN'de kapanan frame boyutuna gore bir havuza (frame_pool) konur, ayni boyuttaki sonraki cagri yeni
+# liste olusturmadan onu kullanir. Eski degerler silinmez: her yerel degisken okunmadan once bildirimiyle
+# yazildigi icin gorunmezler.
+
+# Kaynak limitleri ve zaman dilimleri (execution.py)
+#
+# limits verilirse geri jump'larda ve cagrilarda kontrol edilir, asilirsa LimitExceeded firlatilir.
+# Program start() ile yuklenip resume(max_steps) ile parca parca calistirilabilir: en az max_steps instruction
+# calistiktan sonraki ilk geri jump veya cagrida VM durur (suspend), bir sonraki resume() kaldigi yerden
+# devam eder. Boylece bir zamanlayici ayni worker'da bircok programi sirayla calistirabilir.
+# run() = start() + resume() (tek seferde sonuna kadar).
+#
+# host_functions (execution.HostFunction) programa Compiler(host_functions=...) ile verilen fonksiyonlarin
+# gercekleridir, start() bunlari ayni isimli global slotlara koyar ve CALL slotta adres yerine bir host
+# fonksiyonu bulursa onu argumanlariyla cagirir. Async host fonksiyonlarinda VM cagridan sonra durur,
+# pending_call'daki awaitable beklenir ve sonucu complete_call(value) ile verilince resume() devam eder.
+
 class VirtualMachine:
-    def __init__(self):
+    def __init__(self, quiet=False, output=None, limits=None, host_functions=()):
+        # quiet: konsola hicbir sey yazilmaz (baslik, son global hafiza), run() sonucu ExecutionResult ile alinir
+        # output: PRINT ciktisinin hedefi (execution.py), verilmezse sessiz modda BufferedOutput, degilse ConsoleOutput
+        self.quiet = quiet
+        self.output = output if output is not None else default_output(quiet)
+        self.limits = limits if limits is not None else UNLIMITED
+        self.host_functions = {host.name: host for host in host_functions}
         self.stack = []      
-        # self.variables yerine self.frames kullaniliyor
-        # frames[0] Global Kapsamdir (Scope). frames[-1] Mevcut Fonksiyon Kapsamidir.
-        self.frames = [{}] 
+        # Degiskenler isimle degil, derleme zamaninda cozulen slot indeksleriyle tutulur
+        # globals: global slot dizisi, frames: her fonksiyon cagrisinin sabit boyutlu yerel slot dizisi
+        self.globals = []
+        self.global_names = []
+        self.frames = []
         self.return_stack = [] 
+        # Ana programin return degeri (ana programda return yoksa None)
+        self.return_value = None
+        self.instruction_count = 0
+        # start() ile yuklenen program: predecode edilmis kod, satir tablosu ve kalinan pc
+        self.code = None
+        self.line_table = None
+        self.pc = 0
+        self.suspended = False
+        self.finished = False
+        # Boyutlarina gore bos frame'ler (predecode), program bittiginde olusturulan butun frame'ler burada
+        self.frame_pool = []
+        # Async host cagrisinin beklenen sonucu (coroutine), complete_call() ile tamamlanir
+        self.pending_call = None
+
+    def get_globals(self):
+        # Global slotlari isimleriyle dondurur (blok icindeki gizli slotlar haric)
+        return {name: val for name, val in zip(self.global_names, self.globals) if name is not None}
+
+    def predecode(self, instructions):
+        # Her instruction bir kere, arg'i ve sonraki pc'si baglanmis (bound) argumansiz
+        # bir closure'a cevrilir. Dispatch tablosu Opcode degerine gore bu closure'lari ureten
+        # fabrika fonksiyonlarini tutar, run() dongusu sadece pc = code[pc]() yapar.
+        stack = self.stack
+        push = stack.append
+        pop = stack.pop
+        globals_ = self.globals
+        frames = self.frames
+        return_stack = self.return_stack
+        write = self.output.write
+        end_pc = len(instructions)
+
+        # Limitler: yoksa hic ulasilamayacak degerler, boylece kontrol sadece bir karsilastirma
+        limits = self.limits
+        max_instructions = sys.maxsize if limits.max_instructions is None else limits.max_instructions
+        max_call_depth = sys.maxsize if limits.max_call_depth is None else limits.max_call_depth
+        max_stack = sys.maxsize if limits.max_stack is None else limits.max_stack
+        deadline = None if limits.timeout is None else time.monotonic() + limits.timeout
+        # Zaman diliminin bittigi instruction sayisi (resume) ve bir sonraki yavas kontrolun yapilacagi sayi
+        slice_end = sys.maxsize
+        checkpoint = 0
+
+        # Boyutlarina gore bos frame havuzlari (frame_pool[n_locals]), program en buyuk frame'e gore
+        max_locals = max((arg.n_locals for opcode, arg in instructions if opcode == Opcode.LOAD_FUNC), default=0)
+        frame_pool = [[] for _ in range(max_locals + 1)]
+        self.frame_pool = frame_pool
+
+        # Calisan instruction sayisi her adimda degil, sirali akis bozuldugunda
+        # (jump, call, return, halt) biten blogun uzunlugu eklenerek hesaplanir
+        count = 0
+        block_start = 0
+
+        def load_const(arg, idx):
+            nxt = idx + 1
+            def handler():
+                push(arg)
+                return nxt
+            return handler
+
+        def load_fast(arg, idx):
+            # Mevcut fonksiyonun yerel slotu, scope zinciri aranmiyor
+            nxt = idx + 1
+            def handler():
+                push(frames[-1][arg])
+                return nxt
+            return handler
+
+        def store_fast(arg, idx):
+            nxt = idx + 1
+            def handler():
+                if not stack: raise Exception("Stack Underflow")
+                frames[-1][arg] = pop()
+                return nxt
+            return handler
+
+        def load_global(arg, idx):
+            nxt = idx + 1
+            def handler():
+                push(globals_[arg])
+                return nxt
+            return handler
+
+        def store_global(arg, idx):
+            nxt = idx + 1
+            def handler():
+                if not stack: raise Exception("Stack Underflow")
+                globals_[arg] = pop()
+                return nxt
+            return handler
+
+        def binary(func):
+            def factory(arg, idx):
+                nxt = idx + 1
+                def handler():
+                    b = pop(); a = pop()
+                    push(func(a, b))
+                    return nxt
+                return handler
+            return factory
+
+        def compare(arg, idx):
+            # Karsilastirma operatoru de decode sirasinda cozuluyor
+            return binary(COMPARE_OPS[arg])(arg, idx)
+
+        def negate(arg, idx):
+            nxt = idx + 1
+            def handler():
+                push(-pop())
+                return nxt
+            return handler
+
+        def not_(arg, idx):
+            nxt = idx + 1
+            def handler():
+                push(not pop())
+                return nxt
+            return handler
+
+        def check(target):
+            # Geri jump ve cagrilarda sayac checkpoint'e ulastiginda: limitler, sure ve zaman dilimi
+            nonlocal checkpoint
+            if count >= max_instructions:
+                raise LimitExceeded('max_instructions', f"HATA: Instruction limiti asildi ({max_instructions})")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LimitExceeded('timeout', f"HATA: Sure limiti asildi ({limits.timeout} s)")
+            if len(stack) > max_stack:
+                raise LimitExceeded('max_stack', f"HATA: Stack limiti asildi ({max_stack})")
+            if count >= slice_end:
+                # Zaman dilimi bitti, sonraki resume() target'tan devam eder
+                self.pc = target
+                self.suspended = True
+                return end_pc
+            checkpoint = min(count + CHECK_INTERVAL, max_instructions, slice_end)
+            return target
+
+        def set_slice(max_steps):
+            # resume(): bu dilimde en az max_steps instruction calistir (None: sinirsiz)
+            nonlocal slice_end, checkpoint
+            slice_end = sys.maxsize if max_steps is None else count + max_steps
+            checkpoint = min(count + CHECK_INTERVAL, max_instructions, slice_end)
+
+        def jump_if_false(arg, idx):
+            nxt = idx + 1
+            if arg <= idx:
+                # Geri jump (dongu), limit kontrolu yapilir
+                def handler():
+                    nonlocal count, block_start
+                    if pop():
+                        return nxt
+                    count += nxt - block_start
+                    block_start = arg
+                    if count >= checkpoint:
+                        return check(arg)
+                    return arg
+                return handler
+            def handler():
+                nonlocal count, block_start
+                if pop():
+                    return nxt
+                count += nxt - block_start
+                block_start = arg
+                return arg
+            return handler
+
+        def jump_absolute(arg, idx):
+            nxt = idx + 1
+            if arg <= idx:
+                def handler():
+                    nonlocal count, block_start
+                    count += nxt - block_start
+                    block_start = arg
+                    if count >= checkpoint:
+                        return check(arg)
+                    return arg
+                return handler
+            def handler():
+                nonlocal count, block_start
+                count += nxt - block_start
+                block_start = arg
+                return arg
+            return handler
+
+        def host_call(host, argc, nxt):
+            # Host fonksiyonu: argumanlar stack'ten alinir, frame acilmaz. Blok CALL'da biter.
+            nonlocal count, block_start
+            if not isinstance(host, HostFunction):
+                raise Exception("HATA: Cagrilan deger bir fonksiyon degil.")
+            args = stack[len(stack) - argc:]
+            del stack[len(stack) - argc:]
+            count += nxt - block_start
+            block_start = nxt
+            result = host.func(*args)
+            if host.is_async:
+                # Sonuc gelene kadar VM durur, complete_call() degeri stack'e koyar
+                self.pending_call = result
+                self.pc = nxt
+                self.suspended = True
+                return end_pc
+            push(result)
+            return nxt
+
+        def call(argc, idx):
+            nxt = idx + 1
+            def handler():
+                nonlocal count, block_start
+                func = pop()
+                if type(func) is not Function:
+                    return host_call(func, argc, nxt)
+                if func.arity != argc:
+                    raise Exception(f"HATA: '{func.name}' fonksiyonu {func.arity} parametre bekliyor, {argc} verildi.")
+                if len(return_stack) >= max_call_depth:
+                    raise LimitExceeded('max_call_depth', f"HATA: Cagri derinligi limiti asildi ({max_call_depth})")
+                if len(stack) > max_stack:
+                    raise LimitExceeded('max_stack', f"HATA: Stack limiti asildi ({max_stack})")
+                free = frame_pool[func.n_locals]
+                frame = free.pop() if free else [None] * func.n_locals
+                # Argumanlar parametre slotlarina (ilk arguman en altta)
+                if argc == 1:
+                    frame[0] = pop()
+                elif argc:
+                    frame[:argc] = stack[-argc:]
+                    del stack[-argc:]
+                frames.append(frame)
+                return_stack.append(nxt)
+                target = func.entry
+                count += nxt - block_start
+                block_start = target
+                if count >= checkpoint:
+                    return check(target)
+                return target
+            return handler
+
+        def return_(arg, idx):
+            nxt = idx + 1
+            def handler():
+                nonlocal count, block_start
+                count += nxt - block_start
+                if not return_stack:
+                    block_start = end_pc
+                    self.return_value = stack[-1]
+                    return end_pc # Ana program bitti
+                # Fonksiyonun frame'i havuza geri doner
+                frame = frames.pop()
+                frame_pool[len(frame)].append(frame)
+                block_start = return_stack.pop()
+                return block_start
+            return handler
+
+        def print_(arg, idx):
+            nxt = idx + 1
+            def handler():
+                write(pop())
+                return nxt
+            return handler
+
+        def inc_fast(arg, idx):
+            # x = x + c superinstruction'i
+            nxt = idx + 1
+            slot, delta = arg
+            def handler():
+                frames[-1][slot] += delta
+                return nxt
+            return handler
+
+        def inc_global(arg, idx):
+            nxt = idx + 1
+            slot, delta = arg
+            def handler():
+                globals_[slot] += delta
+                return nxt
+            return handler
+
+        def compare_jump_if_false(arg, idx):
+            # COMPARE op; JUMP_IF_FALSE hedef superinstruction'i
+            nxt = idx + 1
+            cmp_op, target = arg
+            func = COMPARE_OPS[cmp_op]
+            if target <= idx:
+                def handler():
+                    nonlocal count, block_start
+                    b = pop(); a = pop()
+                    if func(a, b):
+                        return nxt
+                    count += nxt - block_start
+                    block_start = target
+                    if count >= checkpoint:
+                        return check(target)
+                    return target
+                return handler
+            def handler():
+                nonlocal count, block_start
+                b = pop(); a = pop()
+                if func(a, b):
+                    return nxt
+                count += nxt - block_start
+                block_start = target
+                return target
+            return handler
+
+        def halt(arg, idx):
+            nxt = idx + 1
+            def handler():
+                nonlocal count, block_start
+                count += nxt - block_start
+                block_start = end_pc
+                return end_pc
+            return handler
+
+        dispatch = {
+            Opcode.LOAD_CONST: load_const,
+            Opcode.LOAD_FAST: load_fast,
+            Opcode.STORE_FAST: store_fast,
+            Opcode.LOAD_GLOBAL: load_global,
+            Opcode.STORE_GLOBAL: store_global,
+            Opcode.ADD: binary(operator.add),
+            Opcode.SUB: binary(operator.sub),
+            Opcode.MUL: binary(operator.mul),
+            Opcode.DIV: binary(operator.truediv),
+            Opcode.MOD: binary(operator.mod),
+            Opcode.COMPARE: compare,
+            Opcode.NEGATE: negate,
+            Opcode.NOT: not_,
+            Opcode.JUMP_IF_FALSE: jump_if_false,
+            Opcode.JUMP_ABSOLUTE: jump_absolute,
+            Opcode.CALL: call,
+            Opcode.RETURN: return_,
+            Opcode.PRINT: print_,
+            Opcode.HALT: halt,
+            Opcode.LOAD_FUNC: load_const,
+            Opcode.INC_FAST: inc_fast,
+            Opcode.INC_GLOBAL: inc_global,
+            Opcode.COMPARE_JUMP_IF_FALSE: compare_jump_if_false,
+        }
+        # Opcode degeri listede indeks olarak kullaniliyor
+        table = [dispatch[op] for op in Opcode]
+        code = [table[opcode](arg, idx) for idx, (opcode, arg) in enumerate(instructions)]
+
+        def executed_count(finished=True):
+            # Son instruction'dan tasarak biten programda kalan blogu da ekle
+            # (durdurulan programda sayac zaten bir blok sinirinda, block_start kalinan pc)
+            if not finished:
+                return count
+            return count + max(end_pc - block_start, 0)
+
+        def set_position(pc, executed):
+            # restore_state(): sayaci kaydedilen duruma geri al
+            nonlocal count, block_start
+            count = executed
+            block_start = pc
+
+        return code, executed_count, set_slice, set_position
+
+    def start(self, instructions, global_names=(), line_table=None, inputs=None):
+        # Programi yukler, calistirmaz (resume ile calisir). Sure limiti buradan itibaren sayilir.
+        # line_table: verilirse calisma zamani hatalari kaynak satiriyla bildirilir (line_table.py)
+        # inputs: Compiler(inputs=...) ile derlenen programin girdi degiskenlerinin degerleri {isim: deger}
+        self.global_names = list(global_names)
+        self.globals[:] = [None] * len(self.global_names)
+        self.stack.clear()
+        self.frames.clear()
+        self.return_stack.clear()
+        self.return_value = None
+        # Host fonksiyonlari ayni isimli global slotlara
+        for slot, name in enumerate(self.global_names):
+            if name in self.host_functions:
+                self.globals[slot] = self.host_functions[name]
+        if inputs:
+            slots = {name: slot for slot, name in enumerate(self.global_names) if name is not None}
+            for name, value in inputs.items():
+                if name not in slots:
+                    raise Exception(f"HATA: Programda '{name}' adinda bir girdi yok.")
+                self.globals[slots[name]] = value
+        self.code, self.executed_count, self.set_slice, self.set_position = self.predecode(instructions)
+        self.line_table = line_table
+        self.pc = 0
+        self.instruction_count = 0
+        self.suspended = False
+        self.finished = False
+        self.pending_call = None
+
+    def complete_call(self, value):
+        # Bekleyen async host cagrisinin sonucunu stack'e koyar, sonraki resume() devam eder
+        if self.pending_call is None:
+            raise Exception("HATA: Bekleyen host cagrisi yok.")
+        self.pending_call = None
+        self.stack.append(value)
+
+    def save_state(self):
+        # Durdurulmus (veya hic baslamamis) programin durumunun kopyasi
+        if self.code is None:
+            raise Exception("HATA: Yuklu program yok, once start() cagrilmali.")
+        if self.pending_call is not None:
+            raise Exception("HATA: Bekleyen host cagrisi varken durum kaydedilemez.")
+        return ExecutionState(self.pc, list(self.stack), [list(frame) for frame in self.frames],
+                              list(self.return_stack), list(self.globals), self.instruction_count)
+
+    def restore_state(self, state):
+        # Ayni program yukluyken kaydedilen duruma doner, sonraki resume() state.pc'den devam eder
+        if self.code is None or len(state.globals) != len(self.globals):
+            raise Exception("HATA: Durum yuklu programa ait degil.")
+        self.stack[:] = state.stack
+        self.frames[:] = [list(frame) for frame in state.frames]
+        self.return_stack[:] = state.return_stack
+        self.globals[:] = state.globals
+        self.pc = state.pc
+        self.instruction_count = state.instruction_count
+        self.set_position(state.pc, state.instruction_count)
+        self.pending_call = None
+        self.suspended = False
+        self.finished = False
+
+    def resume(self, max_steps=None):
+        # Programi kaldigi yerden calistirir. Program biterse ExecutionResult, max_steps instruction'lik
+        # zaman dilimi bittiyse None dondurur (self.suspended).
+        if self.code is None or self.finished:
+            raise Exception("HATA: Calistirilacak program yok, once start() cagrilmali.")
+        if self.pending_call is not None:
+            raise Exception("HATA: Bekleyen host cagrisi var, once complete_call() cagrilmali.")
+        code = self.code
+        end_pc = len(code)
+        pc = self.pc
+        self.suspended = False
+        self.set_slice(max_steps)
+
+        # try blogu dongude ek maliyet getirmez, tabloya sadece hata olunca bakilir
+        try:
+            while pc < end_pc:
+                # Ozyinelemeyi (recursion) hata ayiklamak (debug) icin yorumu kaldirin
+                # print(f"PC:{pc} | Stack:{self.stack} | TopFrame:{self.frames[-1] if self.frames else None}")
+                pc = code[pc]()
+        except LimitExceeded:
+            self.pc = pc
+            self.finished = True
+            self.instruction_count = self.executed_count()
+            raise
+        except Exception as e:
+            self.finished = True
+            line = line_for(self.line_table, pc) if self.line_table else None
+            if line is None:
+                raise
+            raise Exception(f"Calisma zamani hatasi (satir {line}): {e}") from e
+
+        if self.suspended:
+            self.instruction_count = self.executed_count(False)
+            return None
+        self.instruction_count = self.executed_count()
+        self.finished = True
+        return ExecutionResult(self.get_globals(), self.return_value, self.instruction_count, self.output)
 
-    def run(self, instructions):
-        print("--- VM Calisiyor ---")
-        pc = 0 
-
-        while pc < len(instructions):
-            opcode, arg = instructions[pc]
-            
-            # Ozyinelemeyi (recursion) hata ayiklamak (debug) icin yorumu kaldirin
-            # print(f"PC:{pc} | Op:{opcode} | Stack:{self.stack} | TopFrame:{self.frames[-1]}")
-
-            if opcode == 'LOAD_CONST':
-                self.stack.append(arg)
-            
-            elif opcode == 'LOAD_VAR':
-                found = False
-                # En Ustten (Yerel) en Alta (Global) dogru ara
-                for frame in reversed(self.frames):
-                    if arg in frame:
-                        self.stack.append(frame[arg])
-                        found = True
-                        break
-                if not found:
-                    raise Exception(f"Runtime Error: '{arg}' tanimli degil.")
-
-            elif opcode == 'STORE_VAR':
-                if not self.stack: raise Exception("Stack Underflow")
-                val = self.stack.pop()
-                found = False
-                
-                # Guncellemek icin mevcut degiskeni ara
-                for frame in reversed(self.frames):
-                    if arg in frame:
-                        frame[arg] = val
-                        found = True
-                        # print(f" > Updated {arg} = {val}") # Debug
-                        break
-                
-                # Bulunamazsa, MEVCUT kapsamda olustur (veya hata firlat)
-                # Kati derleyicilerde bu bir hata olmali (DEF_VAR kullanilmali), 
-                # ancak bu odev icin ust cercevede olusturmayi varsayilan olarak kabul edebiliriz.
-                if not found:
-                      self.frames[-1][arg] = val
-                      # print(f" > Created {arg} = {val}") # Debug
-
-            elif opcode == 'ADD':
-                b = self.stack.pop(); a = self.stack.pop()
-                self.stack.append(a + b)
-            elif opcode == 'SUB':
-                b = self.stack.pop(); a = self.stack.pop()
-                self.stack.append(a - b)
-            elif opcode == 'MUL':
-                b = self.stack.pop(); a = self.stack.pop()
-                self.stack.append(a * b)
-            elif opcode == 'DIV':
-                b = self.stack.pop(); a = self.stack.pop()
-                self.stack.append(a / b)
-            
-            elif opcode == 'COMPARE':
-                b = self.stack.pop(); a = self.stack.pop()
-                if arg == '==': self.stack.append(a == b)
-                elif arg == '!=': self.stack.append(a != b)
-                elif arg == '<': self.stack.append(a < b)
-                elif arg == '>': self.stack.append(a > b)
-                elif arg == '<=': self.stack.append(a <= b)
-                elif arg == '>=': self.stack.append(a >= b)
-                elif arg == '&&': self.stack.append(a and b)
-                elif arg == '||': self.stack.append(a or b)
-            
-            elif opcode == 'JUMP_IF_FALSE':
-                val = self.stack.pop()
-                if not val:
-                    pc = arg
-                    continue 
-
-            elif opcode == 'JUMP_ABSOLUTE':
-                pc = arg
-                continue
-
-            elif opcode == 'CALL':
-                target_addr = self.stack.pop()
-                self.return_stack.append(pc)
-                
-                # Fonksiyonun yerel degiskenleri icin yeni bos bir cerceve (frame) ekle
-                self.frames.append({}) 
-                
-                pc = target_addr
-                continue
-
-            elif opcode == 'RETURN':
-                if not self.return_stack:
-                    break # Ana program bitti
-                
-                return_addr = self.return_stack.pop()
-                
-                # Fonksiyonun yerel kapsamini yok et
-                self.frames.pop()
-
-                pc = return_addr
-
-            elif opcode == 'ENTER_SCOPE':
-                self.frames.append({}) # Yeni bos kapsam ekle
-
-            elif opcode == 'EXIT_SCOPE':
-                self.frames.pop()      # Mevcut kapsami yok et
-
-            elif opcode == 'DEF_VAR':
-                # HER ZAMAN mevcut (ust) cercevede olustur.
-                # Ust cerceveleri kontrol etme. Bu golgeleme (shadowing) yapar veya baslatir.
-                if not self.stack: raise Exception("Stack Underflow")
-                val = self.stack.pop()
-                self.frames[-1][arg] = val
-                print(f" > Defined {arg} = {val}")
-
-            elif opcode == 'STORE_VAR':
-                # Sadece zincirde zaten varsa guncelle.
-                if not self.stack: raise Exception("Stack Underflow")
-                val = self.stack.pop()
-                found = False
-                
-                # En Ustten (Yerel) en Alta (Global) dogru ara
-                for frame in reversed(self.frames):
-                    if arg in frame:
-                        frame[arg] = val
-                        found = True
-                        print(f" > Updated {arg} = {val}")
-                        break
-                
-                if not found:
-                    raise Exception(f"Runtime Error: Variable '{arg}' not declared (Use 'int {arg}').")
-
-            elif opcode == 'HALT':
-                break
-
-            elif opcode == 'PRINT':
-                val = self.stack.pop()
-                print(f"[OUTPUT] {val}")
-            
-            elif opcode == 'NEGATE':
-                val = self.stack.pop()
-                self.stack.append(-val)
-                
-            elif opcode == 'NOT':
-                val = self.stack.pop()
-                self.stack.append(not val)
-
-            pc += 1 
-
-        print("--- VM Bitti ---")
-        # Sadece global hafizayi yazdir
-        print("Final Global Memory:", self.frames[0])
\ No newline at end of file
+    def run(self, instructions, global_names=(), line_table=None, inputs=None):
+        # line_table: verilirse calisma zamani hatalari kaynak satiriyla bildirilir (line_table.py)
+        if not self.quiet:
+            print("--- VM Calisiyor ---")
+        self.start(instructions, global_names, line_table, inputs)
+        result = self.resume()
+        if result is None:
+            raise Exception("HATA: Async host fonksiyonu cagrildi, program scheduler.VMScheduler ile calistirilmali.")
+        if not self.quiet:
+            print("--- VM Bitti ---")
+            # Sadece global hafizayi yazdir
+            print("Final Global Memory:", result.globals)
+        return result
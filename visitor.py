@@ -0,0 +1,154 @@
+from ast_structure import AST, iter_child_nodes
+
+# Ortak Visitor Tabani
+#
+# visit(node) her node icin f'visit_{sinif adi}' string'i olusturup getattr yapmak yerine sinif basina bir
+# dispatch tablosu (node sinifi -> metod) kullanir. Tablo her visitor sinifi icin ayri tutulur ve bir node
+# sinifi ilk goruldugunde doldurulur, alt siniflar kendi metodlariyla kendi tablolarini olusturur.
+# Metod sinif uzerinden bulunur: instance'a sonradan eklenen visit_ metodlari kullanilmaz.
+#
+# traverse(node) ozyinelemesiz (explicit stack) gezintidir, derin agaclarda Python stack'i buyumez:
+#   enter_<Sinif>(node): alt node'lardan once, False donerse alt node'lara girilmez
+#   leave_<Sinif>(node): alt node'lardan sonra
+# Tanimli olmayan enter_/leave_ metodlari atlanir, alt node'lar fields sirasiyla gezilir.
+#
+# evaluate(node) ozyinelemesiz deger hesaplamadir (ornek: bir ifadenin tipi veya katlanmis hali). Cok derin
+# ifadeler (a + b + c + ... gibi binlerce seviyelik BinaryOp zincirleri) Python'un ozyineleme limitine
+# takilmadan, node sayisiyla dogrusal surede islenir:
+#   post_<Sinif>(node, values): alt node'larin degerleri (fields sirasiyla) hesaplandiktan sonra node'un degeri
+#   pre_<Sinif>(node): opsiyonel, None disinda bir deger donerse node'un degeri odur ve alt node'lara girilmez
+# post_ metodu olmayan node'larin degeri visit(node) ile hesaplanir (ornek: Literal, Tanimlayici).
+
+class DispatchTable(dict):
+    # node sinifi -> visitor metodu (fonksiyon), eksik siniflar ilk erisimde bulunur
+    def __init__(self, visitor_class, prefix, default):
+        super().__init__()
+        self.visitor_class = visitor_class
+        self.prefix = prefix
+        self.default = default
+
+    def __missing__(self, node_class):
+        method = getattr(self.visitor_class, self.prefix + node_class.__name__, None)
+        if method is None:
+            method = self.default(self.visitor_class) if self.default is not None else None
+        self[node_class] = method
+        return method
+
+class NodeVisitor:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_table = DispatchTable(cls, 'visit_', lambda visitor_class: visitor_class.generic_visit)
+        cls.enter_table = DispatchTable(cls, 'enter_', None)
+        cls.leave_table = DispatchTable(cls, 'leave_', None)
+        cls.pre_table = DispatchTable(cls, 'pre_', None)
+        cls.post_table = DispatchTable(cls, 'post_', None)
+
+    def visit(self, node):
+        return self.visit_table[type(node)](self, node)
+
+    # visit_ metodu olmayan node'lar icin: alt node'lari ziyaret eder
+    def generic_visit(self, node):
+        for child in iter_child_nodes(node):
+            self.visit(child)
+
+    def traverse(self, root):
+        enter_table = self.enter_table
+        leave_table = self.leave_table
+        # Stack'te ziyaret edilecek node'lar ve (leave metodu, node) ciftleri.
+        # Alt node'lar ters sirayla eklenir, boylece fields sirasiyla cikarlar.
+        stack = [root]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node = pop()
+            node_class = type(node)
+            if node_class is tuple:
+                node[0](self, node[1])
+                continue
+            enter = enter_table[node_class]
+            if enter is not None and enter(self, node) is False:
+                continue
+            leave = leave_table[node_class]
+            if leave is not None:
+                push((leave, node))
+            for name in reversed(node.fields):
+                value = getattr(node, name)
+                if isinstance(value, AST):
+                    push(value)
+                elif type(value) is list:
+                    for item in reversed(value):
+                        if isinstance(item, AST):
+                            push(item)
+
+    def evaluate(self, root):
+        pre_table = self.pre_table
+        post_table = self.post_table
+        # Hesaplanan degerler, bir node'un alt node'larinin degerleri en ustte ve sirasiyla durur
+        values = []
+        # Stack'te hesaplanacak node'lar ve (post metodu, node, alt node sayisi) uclusu
+        stack = [root]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node = pop()
+            node_class = type(node)
+            if node_class is tuple:
+                post, node, count = node
+                if count:
+                    child_values = values[-count:]
+                    del values[-count:]
+                else:
+                    child_values = []
+                values.append(post(self, node, child_values))
+                continue
+            post = post_table[node_class]
+            if post is None:
+                values.append(self.visit(node))
+                continue
+            pre = pre_table[node_class]
+            if pre is not None:
+                value = pre(self, node)
+                if value is not None:
+                    values.append(value)
+                    continue
+            children = list(iter_child_nodes(node))
+            push((post, node, len(children)))
+            children.reverse()
+            stack.extend(children)
+        return values[0]
+
+# NodeVisitor'un kendi tablolari (dogrudan NodeVisitor() kullanimi icin)
+NodeVisitor.__init_subclass__()
+
+if __name__ == "__main__":
+    from compiler import Compiler
+
+    class Sayac(NodeVisitor):
+        # Node siniflarini sayar, BinaryOp derinligini takip eder
+        def __init__(self):
+            self.counts = {}
+            self.depth = 0
+            self.max_depth = 0
+
+        def generic_visit(self, node):
+            self.counts[type(node).__name__] = self.counts.get(type(node).__name__, 0) + 1
+            super().generic_visit(node)
+
+        def enter_BinaryOp(self, node):
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+
+        def leave_BinaryOp(self, node):
+            self.depth -= 1
+
+    code = "int x = 1;\nint y = " + " + ".join(["x"] * 5000) + ";\n"
+    ast = Compiler().parse(code)
+
+    sayac = Sayac()
+    sayac.traverse(ast)
+    print(f"traverse: en derin BinaryOp zinciri {sayac.max_depth}")
+
+    sayac = Sayac()
+    sayac.visit(ast.statements[0])
+    print(f"visit: {sayac.counts}")
+    print(f"Dispatch tablosu: {sorted(cls.__name__ for cls in Sayac.visit_table)}")
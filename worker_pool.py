@@ -0,0 +1,125 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from compiler import CodeObject
+from virtual_machine import VirtualMachine
+
+# Process Havuzunda VM Calistirma
+#
+# VM saf Python, tek process tek cekirdek kullanabilir. VMWorkerPool derlenmis programlari N worker
+# process'te calistirir:
+#   - Program bir kere bytecode_format ile yazilir ve icerik ozetiyle (sha256) anilir. Binary dosya
+#     havuzun ortak klasorune <ozet>.pbc olarak konur, her is sadece ozeti ve girdileri tasir.
+#   - Worker programi ilk kullaniminda klasorden okur ve ozetiyle cache'ler, sonraki isler tekrar okumaz.
+#   - Her is yeni bir sessiz VirtualMachine'de calisir, ExecutionResult (globaller, return degeri,
+#     instruction sayisi, PRINT ciktisi) ana process'e doner. Hatalar (LimitExceeded dahil) future'dan firlar.
+#   - Compiler(host_functions=...) ile derlenen programlar icin ayni host fonksiyonlari havuza da verilir,
+#     worker'lara init_worker ile gider. Fonksiyonlar pickle edilebilir (modul seviyesinde) ve senkron olmali,
+#     worker'da event loop yok.
+#
+#   with VMWorkerPool(workers=4) as pool:
+#       code = Compiler(inputs={'n': 'int'}).compile(source)
+#       results = pool.map(code, [{'n': n} for n in range(20, 30)])
+
+# Worker process'in durumu (init_worker): ortak klasor, VM limitleri, host fonksiyonlari ve ozet -> CodeObject cache'i
+store_dir = None
+vm_limits = None
+vm_host_functions = ()
+programs = {}
+
+def init_worker(directory, limits, host_functions):
+    global store_dir, vm_limits, vm_host_functions
+    store_dir = directory
+    vm_limits = limits
+    vm_host_functions = host_functions
+
+def load_program(digest):
+    code = programs.get(digest)
+    if code is None:
+        with open(os.path.join(store_dir, digest + ".pbc"), 'rb') as f:
+            code = CodeObject.from_bytes(f.read())
+        programs[digest] = code
+    return code
+
+def run_job(job):
+    # Worker process'te calisir: (ozet, girdiler) -> ExecutionResult
+    digest, inputs = job
+    code = load_program(digest)
+    vm = VirtualMachine(quiet=True, limits=vm_limits, host_functions=vm_host_functions)
+    return vm.run(code.instructions, code.global_names, code.line_table, inputs)
+
+class VMWorkerPool:
+    def __init__(self, workers=None, limits=None, host_functions=()):
+        # workers: process sayisi (varsayilan cekirdek sayisi), limits: her calistirmanin ResourceLimits'i
+        # host_functions: programlarin derlendigi execution.HostFunction'lar (sadece senkron olanlar)
+        host_functions = tuple(host_functions)
+        for host in host_functions:
+            if host.is_async:
+                raise Exception(f"HATA: Async host fonksiyonu '{host.name}' worker havuzunda calistirilamaz, "
+                                f"scheduler.VMScheduler kullanilmali.")
+        self.store_dir = tempfile.mkdtemp(prefix="vm_pool_")
+        self.executor = ProcessPoolExecutor(workers, initializer=init_worker,
+                                            initargs=(self.store_dir, limits, host_functions))
+        # id(code) -> (code, ozet), code tutuldugu icin id baska bir nesneye gecmez
+        self.digests = {}
+
+    def register(self, code):
+        # Programi ortak klasore yazar (daha once yazilmadiysa) ve icerik ozetini dondurur
+        entry = self.digests.get(id(code))
+        if entry is not None:
+            return entry[1]
+        data = code.to_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.store_dir, digest + ".pbc")
+        if not os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        self.digests[id(code)] = (code, digest)
+        return digest
+
+    def submit(self, code, inputs=None):
+        # code: CodeObject veya register()'in dondurdugu ozet, sonuc concurrent.futures.Future ile alinir
+        digest = code if isinstance(code, str) else self.register(code)
+        return self.executor.submit(run_job, (digest, inputs))
+
+    def map(self, code, inputs_list, chunksize=1):
+        # Ayni programi her girdiyle calistirir, sonuclar girdilerle ayni sirada
+        digest = code if isinstance(code, str) else self.register(code)
+        return list(self.executor.map(run_job, [(digest, inputs) for inputs in inputs_list], chunksize=chunksize))
+
+    def close(self):
+        self.executor.shutdown()
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        self.digests.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    import time
+    from compiler import Compiler
+
+    code = Compiler(inputs={'n': 'int'}).compile("""
+    int fib(int k) {
+        if (k < 2) { return k; }
+        return fib(k - 1) + fib(k - 2);
+    }
+    int f = fib(n);
+    """)
+    inputs = [{'n': n} for n in range(15, 21)]
+
+    start = time.perf_counter()
+    with VMWorkerPool() as pool:
+        results = pool.map(code, inputs)
+    elapsed = time.perf_counter() - start
+    for job, result in zip(inputs, results):
+        print(f"fib({job['n']}) = {result.globals['f']} ({result.instruction_count} instruction)")
+    print(f"{len(inputs)} calistirma {os.cpu_count()} cekirdekte {elapsed:.3f} s")